@@ -85,6 +85,9 @@ from pathlib import Path
 LLAMA_CPP_PATH = str(BASE_DIR / "aimatching" / "models" / "llama-run.exe")
 MISTRAL_MODEL_PATH = str(BASE_DIR / "aimatching" / "models" / "mistral-7b-instruct-v0.1.Q6_K.gguf")
 
+# CP-SAT models saved by solver runs (SchedulerSettings.export_models), see scheduler/model_export.py
+SCHEDULER_MODEL_DIR = str(BASE_DIR / "solver_models")
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
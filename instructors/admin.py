@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import InstructorExperience, InstructorCredentials
+from .models import InstructorExperience, InstructorCredentials, InstructorAvailability
 
 admin.site.register(InstructorCredentials)
 admin.site.register(InstructorExperience)
+admin.site.register(InstructorAvailability)
@@ -137,7 +137,47 @@ class InstructorCredentials(models.Model):
 
     def __str__(self):
         return f"{self.instructor_id} - {self.title}"
-    
+
+
+# ---------- Instructor Availability ----------
+# Weekly windows an instructor can teach in (importInstructorAvailability).
+# Instructors without any rows are available all week; the scheduler keeps
+# the others inside their windows.
+class InstructorAvailability(models.Model):
+    DAY_CHOICES = [
+        ('Monday', 'Monday'),
+        ('Tuesday', 'Tuesday'),
+        ('Wednesday', 'Wednesday'),
+        ('Thursday', 'Thursday'),
+        ('Friday', 'Friday'),
+        ('Saturday', 'Saturday'),
+        ('Sunday', 'Sunday'),
+    ]
+
+    availabilityId = models.AutoField(primary_key=True)
+    instructor = models.ForeignKey('core.Instructor', on_delete=models.CASCADE, related_name='availabilities')
+
+    dayOfWeek = models.CharField(max_length=10, choices=DAY_CHOICES)
+    startTime = models.TimeField()
+    endTime = models.TimeField()
+
+    createdAt = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['instructor', 'dayOfWeek', 'startTime']
+        unique_together = ('instructor', 'dayOfWeek', 'startTime', 'endTime')
+        indexes = [
+            models.Index(fields=['instructor', 'dayOfWeek'], name='instructors_instruc_aa99f4_idx'),
+        ]
+
+    def clean(self):
+        if self.endTime <= self.startTime:
+            raise ValidationError("End time must be after start time.")
+
+    def __str__(self):
+        return f"{self.instructor_id} - {self.dayOfWeek} {self.startTime:%H:%M}-{self.endTime:%H:%M}"
+
 
 # ---------- Instructor Designation ----------
 # This model defines the designations available for instructors, including their workload allocations.
@@ -0,0 +1,102 @@
+# scheduler/availability.py
+from collections import defaultdict
+
+# Instructor availability (InstructorAvailability). An instructor without
+# windows is available all week; one with windows only teaches inside them.
+# The model keeps the rest of their week busy with fixed intervals in their
+# NoOverlap and drops them from sections that cannot fit any window.
+# No Django imports: windows travel on the ProblemInstance.
+
+
+def merge_windows(windows):
+    """{day: [(start, end), ...]} with overlapping or touching windows merged."""
+    by_day = defaultdict(list)
+    for day, start, end in windows:
+        if end > start:
+            by_day[day].append((start, end))
+    merged = {}
+    for day, spans in by_day.items():
+        day_spans = []
+        for start, end in sorted(spans):
+            if day_spans and start <= day_spans[-1][1]:
+                day_spans[-1] = (day_spans[-1][0], max(day_spans[-1][1], end))
+            else:
+                day_spans.append((start, end))
+        merged[day] = day_spans
+    return merged
+
+
+def instructor_windows(instance):
+    """Merged windows per instructor index, None for instructors without any."""
+    availability = instance.instructor_availability or ((),) * len(instance.instructors)
+    return [merge_windows(w) if w else None for w in availability]
+
+
+def fits(windows, start, dur):
+    """Whether a class at week minute `start` lasting `dur` lies inside one window."""
+    day, minute = divmod(start, 1440)
+    return any(s <= minute and minute + dur <= e for s, e in windows.get(day, ()))
+
+
+def unavailable_spans(windows):
+    """(start, end) week minutes outside the windows, split at midnight."""
+    spans = []
+    for day in range(7):
+        cursor = 0
+        for start, end in windows.get(day, ()):
+            if start > cursor:
+                spans.append((day * 1440 + cursor, day * 1440 + start))
+            cursor = max(cursor, end)
+        if cursor < 1440:
+            spans.append((day * 1440 + cursor, day * 1440 + 1440))
+    return spans
+
+
+def available_domains(instance, domains, tasks, starts_for):
+    """
+    Instructor domains without the instructors who cannot teach the whole
+    section: one of its meetings has no start (starts_for(dur), week minutes)
+    inside their windows. A section left with nobody gets every instructor
+    who can teach it, those with enough normal + overload minutes first; if
+    there is none its domain is kept (precheck reports it as an error).
+
+    Returns ({section_id: [instructor_idx, ...]}, stats).
+    """
+    windows = instructor_windows(instance)
+    restricted = sum(1 for w in windows if w is not None)
+    stats = {"restricted_instructors": restricted, "pruned_pairs": 0, "widened_sections": 0, "unplaceable_sections": []}
+    if not restricted:
+        return domains, stats
+
+    durations = defaultdict(set)
+    for t in tasks:
+        durations[t["section"]].add(int(t["dur"]))
+    need = {s: lec + lab for s, lec, lab in zip(instance.sections, instance.section_lecture_min, instance.section_lab_min)}
+    caps = [n + o for n, o in zip(instance.instructor_normal_min, instance.instructor_overload_min)]
+
+    teaches = {}
+    def can_teach(i_idx, sec_id):
+        if windows[i_idx] is None:
+            return True
+        for dur in durations.get(sec_id, ()):
+            key = (i_idx, dur)
+            if key not in teaches:
+                teaches[key] = any(fits(windows[i_idx], start, dur) for start in starts_for(dur))
+            if not teaches[key]:
+                return False
+        return True
+
+    result = {}
+    for sec_id, domain in domains.items():
+        kept = [i for i in domain if can_teach(i, sec_id)]
+        stats["pruned_pairs"] += len(domain) - len(kept)
+        if not kept:
+            able = [i for i in range(len(windows)) if can_teach(i, sec_id)]
+            kept = [i for i in able if caps[i] >= need.get(sec_id, 0)] or able
+            if kept:
+                stats["widened_sections"] += 1
+            else:
+                stats["unplaceable_sections"].append(sec_id)
+                kept = list(domain)
+        result[sec_id] = kept
+    return result, stats
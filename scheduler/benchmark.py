@@ -0,0 +1,133 @@
+# scheduler/benchmark.py
+import multiprocessing
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from scheduler.instance import SolveParams
+from scheduler.engine import solve
+from scheduler.portfolio import solve_portfolio
+from scheduler.construction import construct_schedule, entries_to_hints
+
+# Solver modes compared by the benchmark: SolveParams overrides, plus
+# "processes" for the multi-process portfolio, "seed" to start CP-SAT from the
+# construction heuristic and "draft" for the heuristic alone.
+BENCHMARK_MODES = {
+    "monolithic": {"two_phase": False},
+    "two_phase": {"two_phase": True},
+    "symmetry": {"symmetry_breaking": True},
+    "lexicographic": {"lexicographic": True},
+    "portfolio": {"processes": 0},
+    "seeded": {"seed": True},
+    "draft": {"draft": True},
+}
+DEFAULT_BENCHMARK_MODES = ("monolithic", "two_phase")
+
+REPORT_VERSION = 1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (and its finished children)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def instance_summary(instance):
+    return {
+        "name": instance.semester_name,
+        "semester_id": instance.semester_id,
+        "sections": len(instance.sections),
+        "lab_sections": sum(1 for m in instance.section_lab_min if m),
+        "instructors": len(instance.instructors),
+        "rooms": len(instance.rooms) - 1,
+        "gened_blocks": len(instance.gened_blocks),
+        "groups": len(set(instance.section_group)),
+    }
+
+
+def _run_mode(mode, instance, params):
+    # Runs in a fresh process so peak RSS belongs to this mode alone
+    overrides = dict(BENCHMARK_MODES[mode])
+    processes = overrides.pop("processes", None)
+    seed = overrides.pop("seed", False)
+    draft = overrides.pop("draft", False)
+    run_params = replace(params, **overrides)
+
+    started = time.time()
+    if seed:
+        run_params = replace(run_params, incumbent=entries_to_hints(instance, construct_schedule(instance, top_k=params.top_k).entries))
+    if draft:
+        solution = construct_schedule(instance, top_k=params.top_k)
+    elif processes is None:
+        solution = solve(instance, run_params)
+    else:
+        solution = solve_portfolio(instance, run_params, processes=processes or None)
+    r = solution.report
+
+    return {
+        "mode": mode,
+        "status": solution.status,
+        "variables": r.get("variables"),
+        "constraints": r.get("constraints"),
+        "build_seconds": r.get("build_seconds"),
+        "first_feasible_seconds": r.get("first_feasible_seconds"),
+        "solve_seconds": r.get("solve_seconds"),
+        "wall_seconds": round(time.time() - started, 3),
+        "objective": solution.objective,
+        "best_bound": r.get("best_bound"),
+        "gap_percent": r.get("gap_percent"),
+        "solutions": r.get("solutions", 0),
+        "tba": r.get("tba"),
+        "stopped_by": r.get("stopped_by"),
+        # objective over time: [wall seconds, objective, best bound]
+        "curve": [[e["wall_time"], e["objective"], e["best_bound"]] for e in r.get("history", [])],
+        "peak_rss_mb": peak_rss_mb(),
+        "portfolio": r.get("portfolio"),
+        "symmetry": r.get("symmetry"),
+        "construction": r.get("construction"),
+    }
+
+
+def run_benchmark(instance, modes=DEFAULT_BENCHMARK_MODES, params=None):
+    """
+    Solves `instance` once per mode, each in its own process, and returns a
+    JSON-serializable report:
+        {version, created_at, environment, instance, params, results: [per mode]}
+    Every result has model size, build time, time-to-first-feasible, the
+    objective curve, final gap and peak RSS.
+    """
+    params = params or SolveParams(log_search_progress=False)
+    ctx = multiprocessing.get_context("spawn")
+
+    results = []
+    for mode in modes:
+        print(f"[Benchmark] {mode}: solving {instance.semester_name} ({params.time_limit_seconds}s)...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results.append(pool.submit(_run_mode, mode, instance, params).result())
+
+    try:
+        from ortools import __version__ as ortools_version
+    except ImportError:
+        ortools_version = None
+
+    return {
+        "version": REPORT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "ortools": ortools_version,
+            "platform": platform.platform(),
+            "cpus": multiprocessing.cpu_count(),
+        },
+        "instance": instance_summary(instance),
+        "params": {k: v for k, v in params.to_dict().items() if k not in ("hints", "incumbent", "previous_rows")},
+        "results": results,
+    }
@@ -0,0 +1,190 @@
+# scheduler/callbacks.py
+import threading
+import time
+from contextlib import contextmanager
+
+from ortools.sat.python import cp_model
+
+CHECKPOINT_EVERY_SECONDS = 5.0
+WATCHDOG_INTERVAL_SECONDS = 0.5
+CANCEL_POLL_SECONDS = 2.0
+
+
+class StopPolicy:
+    """
+    Early-termination rules on top of the time limit. Any rule left as None is off.
+      no_improvement_seconds: stop when no better solution was found for this long
+      gap_percent:            stop when |bound - objective| / |objective| drops below this
+      objective_target:       stop once the objective reaches this value (maximization)
+    """
+
+    def __init__(self, no_improvement_seconds=None, gap_percent=None, objective_target=None):
+        self.no_improvement_seconds = no_improvement_seconds or None
+        self.gap_percent = gap_percent
+        self.objective_target = objective_target
+
+    @classmethod
+    def from_settings(cls, settings_obj):
+        if settings_obj is None:
+            return cls()
+        return cls(
+            no_improvement_seconds=settings_obj.stop_no_improvement_seconds,
+            gap_percent=settings_obj.stop_gap_percent,
+            objective_target=settings_obj.stop_objective_target,
+        )
+
+    @property
+    def is_active(self):
+        return any(v is not None for v in (self.no_improvement_seconds, self.gap_percent, self.objective_target))
+
+    def check_solution(self, event):
+        """Reason to stop after this solution, or None."""
+        if self.objective_target is not None and event["objective"] >= self.objective_target:
+            return f"objective_target ({event['objective']:,.0f} >= {self.objective_target:,.0f})"
+        if self.gap_percent is not None and relative_gap_percent(event) <= self.gap_percent:
+            return f"gap ({relative_gap_percent(event):.3f}% <= {self.gap_percent}%)"
+        return None
+
+    def to_dict(self):
+        return {
+            "no_improvement_seconds": self.no_improvement_seconds,
+            "gap_percent": self.gap_percent,
+            "objective_target": self.objective_target,
+        }
+
+
+def relative_gap_percent(event):
+    return abs(event["best_bound"] - event["objective"]) / max(1.0, abs(event["objective"])) * 100
+
+
+class SolutionRecorder(cp_model.CpSolverSolutionCallback):
+    """
+    Called by CP-SAT on every improving solution.
+
+    - history: objective, best bound and wall time of each solution
+    - snapshot(cb): reads the current assignment (cb.Value(...)); the latest is kept as `best`
+    - on_solution(event): e.g. push the event to the dashboard
+    - checkpoint(best, event): persist best-so-far, throttled to CHECKPOINT_EVERY_SECONDS;
+      flush() writes the last one regardless
+    - stop_policy: StopPolicy evaluated on every solution (and by a watchdog while
+      solving, see watching()); the rule that fired is kept in `stopped_by`
+    - should_stop(): cooperative cancellation flag, polled every CANCEL_POLL_SECONDS
+    - score(cb): (objective, best_bound) to record instead of the search's own, e.g. the
+      weighted objective while a lexicographic stage optimizes one part of it
+    - wall_offset: seconds already spent by earlier searches of the same run
+    """
+
+    def __init__(self, snapshot=None, on_solution=None, checkpoint=None,
+                 checkpoint_every=CHECKPOINT_EVERY_SECONDS, stop_policy=None, should_stop=None,
+                 score=None, wall_offset=0.0):
+        super().__init__()
+        self.snapshot = snapshot
+        self.on_solution = on_solution
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.stop_policy = stop_policy
+        self.should_stop = should_stop
+        self.score = score
+        self.wall_offset = wall_offset
+        self.stopped_by = None
+
+        self.history = []
+        self.best = None
+        self.first_solution_time = None
+        self._last_checkpoint_time = None
+        self._checkpoint_pending = False
+        self._last_improvement_at = None
+        self._last_cancel_poll = 0.0
+
+    @property
+    def solution_count(self):
+        return len(self.history)
+
+    def on_solution_callback(self):
+        wall_time = self.WallTime() + self.wall_offset
+        if self.first_solution_time is None:
+            self.first_solution_time = wall_time
+
+        objective, best_bound = self.score(self) if self.score else (self.ObjectiveValue(), self.BestObjectiveBound())
+        event = {
+            "solution": len(self.history) + 1,
+            "objective": objective,
+            "best_bound": best_bound,
+            "wall_time": round(wall_time, 3),
+        }
+        self.history.append(event)
+        self._last_improvement_at = time.monotonic()
+
+        if self.snapshot:
+            self.best = self.snapshot(self)
+            self._checkpoint_pending = True
+
+        if self.on_solution:
+            self.on_solution(event)
+
+        if self.checkpoint and self.best is not None:
+            if self._last_checkpoint_time is None or wall_time - self._last_checkpoint_time >= self.checkpoint_every:
+                self._write_checkpoint(wall_time)
+
+        if self.stop_policy and self.stopped_by is None:
+            reason = self.stop_policy.check_solution(event)
+            if reason:
+                self.stopped_by = reason
+                self.StopSearch()
+
+        if self._cancel_requested():
+            self.StopSearch()
+
+    def _cancel_requested(self, force=False):
+        if self.should_stop is None or self.stopped_by is not None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_cancel_poll < CANCEL_POLL_SECONDS:
+            return False
+        self._last_cancel_poll = now
+        if self.should_stop():
+            self.stopped_by = "cancelled"
+            return True
+        return False
+
+    @contextmanager
+    def watching(self, solver):
+        """
+        Runs the no-improvement rule and the cancellation poll while solver.Solve
+        is inside the block. Solution callbacks only fire on improvements, so a
+        stalled search is caught here.
+        """
+        limit = self.stop_policy.no_improvement_seconds if self.stop_policy else None
+        if not limit and self.should_stop is None:
+            yield
+            return
+
+        done = threading.Event()
+
+        def watchdog():
+            while not done.wait(WATCHDOG_INTERVAL_SECONDS):
+                last = self._last_improvement_at
+                if limit and last is not None and time.monotonic() - last >= limit and self.stopped_by is None:
+                    self.stopped_by = f"no_improvement ({limit}s)"
+                    solver.StopSearch()
+                    return
+                if self._cancel_requested():
+                    solver.StopSearch()
+                    return
+
+        thread = threading.Thread(target=watchdog, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def flush(self):
+        if self.checkpoint and self._checkpoint_pending:
+            self._write_checkpoint(self._last_checkpoint_time)
+
+    def _write_checkpoint(self, wall_time):
+        self.checkpoint(self.best, self.history[-1])
+        self._last_checkpoint_time = wall_time
+        self._checkpoint_pending = False
@@ -0,0 +1,94 @@
+# scheduler/candidates.py
+
+# -------------------- Configuration --------------------
+CANDIDATE_TOP_K = 6        # best-matched instructors kept per section
+CANDIDATE_FALLBACK_K = 3   # extra overload-capable instructors per section
+
+# Variables the solver creates for a (task, instructor) pair, at most:
+# assign bool, assign-and-overtime bool, and an active-on-day bool per day
+# (daily spread; only on days where the instructor's candidate classes can
+# exceed MAX_DESIRED_DAILY_MIN). The on-day indicators are shared per task.
+VARS_PER_INSTRUCTOR_PAIR = 2 + 7
+
+
+def section_total_minutes(data, sec_id):
+    hours = data["section_hours"].get(sec_id, {"lecture_min": 0, "lab_min": 0})
+    return int(hours.get("lecture_min", 0) or 0) + int(hours.get("lab_min", 0) or 0)
+
+
+def build_instructor_candidates(data, top_k=CANDIDATE_TOP_K, fallback_k=CANDIDATE_FALLBACK_K):
+    """
+    Gives every section a small instructor domain instead of all instructors.
+
+    Lecture and lab tasks of a section share one instructor, so the domain is
+    decided per section:
+      1. The top_k best InstructorSubjectMatch scores among instructors whose
+         normal + overload cap can hold the whole section.
+      2. fallback_k overload-capable instructors (rotated per section so the
+         fallback load is spread out), so unmatched sections stay feasible.
+      3. If nobody qualifies, every instructor (the solver decides).
+
+    Returns ({section_id: [instructor_idx, ...]}, stats).
+    """
+    instructors = list(data["instructors"])
+    instructor_caps = data["instructor_caps"]
+    i_map = data.get("instructor_index", {i_id: idx for idx, i_id in enumerate(instructors)})
+    matches = data.get("matches", {})
+    all_indices = list(range(len(instructors)))
+
+    total_cap = {}
+    overload_cap = {}
+    for idx, instr_id in enumerate(instructors):
+        caps = instructor_caps.get(instr_id, {})
+        n_lim = caps.get("normal_limit_min", 1080)
+        o_lim = caps.get("overload_limit_min", 720)
+        total_cap[idx] = n_lim + o_lim
+        overload_cap[idx] = o_lim
+
+    # Largest overload capacity first; ties keep instructor order
+    overload_pool = sorted(
+        (idx for idx in all_indices if overload_cap[idx] > 0),
+        key=lambda idx: -overload_cap[idx]
+    )
+
+    candidates = {}
+    fallback_only = 0
+    for pos, sec_id in enumerate(data["sections"]):
+        need = section_total_minutes(data, sec_id)
+        chosen = []
+
+        ranked = sorted(
+            ((i_map[i_id], score) for i_id, score in matches.get(sec_id, ()) if i_id in i_map),
+            key=lambda pair: (-pair[1], pair[0])
+        )
+        for idx, _score in ranked:
+            if len(chosen) >= top_k:
+                break
+            if total_cap[idx] >= need and idx not in chosen:
+                chosen.append(idx)
+
+        if not chosen:
+            fallback_only += 1
+
+        fitting_pool = [idx for idx in overload_pool if overload_cap[idx] >= need]
+        added = 0
+        for j in range(len(fitting_pool)):
+            if added >= fallback_k:
+                break
+            idx = fitting_pool[(pos + j) % len(fitting_pool)]
+            if idx not in chosen:
+                chosen.append(idx)
+                added += 1
+
+        if not chosen:
+            chosen = [idx for idx in all_indices if total_cap[idx] >= need] or all_indices
+
+        candidates[sec_id] = sorted(chosen)
+
+    stats = {
+        "sections": len(candidates),
+        "instructors": len(instructors),
+        "fallback_only_sections": fallback_only,
+        "avg_domain": (sum(len(c) for c in candidates.values()) / len(candidates)) if candidates else 0,
+    }
+    return candidates, stats
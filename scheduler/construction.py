@@ -0,0 +1,387 @@
+# scheduler/construction.py
+import time
+from collections import defaultdict
+
+from ortools.graph.python import min_cost_flow
+
+from scheduler.availability import available_domains, instructor_windows, unavailable_spans
+from scheduler.candidates import CANDIDATE_TOP_K, build_instructor_candidates
+from scheduler.engine import (
+    allowed_slots_for, slot_table, start_properties, build_tasks,
+    MATCH_WEIGHT_SCALE, REAL_ROOM_REWARD, TBA_PENALTY_NORMAL, TBA_PENALTY_PRIORITY,
+    WEEKEND_TIME_PENALTY_PER_MINUTE, WEEKDAY_EVENING_PENALTY_PER_MINUTE,
+    DAILY_SPREAD_PENALTY, MAX_DESIRED_DAILY_MIN,
+)
+from scheduler.instance import Solution
+
+# A complete schedule without CP-SAT, in well under a second: instructors from
+# a min-cost flow over match scores and load limits, then times and rooms from
+# a greedy pass that scores slots with the engine's own penalties. Used to seed
+# the solver (SolveParams.incumbent) and as the "quick draft" mode for
+# semesters too large to optimize in the time available.
+
+DRAFT_STATUS = "DRAFT"
+
+FLOW_UNIT = 30              # minutes per unit of flow
+OVERLOAD_UNIT_COST = 1000   # per unit an instructor takes beyond the normal load
+UNASSIGNED_UNIT_COST = 100000
+
+
+# ----------------- Instructors -----------------
+def assign_instructors(instance, domains):
+    """
+    {section_id: instructor_idx} for every section.
+
+    Section minutes (in FLOW_UNIT blocks) flow from the source through the
+    section to its candidate instructors, at minus the match score per unit,
+    and on to the sink through each instructor's normal capacity (free) or
+    overload capacity (OVERLOAD_UNIT_COST). The flow may split a section; it
+    then goes to the instructor that carries most of it if their normal +
+    overload limit still holds it, otherwise to the next candidate that fits.
+    """
+    sections = instance.sections
+    n_sec = len(sections)
+    n_ins = len(instance.instructors)
+    source, sink = 0, 1 + n_sec + n_ins
+    need = {s: lec + lab for s, lec, lab in zip(sections, instance.section_lecture_min, instance.section_lab_min)}
+    scores = [dict(m) for m in instance.matches]
+
+    flow = min_cost_flow.SimpleMinCostFlow()
+    arcs = {}
+    total_units = 0
+    for pos, sec_id in enumerate(sections):
+        units = -(-need[sec_id] // FLOW_UNIT)
+        total_units += units
+        flow.add_arc_with_capacity_and_unit_cost(source, 1 + pos, units, 0)
+        flow.add_arc_with_capacity_and_unit_cost(1 + pos, sink, units, UNASSIGNED_UNIT_COST)
+        for i_idx in domains.get(sec_id, ()):
+            cost = -int(round(scores[pos].get(i_idx, 0.0) * MATCH_WEIGHT_SCALE))
+            arcs[(sec_id, i_idx)] = flow.add_arc_with_capacity_and_unit_cost(1 + pos, 1 + n_sec + i_idx, units, cost)
+    for i_idx in range(n_ins):
+        node = 1 + n_sec + i_idx
+        flow.add_arc_with_capacity_and_unit_cost(node, sink, instance.instructor_normal_min[i_idx] // FLOW_UNIT, 0)
+        flow.add_arc_with_capacity_and_unit_cost(
+            node, sink, instance.instructor_overload_min[i_idx] // FLOW_UNIT, OVERLOAD_UNIT_COST)
+    flow.set_node_supply(source, total_units)
+    flow.set_node_supply(sink, -total_units)
+
+    carried = defaultdict(dict)
+    if flow.solve() == flow.OPTIMAL:
+        for (sec_id, i_idx), arc in arcs.items():
+            if flow.flow(arc):
+                carried[sec_id][i_idx] = flow.flow(arc)
+
+    # Rounding: sections the flow kept whole first, biggest first
+    room_left = [n + o for n, o in zip(instance.instructor_normal_min, instance.instructor_overload_min)]
+    order = sorted(
+        range(n_sec),
+        key=lambda pos: (-max(carried[sections[pos]].values(), default=0) / max(1, need[sections[pos]]),
+                         -need[sections[pos]]),
+    )
+    assignment = {}
+    for pos in order:
+        sec_id = sections[pos]
+        ranked = sorted(
+            domains.get(sec_id) or range(n_ins),
+            key=lambda i: (-carried[sec_id].get(i, 0), -scores[pos].get(i, 0.0), i),
+        )
+        fitting = [i for i in ranked if room_left[i] >= need[sec_id]]
+        chosen = fitting[0] if fitting else max(ranked, key=lambda i: room_left[i])
+        assignment[sec_id] = chosen
+        room_left[chosen] -= need[sec_id]
+    return assignment
+
+
+# ----------------- Times and rooms -----------------
+class _Timetable:
+    """Busy (start, end) week-minute intervals per resource key, by day (classes never cross midnight)."""
+
+    def __init__(self):
+        self.busy = defaultdict(list)
+
+    def free(self, key, start, end):
+        return all(end <= s or start >= e for s, e in self.busy[(key, start // 1440)])
+
+    def clashes(self, key, start, end):
+        return sum(1 for s, e in self.busy[(key, start // 1440)] if not (end <= s or start >= e))
+
+    def add(self, key, start, end):
+        self.busy[(key, start // 1440)].append((start, end))
+
+    def remove(self, key, start, end):
+        self.busy[(key, start // 1440)].remove((start, end))
+
+
+class _Placer:
+    """Greedy slot and room choice on top of the instructor assignment; pinned times and rooms are kept."""
+
+    def __init__(self, instance, pins=None):
+        self.instance = instance
+        self.pins = pins or {}
+        self.tba = instance.tba_room_idx
+        self.table = _Timetable()
+        self.normal_used = defaultdict(int)
+        self.overload_used = defaultdict(int)
+        self.day_minutes = defaultdict(int)      # (instructor, day) -> minutes
+        self.placed = {}                         # task_id -> (start, room, instructor, overload)
+
+        for g_day, g_start, g_end, g_group in instance.gened_blocks:
+            self.table.add(("group", g_group), g_day * 1440 + g_start, g_day * 1440 + g_end)
+        for i_idx, windows in enumerate(instructor_windows(instance)):
+            for start, end in unavailable_spans(windows) if windows is not None else ():
+                self.table.add(("instr", i_idx), start, end)
+
+        self.room_pools = {
+            "lecture": [r for r in range(self.tba) if instance.room_types[r] in ("lecture", "universal")],
+            "lab": [r for r in range(self.tba) if instance.room_types[r] in ("laboratory", "universal")],
+        }
+        self.room_use = defaultdict(int)
+
+    def _free_room(self, task, students, start, end):
+        fitting = [
+            r for r in self.room_pools[task["kind"]]
+            if self.instance.room_capacities[r] >= students and self.table.free(("room", r), start, end)
+        ]
+        return min(fitting, key=lambda r: (self.instance.room_capacities[r], self.room_use[r], r), default=None)
+
+    def options(self, task, i_idx, group, other_half, strict):
+        """
+        (cost, start, overload) of every start slot for the task, cheapest first.
+        strict: respect the instructor's normal/overload limits and every clash;
+        otherwise clashes are allowed but cost heavily.
+        """
+        dur = int(task["dur"])
+        n_lim = self.instance.instructor_normal_min[i_idx]
+        o_lim = self.instance.instructor_overload_min[i_idx]
+        pinned_start = self.pins.get(task["task_id"], {}).get("start")
+        if pinned_start is not None:
+            starts = [start_properties(pinned_start, dur)]
+        else:
+            starts = slot_table(dur).values()
+        result = []
+        for start, day, weekend, overload in starts:
+            if other_half is not None and pinned_start is None and abs(start - other_half[0]) < other_half[1]:
+                continue
+
+            end = start + dur
+            over_limit = (self.overload_used[i_idx] + dur > o_lim) if overload else (self.normal_used[i_idx] + dur > n_lim)
+            if strict:
+                if over_limit or not self.table.free(("instr", i_idx), start, end) \
+                        or (group and not self.table.free(("group", group), start, end)):
+                    continue
+                clashes = 0
+            else:
+                clashes = self.table.clashes(("instr", i_idx), start, end)
+                if group:
+                    clashes += self.table.clashes(("group", group), start, end)
+
+            cost = clashes * 10 ** 9 + over_limit * 10 ** 8
+            if weekend:
+                cost += dur * WEEKEND_TIME_PENALTY_PER_MINUTE
+            elif overload:
+                cost += dur * WEEKDAY_EVENING_PENALTY_PER_MINUTE
+            excess = self.day_minutes[(i_idx, day)] + dur - MAX_DESIRED_DAILY_MIN
+            cost += max(0, excess) * DAILY_SPREAD_PENALTY
+            result.append((cost, start, overload))
+        result.sort()
+        return result
+
+    def place(self, task, i_idx, group, students, priority, other_half, strict):
+        """Places the task at its cheapest slot (a real room if it pays off); False if none."""
+        options = self.options(task, i_idx, group, other_half, strict)
+        if not options:
+            return False
+        dur = int(task["dur"])
+        no_room_cost = (TBA_PENALTY_PRIORITY if priority else TBA_PENALTY_NORMAL) + REAL_ROOM_REWARD
+
+        best_cost, best_start, best_overload = options[0]
+        choice = (best_start, self.tba, best_overload)
+        pinned_room = self.pins.get(task["task_id"], {}).get("room")
+        if pinned_room is not None:
+            choice = (best_start, pinned_room, best_overload)
+        else:
+            for cost, start, overload in options:
+                if cost > best_cost + no_room_cost:
+                    break
+                if start // 1440 >= 5:
+                    continue  # weekend classes are always TBA
+                room = self._free_room(task, students, start, start + dur)
+                if room is not None:
+                    choice = (start, room, overload)
+                    break
+
+        start, room, overload = choice
+        end = start + dur
+        self.table.add(("instr", i_idx), start, end)
+        if group:
+            self.table.add(("group", group), start, end)
+        if room != self.tba:
+            self.table.add(("room", room), start, end)
+            self.room_use[room] += dur
+        if overload:
+            self.overload_used[i_idx] += dur
+        else:
+            self.normal_used[i_idx] += dur
+        self.day_minutes[(i_idx, start // 1440)] += dur
+        self.placed[task["task_id"]] = (start, room, i_idx, overload)
+        return True
+
+    def undo(self, task, group):
+        start, room, i_idx, overload = self.placed.pop(task["task_id"])
+        dur = int(task["dur"])
+        end = start + dur
+        self.table.remove(("instr", i_idx), start, end)
+        if group:
+            self.table.remove(("group", group), start, end)
+        if room != self.tba:
+            self.table.remove(("room", room), start, end)
+            self.room_use[room] -= dur
+        if overload:
+            self.overload_used[i_idx] -= dur
+        else:
+            self.normal_used[i_idx] -= dur
+        self.day_minutes[(i_idx, start // 1440)] -= dur
+
+    def place_section(self, sec_tasks, i_idx, group, students, priority, strict):
+        done = []
+        for t in sec_tasks:
+            other_half = None
+            if t["task_id"].endswith("_LECT_B"):
+                lect_a = next((d for d in done if d["task_id"].endswith("_LECT_A")), None)
+                if lect_a is not None:
+                    # Same rule as the model: halves at least the first half + 30 min apart
+                    other_half = (self.placed[lect_a["task_id"]][0], int(lect_a["dur"]) + 30)
+            if not self.place(t, i_idx, group, students, priority, other_half, strict):
+                for d in reversed(done):
+                    self.undo(d, group)
+                return False
+            done.append(t)
+        return True
+
+
+# ----------------- Entry point -----------------
+def construct_schedule(instance, top_k=CANDIDATE_TOP_K, pins=None):
+    """
+    Builds a complete schedule for a ProblemInstance and returns it as a
+    Solution with status DRAFT (entries as from engine.solve, no objective).
+    report["construction"] counts the sections that had to leave their flow
+    instructor, the classes placed despite a clash or load limit, and TBA rooms.
+    A section that cannot be placed even then is left out of the entries
+    (stats["unplaced"]); as a seed, CP-SAT places it without a hint.
+    entries_to_hints() turns the entries into solver hints.
+
+    Sections are taken pinned first (SolveParams.pins: their pinned times,
+    rooms and instructors are kept), then priority, then those with labs, then
+    the longest. Each is placed with its flow instructor, else with another
+    candidate, and only as a last resort with clashes or over a load limit.
+    """
+    started = time.monotonic()
+    data = instance.solver_data
+    domains, _cand_stats = build_instructor_candidates(data, top_k=top_k) if top_k else ({}, None)
+    domains = {s: domains.get(s) or list(range(len(instance.instructors))) for s in instance.sections}
+    tasks = build_tasks(instance)
+    domains, _availability = available_domains(
+        instance, domains, tasks, lambda dur: [p[0] for p in slot_table(dur).values()]
+    )
+    pins = pins or {}
+    pinned_sections = set()
+    for t in tasks:
+        pin = pins.get(t["task_id"])
+        if pin:
+            pinned_sections.add(t["section"])
+            if "instr" in pin:
+                domains[t["section"]] = [pin["instr"]]
+    assignment = assign_instructors(instance, domains)
+    flow_seconds = time.monotonic() - started
+
+    tasks_by_section = defaultdict(list)
+    for t in tasks:
+        if allowed_slots_for(int(t["dur"])) or "start" in pins.get(t["task_id"], {}):
+            tasks_by_section[t["section"]].append(t)
+    for sec_tasks in tasks_by_section.values():
+        sec_tasks.sort(key=lambda t: (t["kind"] != "lab", t["task_id"]))
+
+    info = {
+        pos: (group, students, priority, lab, lec + lab)
+        for pos, (group, students, priority, lec, lab) in enumerate(zip(
+            instance.section_group, instance.section_students, instance.section_priority,
+            instance.section_lecture_min, instance.section_lab_min,
+        ))
+    }
+    order = sorted(
+        range(len(instance.sections)),
+        key=lambda pos: (instance.sections[pos] not in pinned_sections,
+                         not info[pos][2], not info[pos][3], -info[pos][4], pos),
+    )
+
+    placer = _Placer(instance, pins)
+    stats = {"sections": 0, "reassigned": 0, "forced": 0, "unplaced": []}
+    for pos in order:
+        sec_id = instance.sections[pos]
+        sec_tasks = tasks_by_section.get(sec_id)
+        if not sec_tasks:
+            continue
+        group, students, priority, _lab, _need = info[pos]
+        stats["sections"] += 1
+        first = assignment[sec_id]
+        others = [i for i in domains[sec_id] if i != first]
+        for i_idx in [first] + others:
+            if placer.place_section(sec_tasks, i_idx, group, students, priority, strict=True):
+                assignment[sec_id] = i_idx
+                stats["reassigned"] += i_idx != first
+                break
+        else:
+            if placer.place_section(sec_tasks, first, group, students, priority, strict=False):
+                stats["forced"] += len(sec_tasks)
+            else:
+                stats["unplaced"].append(sec_id)
+
+    entries = []
+    for sec_tasks in tasks_by_section.values():
+        for t in sec_tasks:
+            if t["task_id"] not in placer.placed:
+                continue
+            start, room, i_idx, _overload = placer.placed[t["task_id"]]
+            entries.append({
+                "task_id": t["task_id"],
+                "section": t["section"],
+                "kind": t["kind"],
+                "start": start,
+                "dur": t["dur"],
+                "instructor": instance.instructors[i_idx],
+                "room": None if room == placer.tba else instance.rooms[room],
+            })
+
+    stats.update(
+        tasks=len(entries),
+        tba=sum(1 for e in entries if e["room"] is None),
+        overload_minutes=sum(placer.overload_used.values()),
+        flow_seconds=round(flow_seconds, 3),
+        seconds=round(time.monotonic() - started, 3),
+    )
+    print(f"[Solver] Construction: {stats['tasks']} classes in {stats['seconds']:.2f}s, "
+          f"{stats['reassigned']} sections off their flow instructor, {stats['forced']} forced, {stats['tba']} TBA"
+          + (f", {len(stats['unplaced'])} sections unplaced" if stats["unplaced"] else ""))
+    return Solution(
+        status=DRAFT_STATUS,
+        entries=entries,
+        resolved_sections=sorted(set(tasks_by_section) - set(stats["unplaced"]), key=str),
+        report={
+            "mode": "draft", "status": DRAFT_STATUS, "construction": stats,
+            "tasks": len(entries), "tba": stats["tba"], "build_seconds": stats["seconds"],
+        },
+    )
+
+
+def entries_to_hints(instance, entries):
+    """Solution entries in the warm-start layout {task_id: {"start", "instr", "room"}}."""
+    instructor_index = {i_id: idx for idx, i_id in enumerate(instance.instructors)}
+    room_index = {r_id: idx for idx, r_id in enumerate(instance.rooms)}
+    return {
+        e["task_id"]: {
+            "start": e["start"],
+            "instr": instructor_index.get(e["instructor"]),
+            "room": room_index.get(e["room"], instance.tba_room_idx) if e["room"] is not None else instance.tba_room_idx,
+        }
+        for e in entries
+    }
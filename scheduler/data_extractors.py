@@ -2,10 +2,24 @@
 from collections import defaultdict
 from scheduling.models import Section, Room, GenEdSchedule, InstructorSchedulingConfiguration
 from core.models import Instructor
+from instructors.models import InstructorAvailability
 from aimatching.models import InstructorSubjectMatch
+from scheduler.instance import ProblemInstance
 import re
 
 
+def block_group_name(year, section_code):
+    """
+    Block group label shared by sections and GenEd rows: year level plus the
+    section letter after the last dash ("IT101-A" or "A" in year 1 -> "1A").
+    """
+    code = (section_code or "").strip().upper()
+    letter = code.split("-")[-1].strip()
+    if re.fullmatch(r"[A-Z]", letter):
+        return f"{year}{letter}"
+    return f"UNKNOWN_{code}"
+
+
 def get_solver_data(semester):
     # -------------------- Instructors --------------------
     instructors_qs = list(
@@ -30,18 +44,8 @@ def get_solver_data(semester):
     section_priority_map = {s.sectionId: s.isPriorityForRooms for s in sections_qs}
     section_num_students = {s.sectionId: (s.numberOfStudents or 0) for s in sections_qs}
 
-    def get_block_name(section):
-        year = section.subject.yearLevel
-
-        code = (section.sectionCode or "").strip()
-        match = re.search(r'-\s*([A-Z])$', code)
-        if match:
-            letter = match.group(1)
-            return f"{year}{letter}"
-        return f"UNKNOWN_{code}"
-
     section_to_group = {
-        s.sectionId: get_block_name(s) 
+        s.sectionId: block_group_name(s.subject.yearLevel, s.sectionCode)
         for s in sections_qs
     }
 
@@ -191,7 +195,18 @@ def get_solver_data(semester):
         gstart = g.startTime.hour * 60 + g.startTime.minute
         gend = g.endTime.hour * 60 + g.endTime.minute
         
-        gened_blocks.append((gday, gstart, gend, g.student_group))
+        # Same labels as section_to_group (GenEdSchedule.student_group is "1-A")
+        gened_blocks.append((gday, gstart, gend, block_group_name(g.yearLevel, g.sectionCode)))
+
+    # -------------------- Instructor Availability --------------------
+    # Instructors without rows are available all week
+    instructor_availability = defaultdict(list)
+    for a in InstructorAvailability.objects.filter(instructor__in=instructors):
+        instructor_availability[a.instructor_id].append((
+            day_map.get(a.dayOfWeek, 0),
+            a.startTime.hour * 60 + a.startTime.minute,
+            a.endTime.hour * 60 + a.endTime.minute,
+        ))
 
      # -------------------- Employment Separation --------------------
     permanent_instructors = [
@@ -201,6 +216,10 @@ def get_solver_data(semester):
         i for i in instructors_qs if (i.employmentType or "").lower() != "permanent"
     ]
 
+    instructor_employment = {
+        i.instructorId: (i.employmentType or "").lower().strip() for i in instructors_qs
+    }
+
     permanent_ids = [i.instructorId for i in permanent_instructors]
     non_permanent_ids = [i.instructorId for i in non_permanent_instructors]
 
@@ -223,7 +242,18 @@ def get_solver_data(semester):
 
         "permanent_instructors": tuple(permanent_ids),
         "non_permanent_instructors": tuple(non_permanent_ids),
+        "instructor_employment": instructor_employment,
+        "instructor_availability": {k: tuple(v) for k, v in instructor_availability.items()},
 
         "TBA_ROOM_IDX": TBA_ROOM_IDX,
         
     }
+
+
+def build_problem_instance(semester):
+    """get_solver_data packed into an ORM-free ProblemInstance."""
+    return ProblemInstance.from_solver_data(
+        get_solver_data(semester),
+        semester_id=semester.pk,
+        semester_name=str(semester),
+    )
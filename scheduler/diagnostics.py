@@ -1,7 +1,10 @@
 # scheduler/diagnostics.py
 from django.db.models import Sum
 from scheduling.models import Semester, Section
-from scheduler.data_extractors import get_solver_data
+from scheduler.data_extractors import get_solver_data, build_problem_instance
+from scheduler.candidates import CANDIDATE_TOP_K
+from scheduler.precheck import analyze_instance, PRECHECK_ERROR
+from scheduler.warm_start import load_pinned_rows, build_schedule_pins
 
 def check_supply_vs_demand(semester_id=None):
     """
@@ -105,4 +108,43 @@ def check_supply_vs_demand(semester_id=None):
         print(f"   You are MISSING {-balance_hr:.2f} instructor hours.")
         print(f"   The solver will likely fail or run forever.")
     
-    print("="*50 + "\n")
\ No newline at end of file
+    print("="*50 + "\n")
+
+
+def precheck_semester(semester, top_k=CANDIDATE_TOP_K):
+    """
+    Pre-solve feasibility checks (precheck.analyze_instance) on the data the
+    solver would see for `semester`, pinned classes included. Returns a
+    PrecheckVerdict.
+    """
+    instance = build_problem_instance(semester)
+    pins = build_schedule_pins(load_pinned_rows(semester), instance.solver_data)
+    return analyze_instance(instance, top_k=top_k, pins=pins)
+
+
+def print_precheck(semester_id=None):
+    """Prints the pre-check verdict for a semester (default: the active one)."""
+    if semester_id is None:
+        semester = Semester.objects.filter(isActive=True).order_by('-createdAt').first()
+        if not semester:
+            print("❌ ERROR: No active semester found in the database.")
+            return
+    else:
+        try:
+            semester = Semester.objects.get(pk=semester_id)
+        except Semester.DoesNotExist:
+            print(f"❌ ERROR: Semester with ID {semester_id} not found.")
+            return
+
+    verdict = precheck_semester(semester)
+
+    print("=" * 50)
+    print("🧪 PRE-SOLVE CHECK")
+    print("=" * 50)
+    for finding in verdict.findings:
+        icon = "❌" if finding.severity == PRECHECK_ERROR else "⚠️"
+        print(f"{icon} [{finding.check}] {finding.message}")
+    print("-" * 50)
+    print(f"{'✅' if verdict.ok else '❌'} {verdict.summary()} ({verdict.seconds:.3f}s)")
+    print("=" * 50 + "\n")
+    return verdict
@@ -0,0 +1,1188 @@
+# scheduler/engine.py
+import time
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+
+from scheduler.candidates import VARS_PER_INSTRUCTOR_PAIR, build_instructor_candidates
+from scheduler.availability import instructor_windows, available_domains, fits, unavailable_spans
+from scheduler.symmetry import section_classes, room_classes
+from scheduler.room_assignment import assign_rooms, room_levels
+from scheduler.incremental import find_changed_sections, build_neighborhood
+from scheduler.callbacks import SolutionRecorder, relative_gap_percent
+from scheduler.instance import Solution
+from scheduler.solution_pool import SolutionPool, min_distance_for
+from scheduler.model_profile import ModelProfile
+from scheduler.model_export import save_model
+
+# Model building and solving only: no Django imports. solver.py reads the
+# database into a ProblemInstance and saves the Solution.
+
+# -------------------- Configuration --------------------
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+INTERVAL_MINUTES = 30
+WEEK_MINUTES = 7 * 24 * 60
+EVENING_START = 17 * 60   # weekday classes ending after this are overtime
+
+MATCH_WEIGHT_SCALE = 100
+REAL_ROOM_REWARD = 10000         
+
+TBA_PENALTY_NORMAL = 5000 #increase to discourage TBA rooms  
+TBA_PENALTY_PRIORITY = 200000 
+
+WEEKEND_TIME_PENALTY_PER_MINUTE = 5000 
+WEEKDAY_EVENING_PENALTY_PER_MINUTE = 10000   # construction.py only; the model prices evenings as overload
+
+NORMAL_LOAD_REWARD_PER_MIN = 5000            
+OVERLOAD_FAIRNESS_PENALTY = 50000 
+DAILY_SPREAD_PENALTY = 2000
+MAX_DESIRED_DAILY_MIN = 360 # 6 hours
+
+OVERLOAD_PENALTY = 2000
+GLOBAL_OVERLOAD_COST_PER_MIN = 10
+TOTAL_LOAD_FAIRNESS_PENALTY = 500         
+
+# -------------------- Timeslot metadata --------------------
+def generate_timeslot_meta():
+    slot_meta = []
+    MORNING_RANGE = (8, 12)
+    AFTERNOON_RANGE = (13, 17)
+    OVERLOAD_RANGE_WEEKDAYS = (17, 20) 
+    OVERLOAD_RANGE_WEEKENDS = [(8, 12), (13, 20)]
+
+    for day_idx, day in enumerate(DAYS):
+        if day_idx <= 4:  # Mon-Fri
+            for hour in range(MORNING_RANGE[0], MORNING_RANGE[1]):
+                for minute in (0, 30):
+                    minute_of_day = hour * 60 + minute
+                    label = f"{day} {hour:02d}:{minute:02d}"
+                    minute_of_week = day_idx * 1440 + minute_of_day
+                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
+            for hour in range(AFTERNOON_RANGE[0], AFTERNOON_RANGE[1]):
+                for minute in (0, 30):
+                    minute_of_day = hour * 60 + minute
+                    label = f"{day} {hour:02d}:{minute:02d}"
+                    minute_of_week = day_idx * 1440 + minute_of_day
+                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
+            
+            # Overload
+            start_h, end_h = OVERLOAD_RANGE_WEEKDAYS
+            hour = start_h
+            minute = 0
+            while hour * 60 + minute + INTERVAL_MINUTES <= end_h * 60 + 1e-9:
+                minute_of_day = hour * 60 + minute
+                label = f"{day} {hour:02d}:{minute:02d}"
+                minute_of_week = day_idx * 1440 + minute_of_day
+                slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
+                minute += INTERVAL_MINUTES
+                if minute == 60:
+                    minute = 0
+                    hour += 1
+        else:  # Sat-Sun
+            for start_h, end_h in OVERLOAD_RANGE_WEEKENDS:
+                hour = int(start_h)
+                minute = 0
+                while hour*60 + minute + INTERVAL_MINUTES <= end_h*60 + 1e-9:
+                    minute_of_day = hour*60 + minute
+                    label = f"{day} {hour:02d}:{minute:02d}"
+                    minute_of_week = day_idx*1440 + minute_of_day
+                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
+                    minute += INTERVAL_MINUTES
+                    if minute == 60:
+                        minute = 0
+                        hour += 1
+
+    timeslots = [m[0] for m in slot_meta]
+    return timeslots, slot_meta
+
+TIMESLOTS, SLOT_META = generate_timeslot_meta()
+NUM_SLOTS = len(TIMESLOTS)
+SLOT_TO_DAY = {i: SLOT_META[i][1] for i in range(NUM_SLOTS)}
+SLOT_TO_GLOBAL_MIN = {i: SLOT_META[i][3] for i in range(NUM_SLOTS)}
+GLOBAL_MIN_TO_SLOT = {v: k for k, v in SLOT_TO_GLOBAL_MIN.items()}
+
+# Objective terms by family (report["objective_breakdown"], candidate schedules)
+OBJECTIVE_FAMILIES = (
+    "normal_load", "underload", "overload_cost", "overload_fairness", "daily_spread",
+    "load_fairness", "room_balance", "match", "tba_priority", "tba", "real_room", "weekend",
+    "day_balance",
+)
+
+# Lexicographic mode (SolveParams.lexicographic): the stages are optimized in
+# order, each keeping the level the earlier ones reached, with its share of the
+# time limit (time a stage does not use moves on to the next ones).
+OBJECTIVE_STAGES = (
+    ("coverage", ("tba_priority", "real_room", "tba"), 0.3),
+    ("load", ("normal_load", "underload", "overload_cost", "overload_fairness", "weekend",
+              "load_fairness", "daily_spread"), 0.5),
+    ("preferences", ("match", "room_balance", "day_balance"), 0.2),
+)
+
+_ALLOWED_SLOTS = {}  # duration -> start slots
+_SLOT_TABLES = {}    # duration -> {slot: slot_properties}
+
+def allowed_slots_for(dur):
+    """
+    Start slots where a class of `dur` minutes fits: from 08:00, not across the
+    12:00-13:00 break, ending by 20:00, and on weekdays either ending by 17:00
+    or starting at 17:00 or later (a class is day time or evening, never both).
+    """
+    if dur not in _ALLOWED_SLOTS:
+        lst = []
+        for i in range(NUM_SLOTS):
+            day, minute_of_day = SLOT_META[i][1], SLOT_META[i][2]
+            end = minute_of_day + dur
+
+            if end > 20*60: continue
+            if not (end <= 12*60 or minute_of_day >= 13*60): continue
+            if minute_of_day < 8*60 or (12*60 <= minute_of_day < 13*60): continue
+            if day < 5 and minute_of_day < EVENING_START < end: continue
+
+            lst.append(i)
+        _ALLOWED_SLOTS[dur] = lst
+    return _ALLOWED_SLOTS[dur]
+
+
+def slot_properties(slot, dur):
+    """(minute of week, day, weekend, overtime) of a `dur`-minute class starting in `slot`."""
+    _label, day, minute_of_day, minute_of_week = SLOT_META[slot]
+    weekend = day >= 5
+    return minute_of_week, day, weekend, weekend or minute_of_day + dur > EVENING_START
+
+
+def start_properties(start, dur):
+    """slot_properties for any minute of the week (pinned classes may sit off the slot grid)."""
+    day, minute_of_day = divmod(start, 1440)
+    weekend = day >= 5
+    return start, day, weekend, weekend or minute_of_day + dur > EVENING_START
+
+
+def slot_table(dur):
+    """{slot: slot_properties} for every allowed start slot, computed once per duration."""
+    if dur not in _SLOT_TABLES:
+        _SLOT_TABLES[dur] = {slot: slot_properties(slot, dur) for slot in allowed_slots_for(dur)}
+    return _SLOT_TABLES[dur]
+
+
+_TIME_DOMAINS = {}   # duration -> time_domains()
+
+def time_domains(table):
+    """
+    What the model needs from a slot table: the start domain, the days a start
+    can fall on, and the overtime split of the starts (domains for both sides,
+    or a constant when every start is on the same side).
+    """
+    starts = sorted(p[0] for p in table.values())
+    ot_starts = [p[0] for p in table.values() if p[3]]
+    day_starts = [p[0] for p in table.values() if not p[3]]
+    split = bool(ot_starts) and bool(day_starts)
+    return {
+        "starts": cp_model.Domain.FromValues(starts),
+        "days": frozenset(p[1] for p in table.values()),
+        "ot": cp_model.Domain.FromValues(ot_starts) if split else None,
+        "day": cp_model.Domain.FromValues(day_starts) if split else None,
+        "ot_constant": None if split else int(bool(ot_starts)),
+    }
+
+
+def time_domains_for(dur):
+    if dur not in _TIME_DOMAINS:
+        _TIME_DOMAINS[dur] = time_domains(slot_table(dur))
+    return _TIME_DOMAINS[dur]
+
+
+def build_tasks(instance):
+    """
+    The meetings to schedule: lectures over 2 hours are split into two halves
+    (_LECT_A / _LECT_B), a lab is its own task.
+    """
+    tasks = []
+    for s, lecture_d, lab_d in zip(instance.sections, instance.section_lecture_min, instance.section_lab_min):
+        if lecture_d > 120:
+            half = lecture_d // 2
+            other_half = lecture_d - half
+            tasks.append({"task_id": f"{s}_LECT_A", "section": s, "kind": "lecture", "dur": half})
+            tasks.append({"task_id": f"{s}_LECT_B", "section": s, "kind": "lecture", "dur": other_half})
+        else:
+            tasks.append({"task_id": f"{s}_LECT", "section": s, "kind": "lecture", "dur": lecture_d})
+        if lab_d > 0:
+            tasks.append({"task_id": f"{s}_LAB", "section": s, "kind": "lab", "dur": lab_d})
+    return tasks
+
+
+def apply_solver_params(parameters, overrides):
+    """Sets CP-SAT parameters by name; enum values may be given by name ("FIXED_SEARCH")."""
+    for name, value in (overrides or {}).items():
+        field = parameters.DESCRIPTOR.fields_by_name[name]
+        if field.enum_type is not None and isinstance(value, str):
+            value = field.enum_type.values_by_name[value].number
+        setattr(parameters, name, value)
+
+
+def objective_stages(families, lexicographic=True):
+    """
+    [(stage, families, time share)] for the objective families in the model.
+    Not lexicographic: one "weighted" stage with everything. Families no stage
+    names join the last stage; stages left without families are dropped.
+    """
+    if not lexicographic:
+        return [("weighted", tuple(families), 1.0)]
+    staged = {f for _name, members, _share in OBJECTIVE_STAGES for f in members}
+    stages = []
+    for pos, (name, members, share) in enumerate(OBJECTIVE_STAGES):
+        present = [f for f in members if f in families]
+        if pos == len(OBJECTIVE_STAGES) - 1:
+            present += [f for f in families if f not in staged]
+        if present:
+            stages.append((name, tuple(present), share))
+    return stages or [("weighted", tuple(families), 1.0)]
+
+
+def model_statistics(model):
+    """Variable and constraint counts of a built model, constraints by type."""
+    proto = model.Proto()
+    by_type = defaultdict(int)
+    for ct in proto.constraints:
+        by_type[ct.WhichOneof("constraint")] += 1
+    return {
+        "variables": len(proto.variables),
+        "booleans": sum(1 for v in proto.variables if list(v.domain) == [0, 1]),
+        "constraints": len(proto.constraints),
+        "constraints_by_type": dict(sorted(by_type.items())),
+    }
+
+
+# ----------------- Main solver -----------------
+def solve(instance, params, on_solution=None, checkpoint=None, stop_policy=None,
+          on_phase=None, should_stop=None):
+    """
+    Builds the CP-SAT model for a ProblemInstance and solves it with SolveParams.
+    Returns a Solution; nothing is read from or written to the database.
+
+    params.two_phase: solve times/instructors first against aggregate room capacity,
+               then assign rooms with a fast greedy pass (room_assignment.py).
+               False keeps the monolithic model with per-room variables.
+    params.hints: warm start from a previous run (see warm_start.py);
+               params.repair_hint lets CP-SAT repair a hint that is no longer feasible.
+    params.incremental: keep the hinted schedule fixed except for the neighborhood of
+               changed sections (incremental.py); only that delta is returned.
+               params.changed_sections adds sections to re-solve explicitly.
+    on_solution: called with {solution, objective, best_bound, wall_time} for every
+               improving solution.
+    checkpoint: called (throttled) with {incremental, resolved_sections, event, entries}
+               for the best-so-far assignment, so a stopped run can still be saved.
+    stop_policy: StopPolicy for early termination (no improvement / gap / target).
+    on_phase:  called as on_phase(name, info) at build / solve.
+    should_stop: cooperative cancellation flag; the search stops and keeps the best
+               solution found so far.
+    """
+    report = {"mode": "two_phase" if params.two_phase else "monolithic"}
+
+    def phase(name, **info):
+        if on_phase:
+            on_phase(name, info)
+
+    build_started = time.time()
+    data = instance.solver_data
+    hints = params.hints or {}
+    pins = params.pins or {}
+    incremental = params.incremental
+    two_phase = params.two_phase
+    top_k = params.top_k
+
+    sections = list(instance.sections)
+    section_to_group = data["section_to_group"]
+    rooms = list(instance.rooms)
+    instructors = list(instance.instructors)
+
+    room_types = data["room_types"]
+    room_capacities = data["room_capacities"]
+    section_priority_map = data["section_priority_map"]
+    section_num_students = data["section_num_students"]
+
+    num_rooms = len(rooms)
+    num_instructors = len(instructors)
+    TBA_ROOM_IDX = instance.tba_room_idx
+
+    # --- Candidate Instructors (top-K per section) ---
+    if top_k:
+        instr_candidates, cand_stats = build_instructor_candidates(data, top_k=top_k)
+        print(f"[Solver] Candidate pruning: K={top_k}, avg domain {cand_stats['avg_domain']:.1f} "
+              f"of {num_instructors} instructors ({cand_stats['fallback_only_sections']} sections on fallback only)")
+    else:
+        instr_candidates = {s: list(range(num_instructors)) for s in sections}
+
+    # --- Robust Room Domains ---
+    lecture_base_indices = {TBA_ROOM_IDX}
+    lab_base_indices = {TBA_ROOM_IDX}
+
+    for i in range(num_rooms):
+        rtype = room_types.get(i, 'lecture')
+        if rtype in ('lecture', 'universal'):
+            lecture_base_indices.add(i)
+        if rtype in ('laboratory', 'universal'):
+            lab_base_indices.add(i)
+
+    valid_rooms = {}   # (kind, students) -> room indices
+    signatures = defaultdict(int)   # (duration, kind, rooms) -> tasks
+
+    def get_valid_rooms(kind, required_students):
+        key = (kind, required_students)
+        if key not in valid_rooms:
+            valid_rooms[key] = _valid_rooms(kind, required_students)
+        return valid_rooms[key]
+
+    def _valid_rooms(kind, required_students):
+        base_indices = lab_base_indices if kind == "lab" else lecture_base_indices
+        valid_indices = []
+        for r_idx in base_indices:
+            if r_idx == TBA_ROOM_IDX:
+                valid_indices.append(r_idx)
+                continue
+            cap = room_capacities.get(r_idx, 0)
+            if cap >= required_students:
+                valid_indices.append(r_idx)
+        if not valid_indices: valid_indices = [TBA_ROOM_IDX]
+        return sorted(valid_indices)
+
+    model = cp_model.CpModel()
+    profile = ModelProfile(model)  # report["families"]: what each part of the build adds
+
+    # --- Task Generation ---
+    tasks = build_tasks(instance)
+
+    # --- Instructor Availability ---
+    # Instructors whose windows cannot hold a section leave its domain; the
+    # rest of their week becomes fixed intervals in their NoOverlap (below).
+    windows = instructor_windows(instance)
+    instr_candidates, availability = available_domains(
+        instance, instr_candidates, tasks, lambda dur: [p[0] for p in slot_table(dur).values()]
+    )
+    if availability["restricted_instructors"]:
+        print(f"[Solver] Availability: {availability['restricted_instructors']} instructors with windows, "
+              f"{availability['pruned_pairs']} section-instructor pairs pruned, "
+              f"{availability['widened_sections']} sections widened, "
+              f"{len(availability['unplaceable_sections'])} sections nobody can take")
+
+    # --- Pins: hand-fixed parts of the previous schedule are constants ---
+    # An instructor pin holds for the whole section (its classes share one).
+    pinned_sections = {t["section"] for t in tasks if t["task_id"] in pins}
+    for t in tasks:
+        if "instr" in pins.get(t["task_id"], {}):
+            instr_candidates[t["section"]] = [pins[t["task_id"]]["instr"]]
+    pinned_rooms = {p["room"] for p in pins.values() if "room" in p}
+    if pins:
+        report["pins"] = {
+            "tasks": len(pins),
+            "time": sum(1 for p in pins.values() if "start" in p),
+            "room": sum(1 for p in pins.values() if "room" in p),
+            "instructor": sum(1 for p in pins.values() if "instr" in p),
+        }
+        print(f"[Solver] Pinned: {report['pins']['tasks']} classes ({report['pins']['time']} times, "
+              f"{report['pins']['room']} rooms, {report['pins']['instructor']} instructors)")
+
+    # --- Variables ---
+    task_vars = {} 
+    assigned_instr = {}
+    instr_to_tasks = defaultdict(list)
+    assigned_room = defaultdict(list)
+    instr_intervals = defaultdict(list)
+    room_intervals = defaultdict(list) 
+    capacity_intervals = defaultdict(list)  # two-phase: kind -> [(interval, students)]
+    group_intervals = defaultdict(list)
+
+    # --- Incremental: freeze everything outside the changed neighborhood ---
+    fixed = {}
+    if incremental:
+        changed = find_changed_sections(
+            tasks, hints, params.previous_rows, data,
+            slot_ok=lambda t, start: GLOBAL_MIN_TO_SLOT.get(start) in allowed_slots_for(int(t["dur"])),
+            room_ok=lambda t, r_idx: r_idx in get_valid_rooms(t["kind"], section_num_students.get(t["section"], 0)),
+            instr_ok=lambda t, start, i_idx: windows[i_idx] is None or fits(windows[i_idx], start, int(t["dur"])),
+        )
+        changed |= set(params.changed_sections or ())
+        neighborhood, n_stats = build_neighborhood(changed, tasks, hints, data)
+        fixed = {t["task_id"]: hints[t["task_id"]] for t in tasks if t["section"] not in neighborhood}
+        report["neighborhood"] = n_stats
+        print(f"[Solver] Incremental: {n_stats['changed_sections']} changed sections, "
+              f"re-solving {n_stats['neighborhood_sections']}/{len(sections)} sections, "
+              f"{len(fixed)} tasks fixed")
+
+    for t in tasks:
+        tid = t["task_id"]
+        dur = int(t["dur"])
+        fixed_hint = fixed.get(tid)
+        pin = pins.get(tid, {})
+        pinned_start = fixed_hint["start"] if fixed_hint else pin.get("start")
+
+        if pinned_start is None and not allowed_slots_for(dur):
+            print(f"[Solver] ERROR: Task {tid} fits NO time slots! Skipping.")
+            continue 
+
+        # Time: the start minute ranges over the allowed slots; day and overtime
+        # are read off the slot table instead of being computed from the start.
+        # Tasks of one duration share the domains (time_domains_for).
+        profile.enter("time")
+        if pinned_start is not None:
+            shared = time_domains({pinned_start: start_properties(pinned_start, dur)})
+        else:
+            shared = time_domains_for(dur)
+        start_var = model.NewIntVarFromDomain(shared["starts"], f"start_{tid}")
+
+        # --- Shared time indicators ---
+        # Built once per task; the overtime, daily-spread, penalty, GenEd and
+        # day-usage sections below all reuse them instead of re-deriving them.
+        profile.enter("time_indicators")
+        days = shared["days"]
+        on_day = [model.NewBoolVar(f"{tid}_day{d}") for d in range(7)]
+        model.AddExactlyOne(on_day)
+        for d in range(7):
+            if d in days:
+                model.AddLinearConstraint(start_var, d * 1440, d * 1440 + 1439).OnlyEnforceIf(on_day[d])
+            else:
+                model.Add(on_day[d] == 0)
+
+        is_weekend = model.NewBoolVar(f"{tid}_is_weekend")
+        model.Add(is_weekend == on_day[5] + on_day[6])
+
+        # Overtime = weekend or ending after 17:00
+        is_ot = model.NewBoolVar(f"{tid}_is_ot")
+        if shared["ot_constant"] is not None:
+            model.Add(is_ot == shared["ot_constant"])
+        else:
+            model.AddLinearExpressionInDomain(start_var, shared["ot"]).OnlyEnforceIf(is_ot)
+            model.AddLinearExpressionInDomain(start_var, shared["day"]).OnlyEnforceIf(is_ot.Not())
+
+        # Room (Capacity + Type)
+        profile.enter("rooms")
+        required_students = section_num_students.get(t["section"], 0)
+        if fixed_hint:
+            valid_indices = [fixed_hint["room"]]
+        elif "room" in pin:
+            valid_indices = [pin["room"]]
+        else:
+            valid_indices = get_valid_rooms(t["kind"], required_students)
+        signatures[(dur, t["kind"], tuple(valid_indices))] += 1
+
+        if two_phase:
+            # Phase 1 only decides whether the task gets a real room at all
+            room_var = None
+            has_room = model.NewBoolVar(f"has_room_{tid}")
+            if valid_indices == [TBA_ROOM_IDX]:
+                model.Add(has_room == 0)
+            elif "room" in pin:
+                model.Add(has_room == 1)
+        else:
+            room_var = model.NewIntVarFromDomain(cp_model.Domain.FromValues(valid_indices), f"room_{tid}")
+            has_room = None
+        
+        # Instructor
+        profile.enter("instructors")
+        if fixed_hint:
+            instr_domain = [fixed_hint["instr"]]
+        else:
+            instr_domain = instr_candidates.get(t["section"]) or list(range(num_instructors))
+        instr_var = model.NewIntVarFromDomain(cp_model.Domain.FromValues(instr_domain), f"instr_{tid}")
+
+        task_vars[tid] = {
+            "start": start_var, "end": start_var + dur,
+            "room": room_var, "instr": instr_var, "dur": dur,
+            "kind": t["kind"], "section": t["section"],
+            "has_room": has_room, "rooms": valid_indices, "days": days,
+            "on_day": on_day, "is_weekend": is_weekend, "is_ot": is_ot,
+        }
+
+        profile.enter("time")
+        master_iv = model.NewFixedSizeIntervalVar(start_var, dur, f"miv_{tid}")
+        gid = section_to_group.get(t["section"])
+        if gid:
+            group_intervals[gid].append(master_iv)
+
+        # Intervals
+        profile.enter("instructors")
+        for i_idx in instr_domain:
+            b = model.NewBoolVar(f"assign_{tid}_instr{i_idx}")
+            assigned_instr[(tid, i_idx)] = b 
+            model.Add(instr_var == i_idx).OnlyEnforceIf(b)
+            model.Add(instr_var != i_idx).OnlyEnforceIf(b.Not())
+            iv = model.NewOptionalFixedSizeIntervalVar(start_var, dur, b, f"iv_i_{tid}")
+            instr_intervals[i_idx].append(iv)
+            instr_to_tasks[i_idx].append(t)
+        model.Add(sum(assigned_instr[(tid, i)] for i in instr_domain) == 1)
+
+        profile.enter("rooms")
+        if two_phase:
+            iv = model.NewOptionalFixedSizeIntervalVar(start_var, dur, has_room, f"iv_cap_{tid}")
+            capacity_intervals[t["kind"]].append((iv, required_students))
+        else:
+            for r_idx in valid_indices:
+                b = model.NewBoolVar(f"assign_{tid}_room{r_idx}")
+                assigned_room[(tid, r_idx)] = b
+                model.Add(room_var == r_idx).OnlyEnforceIf(b)
+                model.Add(room_var != r_idx).OnlyEnforceIf(b.Not())
+                if r_idx != TBA_ROOM_IDX:
+                    iv = model.NewOptionalFixedSizeIntervalVar(start_var, dur, b, f"iv_r_{tid}")
+                    room_intervals[r_idx].append(iv)
+            model.Add(sum(assigned_room[(tid, r)] for r in valid_indices) == 1)
+
+        # Weekend Lockout
+        if two_phase:
+            model.Add(has_room == 0).OnlyEnforceIf(is_weekend)
+        else:
+            model.Add(room_var == TBA_ROOM_IDX).OnlyEnforceIf(is_weekend)
+
+    # Availability: outside their windows an instructor is busy
+    profile.enter("availability")
+    away_intervals = 0
+    for i_idx, ivs in instr_intervals.items():
+        if windows[i_idx] is None:
+            continue
+        for start, end in unavailable_spans(windows[i_idx]):
+            ivs.append(model.NewFixedSizeIntervalVar(start, end - start, f"away_{i_idx}_{start}"))
+            away_intervals += 1
+    availability["intervals"] = away_intervals
+    report["availability"] = availability
+
+    # GenEd: every block is a fixed interval in its group's NoOverlap, so it
+    # costs no variables. Overlapping blocks of one group are merged first.
+    profile.enter("gened")
+    gened_by_group = defaultdict(list)
+    for g_day, g_start, g_end, g_group in instance.gened_blocks:
+        if g_group in group_intervals and g_end > g_start:
+            gened_by_group[g_group].append((g_day * 1440 + g_start, g_day * 1440 + g_end))
+    gened_intervals = 0
+    for g_group, blocks in gened_by_group.items():
+        merged = []
+        for start, end in sorted(blocks):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            group_intervals[g_group].append(model.NewFixedSizeIntervalVar(start, end - start, f"gened_{g_group}_{start}"))
+        gened_intervals += len(merged)
+    report["gened"] = {"blocks": len(instance.gened_blocks), "intervals": gened_intervals, "groups": len(gened_by_group)}
+
+    # Overlaps
+    profile.enter("no_overlap")
+    for i_idx, ivs in instr_intervals.items():
+        if ivs: model.AddNoOverlap(ivs)
+    for r_idx, ivs in room_intervals.items():
+        if ivs: model.AddNoOverlap(ivs)
+    for gid, ivs in group_intervals.items():
+        if len(ivs) > 1:
+            model.AddNoOverlap(ivs)
+
+    # Aggregate room capacity (two-phase): per room type and seat level,
+    # concurrent roomed tasks never exceed the rooms that can hold them.
+    if two_phase:
+        profile.enter("room_capacity")
+        for kind, pool in (("lecture", lecture_base_indices), ("lab", lab_base_indices)):
+            real_pool = [r for r in pool if r != TBA_ROOM_IDX]
+            prev_cap = -1
+            for cap, count in room_levels(real_pool, room_capacities):
+                ivs = [iv for iv, students in capacity_intervals[kind] if students > prev_cap]
+                if ivs:
+                    model.AddCumulative(ivs, [1] * len(ivs), count)
+                prev_cap = cap
+
+    # Links
+    profile.enter("section_links")
+    fixed_sections = {t["section"] for t in tasks if t["task_id"] in fixed}
+    own_identity = fixed_sections | pinned_sections   # kept out of symmetry breaking
+    ordered_pairs = []
+    symmetry = {"section_classes": 0, "section_orderings": 0, "room_classes": 0, "room_orderings": 0}
+    section_to_tasks = defaultdict(list)
+    for t in tasks:
+        if t["task_id"] in task_vars:
+            section_to_tasks[t["section"]].append(t)
+
+    for sec, tlist in section_to_tasks.items():
+        lects = [t for t in tlist if t["kind"] == "lecture"]
+        labs = [t for t in tlist if t["kind"] == "lab"]
+        for l_task in labs:
+            for lect_task in lects:
+                model.Add(task_vars[l_task["task_id"]]["instr"] == task_vars[lect_task["task_id"]]["instr"])
+        
+        split_lects = [t for t in lects if "_LECT_A" in t["task_id"] or "_LECT_B" in t["task_id"]]
+        if len(split_lects) == 2:
+            lA, lB = split_lects
+            vA = task_vars[lA["task_id"]]
+            vB = task_vars[lB["task_id"]]
+            model.Add(vA["instr"] == vB["instr"])
+            durA = lA["dur"]
+            min_gap = durA + 30
+            diff = model.NewIntVar(0, WEEK_MINUTES, f"gap_{sec}")
+            model.AddAbsEquality(diff, vA["start"] - vB["start"])
+            model.Add(diff >= min_gap)
+
+            # Equal halves are interchangeable: A is always the earlier one
+            if params.symmetry_breaking and lA["dur"] == lB["dur"] and sec not in own_identity:
+                profile.enter("symmetry")
+                model.Add(vB["start"] >= vA["start"] + min_gap)
+                ordered_pairs.append((lA["task_id"], lB["task_id"]))
+                profile.enter("section_links")
+
+    # Interchangeable sections: order them by the start of their first task
+    if params.symmetry_breaking:
+        profile.enter("symmetry")
+        skipped = {t["section"] for t in tasks if t["task_id"] not in task_vars}
+        for members in section_classes(instance, instr_candidates, exclude=own_identity | skipped):
+            for prev_sec, next_sec in zip(members, members[1:]):
+                first_prev = section_to_tasks[prev_sec][0]
+                first_next = section_to_tasks[next_sec][0]
+                prev_start = task_vars[first_prev["task_id"]]["start"]
+                next_start = task_vars[first_next["task_id"]]["start"]
+                # Same block group: the group NoOverlap keeps the starts apart
+                if section_to_group.get(prev_sec) and first_prev["dur"] > 0:
+                    model.Add(prev_start < next_start)
+                else:
+                    model.Add(prev_start <= next_start)
+                symmetry["section_orderings"] += 1
+            symmetry["section_classes"] += 1
+        symmetry["split_lecture_orderings"] = len(ordered_pairs)
+
+    # -------------------- Load Calculation & Objectives --------------------
+    objective_terms = defaultdict(list)  # family -> terms, see OBJECTIVE_FAMILIES
+    
+    # Instructor Totals
+    all_instructor_total_mins = []
+    
+    # Track permanent load just for reference if needed
+    permanent_load_vars = [] 
+
+    for i_idx, instr_id in enumerate(instructors):
+        profile.enter("instructor_load")
+        n_lim = instance.instructor_normal_min[i_idx] # e.g., 18 hours
+        o_lim = instance.instructor_overload_min[i_idx] # e.g., 12 hours
+        
+        # New variables to track accumulated time separately
+        normal_time_contribs = []   # Mon-Fri 8am-5pm
+        overload_time_contribs = [] # Mon-Fri 5pm+ OR Weekends
+        
+        # Calculate TOTAL minutes (for general stats)
+        total_instr_minutes_list = []
+
+        for t in instr_to_tasks[i_idx]:
+            tid = t["task_id"]
+            
+            # Check if assigned to this instructor
+            if (tid, i_idx) in assigned_instr:
+                is_assigned = assigned_instr[(tid, i_idx)]
+                dur = t["dur"]
+                
+                # Get the Pre-calculated Time Status (Day vs Evening/Weekend)
+                is_ot_slot = task_vars[tid]["is_ot"]
+
+                # --- 1. Contribution to "Overload Time" (Weekend/Evening) ---
+                is_assigned_and_ot = model.NewBoolVar(f"assign_ot_{tid}_{i_idx}")
+                model.AddBoolAnd([is_assigned, is_ot_slot]).OnlyEnforceIf(is_assigned_and_ot)
+                model.AddBoolOr([is_assigned.Not(), is_ot_slot.Not()]).OnlyEnforceIf(is_assigned_and_ot.Not())
+                overload_time_contribs.append(is_assigned_and_ot * dur)
+
+                # --- 2. Contribution to "Normal Time" (Weekday Day) ---
+                # assigned and not overtime = assigned - (assigned and overtime)
+                normal_time_contribs.append((is_assigned - is_assigned_and_ot) * dur)
+
+                # Track simple total
+                total_instr_minutes_list.append(is_assigned * dur)
+
+        # -------------------- THE FIX IS HERE --------------------
+        
+        # 1. Sum up Normal Time (Mon-Fri 8-5)
+        sum_norm_time = model.NewIntVar(0, WEEK_MINUTES, f"sum_norm_time_{i_idx}")
+        model.Add(sum_norm_time == sum(normal_time_contribs))
+        
+        # STRICT CONSTRAINT: You cannot teach more Normal Hours than the Normal Limit.
+        # This forces extra classes to be moved to Overload Hours.
+        model.Add(sum_norm_time <= n_lim)
+
+        if n_lim > 0:
+             # Calculate how many minutes they are "short" of their limit
+             underload = model.NewIntVar(0, WEEK_MINUTES, f"underload_{i_idx}")
+             model.Add(underload == n_lim - sum_norm_time)
+             
+             # Weight: 
+             # 50 points per minute empty. 
+             # If you are empty for 2 hours (120 mins), penalty is 6,000.
+             # This is enough to beat "convenience" but won't break the solver.
+             FILL_PRIORITY_WEIGHT = 50  
+             objective_terms["underload"].append(underload * -FILL_PRIORITY_WEIGHT)
+
+        # 2. Sum up Overload Time (Weekends/Eve)
+        sum_ot_time = model.NewIntVar(0, WEEK_MINUTES, f"sum_ot_time_{i_idx}")
+        model.Add(sum_ot_time == sum(overload_time_contribs))
+        
+        # STRICT CONSTRAINT: You cannot teach more Overload Hours than the Overload Limit.
+        model.Add(sum_ot_time <= o_lim)
+
+        # ---------------------------------------------------------
+
+        # Total Calculation
+        total_minutes = model.NewIntVar(0, WEEK_MINUTES, f"total_mins_{i_idx}")
+        model.Add(total_minutes == sum(total_instr_minutes_list))
+        all_instructor_total_mins.append(total_minutes)
+
+        if instance.instructor_permanent[i_idx]:
+            permanent_load_vars.append(total_minutes)
+
+        # Apply Objectives (Rewards/Penalties)
+        # Reward filling the Normal Load (Primary Goal)
+        objective_terms["normal_load"].append(sum_norm_time * NORMAL_LOAD_REWARD_PER_MIN)
+        
+        # Penalize Overload (Cost) - Lower priority than filling normal load
+        objective_terms["overload_cost"].append(sum_ot_time * -GLOBAL_OVERLOAD_COST_PER_MIN)
+
+        # Fairness penalty (optional, keeps overload distributed)
+        sq_over = model.NewIntVar(0, o_lim * o_lim, f"sq_over_{i_idx}")
+        model.AddMultiplicationEquality(sq_over, [sum_ot_time, sum_ot_time])
+        objective_terms["overload_fairness"].append(sq_over * -OVERLOAD_FAIRNESS_PENALTY)
+
+        # 5. Daily Spread Protection
+        # Only days where the instructor's candidate tasks could add up to more
+        # than MAX_DESIRED_DAILY_MIN can have an excess. `active` only has to be
+        # forced on: the excess it feeds is penalized, so it never turns on freely.
+        profile.enter("daily_spread")
+        for d in range(7):
+            day_tasks = [t for t in instr_to_tasks[i_idx] if d in task_vars[t["task_id"]]["days"]]
+            if sum(t["dur"] for t in day_tasks) <= MAX_DESIRED_DAILY_MIN:
+                continue
+            d_terms = []
+            for t in day_tasks:
+                tid = t["task_id"]
+                assigned = assigned_instr[(tid, i_idx)]
+                day_match = task_vars[tid]["on_day"][d]
+
+                active = model.NewBoolVar(f"{tid}_act_{d}_{i_idx}")
+                model.AddBoolOr([assigned.Not(), day_match.Not(), active])
+                d_terms.append(active * t["dur"])
+
+            excess = model.NewIntVar(0, 1440, f"exc_{i_idx}_{d}")
+            model.Add(excess >= sum(d_terms) - MAX_DESIRED_DAILY_MIN)
+            objective_terms["daily_spread"].append(excess * -DAILY_SPREAD_PENALTY)
+
+    # -------------------- Global Fairness --------------------
+    profile.enter("load_fairness")
+    if len(permanent_load_vars) > 1:
+        max_p_load = model.NewIntVar(0, WEEK_MINUTES, "max_perm_load")
+        min_p_load = model.NewIntVar(0, WEEK_MINUTES, "min_perm_load")
+        
+        model.AddMaxEquality(max_p_load, permanent_load_vars)
+        model.AddMinEquality(min_p_load, permanent_load_vars)
+        
+        load_gap = model.NewIntVar(0, WEEK_MINUTES, "perm_load_gap")
+        model.Add(load_gap == max_p_load - min_p_load)
+
+        objective_terms["load_fairness"].append(load_gap * -TOTAL_LOAD_FAIRNESS_PENALTY)
+
+    # -------------------- Room Usage Balancing --------------------
+    profile.enter("room_balance")
+    room_usage = {}
+    for r_idx in range(len(rooms) - 1): 
+        usage_vars = []
+        for t in tasks:
+            tid = t["task_id"]
+            if tid not in task_vars: continue
+            
+            if (tid, r_idx) in assigned_room:
+                 usage_vars.append(assigned_room[(tid, r_idx)] * t["dur"])
+        
+        if usage_vars:
+            r_total = model.NewIntVar(0, WEEK_MINUTES, f"room_usage_{r_idx}")
+            model.Add(r_total == sum(usage_vars))
+            room_usage[r_idx] = r_total
+            
+            r_hours = model.NewIntVar(0, 168, f"rh_{r_idx}")
+            model.AddDivisionEquality(r_hours, r_total, 60)
+
+            r_sq_hours = model.NewIntVar(0, 168*168, f"r_sq_{r_idx}")
+            model.AddMultiplicationEquality(r_sq_hours, [r_hours, r_hours])
+            
+            objective_terms["room_balance"].append(r_sq_hours * -20)
+
+    # Interchangeable rooms (same type and capacity): the lower index is used at least as much.
+    # Pinned rooms keep their identity; the rest of their class is still interchangeable.
+    if params.symmetry_breaking and not fixed:
+        profile.enter("symmetry")
+        for members in room_classes(instance):
+            used = [room_usage[r] for r in members if r in room_usage and r not in pinned_rooms]
+            for more, less in zip(used, used[1:]):
+                model.Add(more >= less)
+                symmetry["room_orderings"] += 1
+            symmetry["room_classes"] += 1
+    if params.symmetry_breaking:
+        report["symmetry"] = symmetry
+        print(f"[Solver] Symmetry breaking: {symmetry['split_lecture_orderings']} split lectures, "
+              f"{symmetry['section_orderings']} section orderings in {symmetry['section_classes']} classes, "
+              f"{symmetry['room_orderings']} room orderings in {symmetry['room_classes']} classes")
+
+    # --- Other Objectives ---
+    profile.enter("room_tba")
+    for sec_id, m_list in zip(sections, instance.matches):
+        sec_tasks = section_to_tasks.get(sec_id, [])
+        for (idx, score) in m_list:
+            w = int(round(score * MATCH_WEIGHT_SCALE))
+            for t in sec_tasks:
+                if (t["task_id"], idx) not in assigned_instr: continue
+                b = assigned_instr[(t["task_id"], idx)]
+                if w != 0: objective_terms["match"].append(b * w)
+
+    for t in tasks:
+        tid = t["task_id"]
+        if tid not in task_vars: continue
+        is_priority = section_priority_map.get(t["section"], False)
+        room_var = task_vars[tid]["room"]
+        
+        if two_phase:
+            is_tba = task_vars[tid]["has_room"].Not()
+        else:
+            is_tba = model.NewBoolVar(f"{tid}_is_tba")
+            model.Add(room_var == TBA_ROOM_IDX).OnlyEnforceIf(is_tba)
+            model.Add(room_var != TBA_ROOM_IDX).OnlyEnforceIf(is_tba.Not())
+        
+        if is_priority:
+            objective_terms["tba_priority"].append(is_tba * -TBA_PENALTY_PRIORITY)
+        else:
+            objective_terms["tba"].append(is_tba * -TBA_PENALTY_NORMAL)
+        objective_terms["real_room"].append(is_tba.Not() * REAL_ROOM_REWARD)
+
+    for t in tasks:
+        tid = t["task_id"]
+        if tid not in task_vars: continue
+        tv = task_vars[tid]
+        objective_terms["weekend"].append(tv["is_weekend"] * t["dur"] * -WEEKEND_TIME_PENALTY_PER_MINUTE)
+
+    profile.enter("day_balance")
+    for d_idx in range(len(DAYS)): # Iterate Mon(0) to Sun(6)
+        
+        # 1. Collect all tasks scheduled on this specific day
+        tasks_on_this_day = []
+        
+        for t in tasks:
+            tid = t["task_id"]
+            if tid not in task_vars: continue
+            
+            # "Is Task T assigned to Day D?" (shared indicator)
+            is_on_d = task_vars[tid]["on_day"][d_idx]
+
+            # If on this day, add its duration to the list
+            tasks_on_this_day.append(is_on_d * t["dur"])
+            
+        # 2. Sum the total minutes for this Day
+        if tasks_on_this_day:
+            d_total = model.NewIntVar(0, WEEK_MINUTES * 100, f"day_usage_{d_idx}")
+            model.Add(d_total == sum(tasks_on_this_day))
+            
+            # --- OPTIMIZATION: Convert to Hours first ---
+            d_hours = model.NewIntVar(0, WEEK_MINUTES, f"day_hours_{d_idx}")
+            model.AddDivisionEquality(d_hours, d_total, 60)
+            
+            # 3. Square the HOURS (Quadratic Penalty)
+            d_squared = model.NewIntVar(0, WEEK_MINUTES*WEEK_MINUTES, f"day_sq_{d_idx}")
+            model.AddMultiplicationEquality(d_squared, [d_hours, d_hours])
+            
+            # 4. Apply Penalty
+            objective_terms["day_balance"].append(d_squared * -50)
+
+    # --- Warm Start Hints ---
+    profile.enter("hints")
+    hinted = 0
+    model_hints = {**hints, **(params.incumbent or {})}
+    for tid_a, tid_b in ordered_pairs:
+        # A hint from a run without symmetry breaking may have the halves swapped
+        a, b = model_hints.get(tid_a), model_hints.get(tid_b)
+        if a and b and a["start"] > b["start"]:
+            model_hints[tid_a], model_hints[tid_b] = b, a
+    for tid, hint in model_hints.items():
+        tv = task_vars.get(tid)
+        if tv is None:
+            continue
+        props = slot_table(tv["dur"]).get(GLOBAL_MIN_TO_SLOT.get(hint["start"]))
+        if props is not None:
+            start, day, weekend, overtime = props
+            model.AddHint(tv["start"], start)
+            for d in range(7):
+                model.AddHint(tv["on_day"][d], d == day)
+            model.AddHint(tv["is_weekend"], weekend)
+            model.AddHint(tv["is_ot"], overtime)
+        if hint["instr"] is not None and (tid, hint["instr"]) in assigned_instr:
+            model.AddHint(tv["instr"], hint["instr"])
+            for i_idx in range(num_instructors):
+                if (tid, i_idx) in assigned_instr:
+                    model.AddHint(assigned_instr[(tid, i_idx)], i_idx == hint["instr"])
+        if hint["room"] is not None:
+            if two_phase:
+                model.AddHint(tv["has_room"], hint["room"] != TBA_ROOM_IDX)
+            elif hint["room"] in tv["rooms"]:
+                model.AddHint(tv["room"], hint["room"])
+                for r_idx in tv["rooms"]:
+                    model.AddHint(assigned_room[(tid, r_idx)], r_idx == hint["room"])
+        hinted += 1
+    if hints:
+        print(f"[Solver] Warm start: hinted {hinted}/{len(task_vars)} tasks")
+    report["hinted_tasks"] = hinted
+
+    # --- Model Size ---
+    full_pairs = len(task_vars) * num_instructors
+    kept_pairs = len(assigned_instr)
+    print(f"[Solver] Instructor pairs: kept {kept_pairs}/{full_pairs}, "
+          f"removed up to {(full_pairs - kept_pairs) * VARS_PER_INSTRUCTOR_PAIR} variables "
+          f"and {full_pairs - kept_pairs} intervals")
+    stats = model_statistics(model)
+    report["signatures"] = {"signatures": len(signatures), "tasks": sum(signatures.values()), "durations": len({k[0] for k in signatures})}
+    print(f"[Solver] Task signatures: {len(signatures)} (duration, kind, rooms) for {report['signatures']['tasks']} tasks")
+    print(f"[Solver] Model: {stats['variables']} variables ({stats['booleans']} booleans), "
+          f"{stats['constraints']} constraints")
+
+    # --- Solve ---
+    profile.enter("objective")
+    objective_parts = {name: sum(terms) for name, terms in objective_terms.items() if terms}
+    full_objective = sum(objective_parts.values())
+    stages = objective_stages(objective_parts, params.lexicographic)
+    model.Maximize(full_objective)
+    families = profile.summary()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = params.num_workers
+    solver.parameters.random_seed = params.random_seed
+    solver.parameters.log_search_progress = params.log_search_progress
+    if hinted and params.repair_hint:
+        solver.parameters.repair_hint = True
+        solver.parameters.hint_conflict_limit = 1000
+    apply_solver_params(solver.parameters, params.solver_params)
+    
+    report["build_seconds"] = round(time.time() - build_started, 3)
+    report["tasks"] = len(task_vars)
+    report["variables"] = stats["variables"]
+    report["constraints"] = stats["constraints"]
+    if params.export_model_path:
+        size = save_model(model, params.export_model_path)
+        report["model_file"] = params.export_model_path
+        print(f"[Solver] Model saved to {params.export_model_path} ({size / 1024:.0f} KB)")
+    report["model_stats"] = stats
+    report["families"] = families
+    report["objective_terms"] = {name: len(terms) for name, terms in objective_terms.items() if terms}
+    heaviest = sorted(families.items(), key=lambda kv: -kv[1]["constraints"])[:4]
+    print("[Solver] Heaviest families: " + ", ".join(
+        f"{name} {row['variables']}v/{row['constraints']}c {row['seconds']:.2f}s" for name, row in heaviest))
+    phase(
+        "build",
+        tasks=len(task_vars),
+        instructors=num_instructors,
+        rooms=num_rooms,
+        variables=report["variables"],
+        constraints=report["constraints"],
+        seconds=report["build_seconds"],
+    )
+
+    # --- Solution read-out (shared by checkpoints and the final result) ---
+    def snapshot(cb):
+        return {
+            tid: (
+                cb.Value(tv["start"]),
+                cb.Value(tv["instr"]),
+                cb.BooleanValue(tv["has_room"]) if two_phase else cb.Value(tv["room"]),
+            )
+            for tid, tv in task_vars.items()
+        }
+
+    def to_entries(values):
+        room_stats = None
+        if two_phase:
+            # Rooms: phase 2 on the fixed times
+            placed_tasks = []
+            for tid, (start_val, _i_idx, wants_room) in values.items():
+                tv = task_vars[tid]
+                placed_tasks.append({
+                    "task_id": tid,
+                    "start": start_val,
+                    "end": start_val + tv["dur"],
+                    "rooms": [TBA_ROOM_IDX] if start_val // 1440 >= 5 else tv["rooms"],
+                    "priority": section_priority_map.get(tv["section"], False),
+                    "wants_room": wants_room,
+                    "fixed": tid in fixed or "room" in pins.get(tid, {}),
+                })
+            room_choice, room_stats = assign_rooms(placed_tasks, room_capacities, TBA_ROOM_IDX)
+        else:
+            room_choice = {tid: v[2] for tid, v in values.items()}
+
+        entries = []
+        for t in tasks:
+            tid = t["task_id"]
+            if tid not in values: continue
+            if tid in fixed: continue  # incremental: unchanged rows stay in place
+            r_idx = room_choice[tid]
+            entries.append({
+                "task_id": tid,
+                "section": t["section"],
+                "kind": t["kind"],
+                "start": values[tid][0],
+                "dur": t["dur"],
+                "instructor": instructors[values[tid][1]],
+                "room": None if r_idx == TBA_ROOM_IDX else rooms[r_idx],
+            })
+        return entries, room_choice, room_stats
+
+    resolved_sections = sorted({t["section"] for t in tasks if t["task_id"] in task_vars and t["task_id"] not in fixed})
+
+    # --- Solution pool: the best distinct schedules seen during the (last stage of the) search ---
+    pool = None
+
+    def read_solution(cb):
+        values = snapshot(cb)
+        if pool is not None:
+            breakdown = {name: cb.Value(expr) for name, expr in objective_parts.items()}
+            pool.offer(
+                sum(breakdown.values()),
+                {tid: (v[0], instructors[v[1]]) for tid, v in values.items()},
+                values=values,
+                breakdown=breakdown,
+            )
+        return values
+
+    def weighted_score(cb):
+        # Lexicographic stages report the full weighted objective, so runs, workers
+        # and stop rules compare on one scale; the bound keeps the stage's gap.
+        value = cb.Value(full_objective)
+        return value, value + cb.BestObjectiveBound() - cb.ObjectiveValue()
+
+    def write_checkpoint(values, event):
+        entries, _, _ = to_entries(values)
+        checkpoint({
+            "incremental": incremental,
+            "resolved_sections": resolved_sections,
+            "event": event,
+            "entries": entries,
+        })
+
+    if stop_policy and stop_policy.is_active:
+        report["stop_policy"] = stop_policy.to_dict()
+
+    print("[Solver] Starting solve...")
+    phase("solve", time_limit_seconds=params.time_limit_seconds)
+    best = None        # readout of the last stage that found a solution
+    history, stage_reports = [], []
+    first_feasible = None
+    remaining = params.time_limit_seconds
+    all_optimal = True
+    for pos, (stage, stage_families, share) in enumerate(stages):
+        final = pos == len(stages) - 1
+        stage_objective = sum(objective_parts[f] for f in stage_families)
+        budget = remaining if final else remaining * share / sum(st[2] for st in stages[pos:])
+        solver.parameters.max_time_in_seconds = budget
+        if params.lexicographic:
+            model.Maximize(stage_objective)
+            print(f"[Solver] Stage {pos + 1}/{len(stages)} {stage}: {', '.join(stage_families)} ({budget:.0f}s)")
+            phase("stage", stage=stage, index=pos + 1, stages=len(stages), time_limit_seconds=round(budget, 1))
+        if final and params.pool_size > 1 and not incremental:
+            pool = SolutionPool(params.pool_size, min_distance_for(len(task_vars), params.pool_min_distance))
+
+        elapsed = params.time_limit_seconds - remaining
+        recorder = SolutionRecorder(
+            snapshot=read_solution if checkpoint or pool else None,
+            on_solution=on_solution,
+            checkpoint=write_checkpoint if checkpoint else None,
+            stop_policy=stop_policy,
+            should_stop=should_stop,
+            score=weighted_score if params.lexicographic else None,
+            wall_offset=elapsed,
+        )
+        with recorder.watching(solver):
+            status = solver.Solve(model, recorder)
+        recorder.flush()
+        remaining = max(0.0, remaining - solver.WallTime())
+        history += [{**e, "stage": stage} if params.lexicographic else e for e in recorder.history]
+        if first_feasible is None:
+            first_feasible = recorder.first_solution_time
+        print(f"[Solver] Status: {solver.StatusName(status)}")
+        if recorder.stopped_by:
+            print(f"[Solver] Stopped early by policy: {recorder.stopped_by}")
+
+        stage_report = {
+            "stage": stage,
+            "families": list(stage_families),
+            "status": solver.StatusName(status),
+            "time_limit_seconds": round(budget, 1),
+            "seconds": round(solver.WallTime(), 3),
+            "solutions": recorder.solution_count,
+            "stopped_by": recorder.stopped_by,
+        }
+        stage_reports.append(stage_report)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            break
+        all_optimal = all_optimal and status == cp_model.OPTIMAL
+        stage_report["objective"] = solver.ObjectiveValue()
+        stage_report["best_bound"] = solver.BestObjectiveBound()
+        best = {
+            "values": snapshot(solver),
+            "breakdown": {name: solver.Value(expr) for name, expr in objective_parts.items()},
+            "gap": solver.BestObjectiveBound() - solver.ObjectiveValue(),
+        }
+        if final or (recorder.stopped_by and not recorder.stopped_by.startswith(("no_improvement", "gap"))):
+            break
+
+        # Keep this stage's level and start the next one from its solution
+        model.Add(stage_objective >= round(solver.ObjectiveValue()))
+        model.ClearHints()
+        for v_idx in range(len(model.Proto().variables)):
+            var = model.GetIntVarFromProtoIndex(v_idx)
+            model.AddHint(var, solver.Value(var))
+
+    stopped_by = next((st["stopped_by"] for st in stage_reports if st["stopped_by"]), None)
+    if best is not None and (not all_optimal or len(stage_reports) < len(stages)):
+        status = cp_model.FEASIBLE
+    elif best is not None:
+        status = cp_model.OPTIMAL
+    report["stopped_by"] = stopped_by or ("time_limit" if status == cp_model.FEASIBLE else None)
+    report["status"] = solver.StatusName(status)
+    report["solve_seconds"] = round(params.time_limit_seconds - remaining, 3)
+    report["first_feasible_seconds"] = round(first_feasible, 3) if first_feasible is not None else None
+    report["solutions"] = len(history)
+    report["history"] = history
+    if params.lexicographic:
+        report["stages"] = stage_reports
+
+    solution = Solution(status=report["status"], report=report)
+    if best is not None:
+        report["objective"] = float(sum(best["breakdown"].values()))
+        report["best_bound"] = report["objective"] + best["gap"]
+        report["gap_percent"] = round(relative_gap_percent(report), 4)
+
+        entries, room_choice, room_stats = to_entries(best["values"])
+        if room_stats:
+            print(f"[Solver] Phase 2 rooms: {room_stats['tba']} of {room_stats['tasks']} tasks TBA "
+                  f"({room_stats['tba_priority']} priority)")
+        report["tba"] = sum(1 for r in room_choice.values() if r == TBA_ROOM_IDX)
+        report["objective_breakdown"] = best["breakdown"]
+
+        if pool is not None:
+            # Lexicographic stages can end on a solution the weighted pool ranks lower
+            pool.offer(
+                report["objective"],
+                {tid: (v[0], instructors[v[1]]) for tid, v in best["values"].items()},
+                values=best["values"],
+                breakdown=best["breakdown"],
+            )
+            for member in pool.ranked():
+                member_entries = entries if member["values"] == best["values"] else to_entries(member["values"])[0]
+                solution.candidates.append({
+                    "rank": member["rank"],
+                    "objective": member["objective"],
+                    "distance": member["distance"],
+                    "breakdown": member["breakdown"],
+                    "tba": sum(1 for e in member_entries if e["room"] is None),
+                    "entries": member_entries,
+                })
+            report["pool"] = {
+                "size": pool.size,
+                "min_distance": pool.min_distance,
+                "objectives": [c["objective"] for c in solution.candidates],
+            }
+            print(f"[Solver] Solution pool: {len(solution.candidates)} distinct schedules "
+                  f"(at least {pool.min_distance} tasks apart)")
+
+        solution.objective = report["objective"]
+        solution.entries = entries
+        solution.resolved_sections = resolved_sections
+    else:
+        print("[Solver] No feasible solution found.")
+    return solution
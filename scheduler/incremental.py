@@ -0,0 +1,165 @@
+# scheduler/incremental.py
+from collections import defaultdict
+
+
+def find_changed_sections(tasks, hints, rows_per_section, data, slot_ok, room_ok, instr_ok=None):
+    """
+    Sections whose previous placement can no longer be kept as-is:
+      - new sections, or sections whose task layout changed (row count differs,
+        e.g. a lecture that is now split),
+      - a previous slot that no longer fits the task duration,
+      - a previous instructor or room that is gone or no longer valid,
+      - a previous instructor who is no longer available at that time,
+      - a previous time that now collides with a GenEd block of its group,
+      - placements that break a hard rule once frozen (lecture/lab on different
+        instructors, double-booked instructor/room/block group, instructor caps).
+
+    rows_per_section: {section_id: number of Schedule rows in the previous batch}.
+    slot_ok(task, start) / room_ok(task, room_idx) / instr_ok(task, start, instructor_idx)
+    are supplied by the solver.
+    """
+    section_to_group = data.get("section_to_group", {})
+
+    gened_by_group = defaultdict(list)
+    for g_day, g_start, g_end, g_group in data.get("gened_blocks", []):
+        gened_by_group[g_group].append((g_day * 1440 + g_start, g_day * 1440 + g_end))
+
+    tasks_per_section = defaultdict(int)
+    changed = set()
+    for t in tasks:
+        sec = t["section"]
+        tasks_per_section[sec] += 1
+        hint = hints.get(t["task_id"])
+        if hint is None or hint["instr"] is None or hint["room"] is None:
+            changed.add(sec)
+            continue
+        if not slot_ok(t, hint["start"]) or not room_ok(t, hint["room"]):
+            changed.add(sec)
+            continue
+        if instr_ok is not None and not instr_ok(t, hint["start"], hint["instr"]):
+            changed.add(sec)
+            continue
+        start, end = hint["start"], hint["start"] + t["dur"]
+        for g_s, g_e in gened_by_group.get(section_to_group.get(sec), ()):
+            if start < g_e and g_s < end:
+                changed.add(sec)
+                break
+
+    for sec, count in tasks_per_section.items():
+        if rows_per_section.get(sec, 0) != count:
+            changed.add(sec)
+
+    changed |= _conflicting_sections(tasks, hints, data)
+    return changed
+
+
+def _conflicting_sections(tasks, hints, data):
+    section_to_group = data.get("section_to_group", {})
+    tba_idx = data.get("TBA_ROOM_IDX", len(data["rooms"]) - 1)
+    instructors = data["instructors"]
+    caps = data.get("instructor_caps", {})
+
+    placed = [(t, hints[t["task_id"]]) for t in tasks if t["task_id"] in hints]
+    conflicts = set()
+
+    # Lecture and lab of a section must share the instructor
+    section_instr = defaultdict(set)
+    for t, hint in placed:
+        section_instr[t["section"]].add(hint["instr"])
+    conflicts |= {sec for sec, instrs in section_instr.items() if len(instrs) > 1}
+
+    # Split lectures keep their minimum gap
+    split_starts = defaultdict(dict)
+    for t, hint in placed:
+        if t["task_id"].endswith(("_LECT_A", "_LECT_B")):
+            split_starts[t["section"]][t["task_id"][-1]] = (hint["start"], t["dur"])
+    for sec, parts in split_starts.items():
+        if "A" in parts and "B" in parts:
+            (start_a, dur_a), start_b = parts["A"], parts["B"][0]
+            if abs(start_a - start_b) < dur_a + 30:
+                conflicts.add(sec)
+
+    # Double bookings per instructor, room and block group
+    resources = defaultdict(list)
+    for t, hint in placed:
+        span = (hint["start"], hint["start"] + t["dur"], t["section"])
+        resources[("instr", hint["instr"])].append(span)
+        if hint["room"] not in (None, tba_idx):
+            resources[("room", hint["room"])].append(span)
+        group = section_to_group.get(t["section"])
+        if group:
+            resources[("group", group)].append(span)
+    for spans in resources.values():
+        spans.sort()
+        reach_end, reach_sec = -1, None
+        for start, end, sec in spans:
+            if start < reach_end:
+                conflicts.update((sec, reach_sec))
+            if end > reach_end:
+                reach_end, reach_sec = end, sec
+
+    # Normal / overload caps of each instructor
+    normal_min = defaultdict(int)
+    overload_min = defaultdict(int)
+    instr_sections = defaultdict(set)
+    for t, hint in placed:
+        i_idx = hint["instr"]
+        if i_idx is None:
+            continue
+        instr_sections[i_idx].add(t["section"])
+        end = hint["start"] + t["dur"]
+        if hint["start"] // 1440 >= 5 or end % 1440 > 17 * 60:
+            overload_min[i_idx] += t["dur"]
+        else:
+            normal_min[i_idx] += t["dur"]
+    for i_idx, secs in instr_sections.items():
+        c = caps.get(instructors[i_idx], {})
+        if normal_min[i_idx] > c.get("normal_limit_min", 1080) or overload_min[i_idx] > c.get("overload_limit_min", 720):
+            conflicts |= secs
+
+    return conflicts
+
+
+def build_neighborhood(changed, tasks, hints, data):
+    """
+    Sections that are re-optimized around the changed ones: the changed sections,
+    every section of their block groups, and every section that shares a previous
+    instructor or (real) room with a changed section. Everything else stays fixed.
+    """
+    section_to_group = data.get("section_to_group", {})
+    tba_idx = data.get("TBA_ROOM_IDX", len(data["rooms"]) - 1)
+
+    groups = {section_to_group.get(s) for s in changed}
+    touched_instr = set()
+    touched_rooms = set()
+    for t in tasks:
+        if t["section"] not in changed:
+            continue
+        hint = hints.get(t["task_id"])
+        if hint is None:
+            continue
+        if hint["instr"] is not None:
+            touched_instr.add(hint["instr"])
+        if hint["room"] is not None and hint["room"] != tba_idx:
+            touched_rooms.add(hint["room"])
+
+    neighborhood = set(changed)
+    for t in tasks:
+        sec = t["section"]
+        if sec in neighborhood:
+            continue
+        if section_to_group.get(sec) in groups:
+            neighborhood.add(sec)
+            continue
+        hint = hints.get(t["task_id"])
+        if hint and (hint["instr"] in touched_instr or hint["room"] in touched_rooms):
+            neighborhood.add(sec)
+
+    stats = {
+        "changed_sections": len(changed),
+        "neighborhood_sections": len(neighborhood),
+        "groups": len(groups),
+        "instructors": len(touched_instr),
+        "rooms": len(touched_rooms),
+    }
+    return neighborhood, stats
@@ -0,0 +1,229 @@
+# scheduler/instance.py
+import hashlib
+import json
+from dataclasses import dataclass, field, asdict
+from functools import cached_property
+
+from scheduler.candidates import CANDIDATE_TOP_K
+from scheduler.solution_pool import POOL_MIN_DISTANCE
+
+# No Django imports in this module: instances are built once from the database
+# (data_extractors.build_problem_instance) and can then be pickled to worker
+# processes, saved as JSON and replayed without a database.
+
+
+@dataclass(frozen=True)
+class ProblemInstance:
+    """
+    Everything the solver needs for one semester, as index-aligned tuples.
+
+    instructors, sections and rooms hold the database keys; every other tuple is
+    aligned with one of them by position. The last room is the TBA room.
+    matches[s] holds (instructor_idx, score) pairs for section s.
+    gened_blocks are (day, start_min, end_min, group).
+    instructor_employment holds "permanent" / "part-time" / "overload" (empty
+    for instances saved before it was recorded).
+    instructor_availability holds each instructor's (day, start_min, end_min)
+    teaching windows, () for an instructor available all week (the whole tuple
+    is empty when nobody has windows).
+    """
+    semester_id: int
+    semester_name: str
+
+    instructors: tuple
+    instructor_normal_min: tuple
+    instructor_overload_min: tuple
+    instructor_permanent: tuple
+
+    sections: tuple
+    section_lecture_min: tuple
+    section_lab_min: tuple
+    section_students: tuple
+    section_priority: tuple
+    section_group: tuple
+    matches: tuple
+
+    rooms: tuple
+    room_types: tuple
+    room_capacities: tuple
+
+    gened_blocks: tuple = ()
+    instructor_employment: tuple = ()
+    instructor_availability: tuple = ()
+
+    @property
+    def tba_room_idx(self):
+        return len(self.rooms) - 1
+
+    @classmethod
+    def from_solver_data(cls, data, semester_id=None, semester_name=""):
+        """Packs the dict returned by get_solver_data."""
+        instructors = tuple(data["instructors"])
+        sections = tuple(data["sections"])
+        rooms = tuple(data["rooms"])
+        caps = data.get("instructor_caps", {})
+        hours = data.get("section_hours", {})
+        i_map = data.get("instructor_index") or {i_id: idx for idx, i_id in enumerate(instructors)}
+        permanent = set(data.get("permanent_instructors", ()))
+        matches = data.get("matches", {})
+        employment = data.get("instructor_employment") or {}
+        availability = data.get("instructor_availability") or {}
+
+        return cls(
+            semester_id=semester_id,
+            semester_name=semester_name,
+            instructors=instructors,
+            instructor_normal_min=tuple(int(caps.get(i, {}).get("normal_limit_min", 1080)) for i in instructors),
+            instructor_overload_min=tuple(int(caps.get(i, {}).get("overload_limit_min", 720)) for i in instructors),
+            instructor_permanent=tuple(i in permanent for i in instructors),
+            sections=sections,
+            section_lecture_min=tuple(int(hours.get(s, {}).get("lecture_min", 0) or 0) for s in sections),
+            section_lab_min=tuple(int(hours.get(s, {}).get("lab_min", 0) or 0) for s in sections),
+            section_students=tuple(int(data.get("section_num_students", {}).get(s, 0) or 0) for s in sections),
+            section_priority=tuple(bool(data.get("section_priority_map", {}).get(s, False)) for s in sections),
+            section_group=tuple(data.get("section_to_group", {}).get(s) for s in sections),
+            matches=tuple(
+                tuple((i_map[i_id], float(score)) for i_id, score in matches.get(s, ()) if i_id in i_map)
+                for s in sections
+            ),
+            rooms=rooms,
+            room_types=tuple(data.get("room_types", {}).get(r, "lecture") for r in range(len(rooms))),
+            room_capacities=tuple(int(data.get("room_capacities", {}).get(r, 0)) for r in range(len(rooms))),
+            gened_blocks=tuple(tuple(b) for b in data.get("gened_blocks", ())),
+            instructor_employment=tuple(employment.get(i, "") for i in instructors) if employment else (),
+            instructor_availability=(
+                tuple(tuple(tuple(w) for w in availability.get(i, ())) for i in instructors) if availability else ()
+            ),
+        )
+
+    @cached_property
+    def solver_data(self):
+        """
+        The same instance in the dict layout of get_solver_data, for the helpers
+        that work on it (candidates, warm_start, incremental).
+        """
+        return {
+            "instructors": self.instructors,
+            "sections": self.sections,
+            "gened_blocks": self.gened_blocks,
+            "section_to_group": dict(zip(self.sections, self.section_group)),
+            "rooms": self.rooms,
+            "room_types": dict(enumerate(self.room_types)),
+            "room_capacities": dict(enumerate(self.room_capacities)),
+            "instructor_index": {i_id: idx for idx, i_id in enumerate(self.instructors)},
+            "section_priority_map": dict(zip(self.sections, self.section_priority)),
+            "section_num_students": dict(zip(self.sections, self.section_students)),
+            "instructor_caps": {
+                i_id: {"normal_limit_min": n, "overload_limit_min": o}
+                for i_id, n, o in zip(self.instructors, self.instructor_normal_min, self.instructor_overload_min)
+            },
+            "section_hours": {
+                s: {"lecture_min": lec, "lab_min": lab}
+                for s, lec, lab in zip(self.sections, self.section_lecture_min, self.section_lab_min)
+            },
+            "matches": {
+                s: tuple((self.instructors[idx], score) for idx, score in m)
+                for s, m in zip(self.sections, self.matches) if m
+            },
+            "permanent_instructors": tuple(i for i, p in zip(self.instructors, self.instructor_permanent) if p),
+            "non_permanent_instructors": tuple(i for i, p in zip(self.instructors, self.instructor_permanent) if not p),
+            "instructor_employment": dict(zip(self.instructors, self.instructor_employment)),
+            "instructor_availability": dict(zip(self.instructors, self.instructor_availability)),
+            "TBA_ROOM_IDX": self.tba_room_idx,
+        }
+
+    def to_dict(self):
+        """JSON-friendly form (tuples become lists)."""
+        return {f: getattr(self, f) for f in self.__dataclass_fields__}
+
+    @classmethod
+    def from_dict(cls, payload):
+        def freeze(value):
+            if isinstance(value, list):
+                return tuple(freeze(v) for v in value)
+            return value
+        return cls(**{k: freeze(v) for k, v in payload.items() if k in cls.__dataclass_fields__})
+
+    def input_hash(self):
+        """sha256 of the instance data (the semester name is only a label)."""
+        payload = {k: v for k, v in self.to_dict().items() if k != "semester_name"}
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def __getstate__(self):
+        # Keep pickles small: solver_data is rebuilt on demand
+        state = dict(self.__dict__)
+        state.pop("solver_data", None)
+        return state
+
+
+@dataclass
+class SolveParams:
+    """
+    How to solve an instance. Everything here is plain data, so it travels with
+    the instance to another process.
+
+    hints: {task_id: {"start", "instr", "room"}} from warm_start.build_schedule_hints
+    previous_rows: {section_id: number of rows} of the hinted batch (incremental mode)
+    incumbent: hints in the same layout that only guide the search (a better
+               solution found by another portfolio worker); unlike `hints` they
+               never decide which sections incremental mode keeps fixed
+    pins:      {task_id: {"start"?, "room"?, "instr"?}} hand-fixed parts of the
+               previous schedule (warm_start.build_schedule_pins, checked by
+               pins.resolve_pins); the model takes them as constants
+    solver_params: extra CP-SAT parameters by name, e.g. {"linearization_level": 2}
+    symmetry_breaking: order interchangeable split lectures, sections and rooms
+               (symmetry.py) so CP-SAT does not search their permutations
+    pool_size: keep this many distinct schedules from the search as candidates
+               (solution_pool.py), at least pool_min_distance (share of tasks) apart
+               on time/instructor; 0 or 1 keeps only the best. Not in incremental mode.
+    lexicographic: optimize the objective in stages (engine.OBJECTIVE_STAGES: room
+               coverage, then teaching load, then preferences), each keeping the
+               level of the earlier ones, instead of one weighted sum
+    export_model_path: write the built CpModelProto there (model_export.py; gzip
+               if it ends in .gz) for offline replay. The saved objective is the
+               full weighted one, also in lexicographic mode.
+    """
+    time_limit_seconds: int = 600
+    top_k: int = CANDIDATE_TOP_K
+    two_phase: bool = False
+    repair_hint: bool = False
+    incremental: bool = False
+    changed_sections: tuple = ()
+    hints: dict = field(default_factory=dict)
+    previous_rows: dict = field(default_factory=dict)
+    incumbent: dict = field(default_factory=dict)
+    pins: dict = field(default_factory=dict)
+    num_workers: int = 3
+    random_seed: int = 42
+    log_search_progress: bool = True
+    solver_params: dict = field(default_factory=dict)
+    symmetry_breaking: bool = False
+    pool_size: int = 0
+    pool_min_distance: float = POOL_MIN_DISTANCE
+    lexicographic: bool = False
+    export_model_path: str = ""
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class Solution:
+    """
+    Result of solve(). entries are {task_id, section, kind, start (minute of week),
+    dur, instructor (id), room (id or None for TBA)} for every task that was solved
+    (in incremental mode: only the re-solved sections listed in resolved_sections).
+    candidates: with SolveParams.pool_size, the best distinct schedules as
+    {rank, objective, distance, breakdown, tba, entries}; rank 1 is this solution.
+    """
+    status: str
+    objective: float = None
+    entries: list = field(default_factory=list)
+    resolved_sections: list = field(default_factory=list)
+    report: dict = field(default_factory=dict)
+    candidates: list = field(default_factory=list)
+
+    @property
+    def feasible(self):
+        return self.status in ("OPTIMAL", "FEASIBLE")
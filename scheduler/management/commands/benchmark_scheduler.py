@@ -0,0 +1,78 @@
+# scheduler/management/commands/benchmark_scheduler.py
+import json
+
+from django.core.management.base import BaseCommand
+from scheduling.models import Semester
+from scheduler.benchmark import BENCHMARK_MODES, DEFAULT_BENCHMARK_MODES, run_benchmark
+from scheduler.candidates import CANDIDATE_TOP_K
+from scheduler.data_extractors import build_problem_instance
+from scheduler.instance import ProblemInstance, SolveParams
+
+
+class Command(BaseCommand):
+    help = "Run the solver in each mode (without saving) and report build time, time-to-feasible, gap and memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("semester_id", type=int, nargs="?", help="ID of semester to benchmark")
+        parser.add_argument("--instance", default=None, help="Instance JSON from generate_synthetic_semester instead of a semester")
+        parser.add_argument("--time", type=int, default=300, help="Time limit per mode in seconds (default 300)")
+        parser.add_argument("--top-k", type=int, default=CANDIDATE_TOP_K, help="Candidate instructors per section")
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(BENCHMARK_MODES),
+            default=list(DEFAULT_BENCHMARK_MODES),
+            help="Solver modes to compare (default: monolithic two_phase)"
+        )
+        parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+        parser.add_argument("--json", action="store_true", help="Print the JSON report instead of the table")
+
+    def handle(self, *args, **options):
+        if options["instance"]:
+            with open(options["instance"]) as f:
+                payload = json.load(f)
+            instance = ProblemInstance.from_dict(payload.get("instance", payload))
+        elif options["semester_id"] is not None:
+            try:
+                semester = Semester.objects.get(pk=options["semester_id"])
+            except Semester.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f"Semester with ID {options['semester_id']} not found."))
+                return
+            instance = build_problem_instance(semester)
+        else:
+            self.stdout.write(self.style.ERROR("Give a semester ID or --instance."))
+            return
+
+        params = SolveParams(
+            time_limit_seconds=options["time"],
+            top_k=options["top_k"],
+            log_search_progress=False,
+        )
+        report = run_benchmark(instance, modes=options["modes"], params=params)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        header = (f"{'mode':<12} {'status':<10} {'vars':>7} {'cons':>7} {'build s':>8} {'first feas s':>13} "
+                  f"{'solve s':>8} {'objective':>14} {'gap %':>8} {'RSS MB':>7} {'TBA':>5}")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for r in report["results"]:
+            first = r.get("first_feasible_seconds")
+            objective = r.get("objective")
+            gap = r.get("gap_percent")
+            self.stdout.write(
+                f"{r['mode']:<12} {r.get('status', '-'):<10} {r.get('variables') or 0:>7} {r.get('constraints') or 0:>7} "
+                f"{r.get('build_seconds') or 0:>8} "
+                f"{first if first is not None else '-':>13} {r.get('solve_seconds') or 0:>8} "
+                f"{objective if objective is not None else '-':>14} {gap if gap is not None else '-':>8} "
+                f"{r.get('peak_rss_mb') or '-':>7} {r.get('tba') if r.get('tba') is not None else '-':>5}"
+            )
+        if options["output"]:
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS("[Done] Benchmark complete."))
@@ -1,9 +1,9 @@
 # scheduler/management/commands/check_hours.py
 from django.core.management.base import BaseCommand
-from scheduler.diagnostics import check_supply_vs_demand
+from scheduler.diagnostics import check_supply_vs_demand, print_precheck
 
 class Command(BaseCommand):
-    help = 'Checks if there are enough instructor hours to cover section demand.'
+    help = 'Checks if there are enough instructor hours to cover section demand, then runs the pre-solve checks.'
 
     def add_arguments(self, parser):
         # Optional: Allow passing a specific semester ID
@@ -17,4 +17,5 @@ class Command(BaseCommand):
         semester_id = options['semester_id']
         
         # Call the logic we defined in diagnostics.py
-        check_supply_vs_demand(semester_id)
\ No newline at end of file
+        check_supply_vs_demand(semester_id)
+        print_precheck(semester_id)
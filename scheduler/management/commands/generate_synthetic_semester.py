@@ -0,0 +1,32 @@
+# scheduler/management/commands/generate_synthetic_semester.py
+import json
+
+from django.core.management.base import BaseCommand
+from scheduler.synthetic import GENERATOR_DEFAULTS, generate_instance
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic semester (solver instance JSON) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the instance JSON file to write")
+        parser.add_argument("--sections", type=int, default=GENERATOR_DEFAULTS["sections"], help="Number of sections")
+        parser.add_argument("--instructors", type=int, default=GENERATOR_DEFAULTS["instructors"], help="Number of instructors")
+        parser.add_argument("--rooms", type=int, default=GENERATOR_DEFAULTS["rooms"], help="Number of rooms (TBA not counted)")
+        parser.add_argument("--lab-ratio", type=float, default=GENERATOR_DEFAULTS["lab_ratio"], help="Share of sections with a lab (also the share of lab rooms)")
+        parser.add_argument("--gened-density", type=float, default=GENERATOR_DEFAULTS["gened_density"], help="Share of each block group's weekday 8-17 time taken by GenEd")
+        parser.add_argument("--groups", type=int, default=GENERATOR_DEFAULTS["groups"], help="Number of block groups")
+        parser.add_argument("--seed", type=int, default=GENERATOR_DEFAULTS["seed"], help="Random seed (same seed, same instance)")
+
+    def handle(self, *args, **options):
+        generator = {key: options[key] for key in GENERATOR_DEFAULTS}
+        instance = generate_instance(**generator)
+
+        with open(options["output"], "w") as f:
+            json.dump({"generator": generator, "instance": instance.to_dict()}, f)
+
+        self.stdout.write(
+            f"{len(instance.sections)} sections, {len(instance.instructors)} instructors, "
+            f"{len(instance.rooms) - 1} rooms, {len(instance.gened_blocks)} GenEd blocks"
+        )
+        self.stdout.write(self.style.SUCCESS(f"[Done] Instance written to {options['output']}"))
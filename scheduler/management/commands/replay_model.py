@@ -0,0 +1,83 @@
+# scheduler/management/commands/replay_model.py
+import json
+import os
+
+from django.core.management.base import BaseCommand
+from scheduler.model_replay import DEFAULT_REPLAY_SETS, REPLAY_PARAM_SETS, parse_param_set, replay_model
+from scheduler.models import SolverRun
+
+
+class Command(BaseCommand):
+    help = "Solve a saved CP-SAT model under several CpSolver parameter sets in parallel and compare the results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", nargs="?", help="Saved model (.pb.gz, .pb or .pbtxt such as debug_model.pbtxt)")
+        parser.add_argument("--run", type=int, default=None, help="Replay the model saved by this SolverRun instead")
+        parser.add_argument("--time", type=int, default=60, help="Time limit per parameter set in seconds (default 60)")
+        parser.add_argument(
+            "--sets",
+            nargs="+",
+            choices=list(REPLAY_PARAM_SETS),
+            default=list(DEFAULT_REPLAY_SETS),
+            help=f"Named parameter sets (default: {' '.join(DEFAULT_REPLAY_SETS)})"
+        )
+        parser.add_argument(
+            "--param",
+            action="append",
+            default=[],
+            help='Extra set as "name=key:value,key:value", e.g. "lp2_8w=linearization_level:2,num_search_workers:8" (repeatable)'
+        )
+        parser.add_argument("--processes", type=int, default=None, help="Parameter sets solved at once (default: all)")
+        parser.add_argument("--output", default=None, help="Write the JSON results to this file")
+        parser.add_argument("--json", action="store_true", help="Print the JSON results instead of the table")
+
+    def handle(self, *args, **options):
+        path = options["model"]
+        if options["run"] is not None:
+            run = SolverRun.objects.filter(pk=options["run"]).first()
+            path = (run.details or {}).get("model_file") if run else None
+            if not path:
+                self.stdout.write(self.style.ERROR(f"Solver run {options['run']} has no saved model."))
+                return
+        if not path or not os.path.exists(path):
+            self.stdout.write(self.style.ERROR(f"Model file not found: {path or '(none given)'}"))
+            return
+
+        param_sets = {name: REPLAY_PARAM_SETS[name] for name in options["sets"]}
+        for text in options["param"]:
+            name, overrides = parse_param_set(text)
+            param_sets[name] = overrides
+
+        print(f"[Replay] {path}: {len(param_sets)} parameter sets, {options['time']}s each")
+        results = replay_model(path, param_sets, time_limit_seconds=options["time"], processes=options["processes"])
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({"model": path, "time_limit_seconds": options["time"], "results": results}, f, indent=2)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        header = (f"{'set':<16} {'status':<10} {'objective':>14} {'bound':>14} {'gap %':>8} "
+                  f"{'first feas s':>13} {'sols':>5} {'wall s':>8} {'conflicts':>10} {'RSS MB':>7}")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for r in results:
+            if r.get("error"):
+                self.stdout.write(f"{r['name']:<16} {r['status']:<10} {r['error']}")
+                continue
+            first = r.get("first_feasible_seconds")
+            objective = r.get("objective")
+            bound = r.get("best_bound")
+            gap = r.get("gap_percent")
+            self.stdout.write(
+                f"{r['name']:<16} {r['status']:<10} "
+                f"{objective if objective is not None else '-':>14} {bound if bound is not None else '-':>14} "
+                f"{gap if gap is not None else '-':>8} {first if first is not None else '-':>13} "
+                f"{r.get('solutions', 0):>5} {r.get('wall_seconds') or 0:>8} {r.get('conflicts', 0):>10} "
+                f"{r.get('peak_rss_mb') or '-':>7}"
+            )
+        if options["output"]:
+            self.stdout.write(f"Results written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS("[Done] Replay complete."))
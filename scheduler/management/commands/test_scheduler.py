@@ -2,6 +2,10 @@
 from django.core.management.base import BaseCommand
 from scheduling.models import Semester, Schedule
 from scheduler.solver import solve_schedule_for_semester
+from scheduler.candidates import CANDIDATE_TOP_K
+from scheduler.solution_pool import POOL_SIZE
+from scheduler.progress import solution_event_sender, checkpoint_saver
+from scheduler.callbacks import StopPolicy
 from django.utils import timezone
 
 class Command(BaseCommand):
@@ -16,10 +20,120 @@ class Command(BaseCommand):
             default=3600, 
             help="Time limit in seconds (default 3600)"
         )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=CANDIDATE_TOP_K,
+            help=f"Candidate instructors kept per section (default {CANDIDATE_TOP_K}, 0 = all)"
+        )
+        parser.add_argument(
+            "--two-phase",
+            action="store_true",
+            help="Solve times/instructors first, then assign rooms in a second pass"
+        )
+        parser.add_argument(
+            "--hint-from",
+            default=None,
+            help="Warm-start from a previous run: latest, active, finalized or an archived batch key"
+        )
+        parser.add_argument(
+            "--repair-hint",
+            action="store_true",
+            help="Let the solver repair a warm-start hint that is no longer feasible"
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Keep the current schedule and re-solve only sections that changed"
+        )
+        parser.add_argument(
+            "--sections",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Section IDs to re-solve in incremental mode (in addition to detected changes)"
+        )
+        parser.add_argument(
+            "--batch-id",
+            default=None,
+            help="SchedulerProgress batch to stream solutions and checkpoints to"
+        )
+        parser.add_argument(
+            "--stop-no-improvement",
+            type=int,
+            default=None,
+            help="Stop when no better solution was found for this many seconds"
+        )
+        parser.add_argument(
+            "--stop-gap",
+            type=float,
+            default=None,
+            help="Stop when the relative optimality gap falls below this percentage"
+        )
+        parser.add_argument(
+            "--stop-objective",
+            type=float,
+            default=None,
+            help="Stop once the objective reaches this value"
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="CP-SAT processes: 1 (default) solves in-process, N > 1 runs a multi-seed portfolio, 0 = one per 4 cores"
+        )
+        parser.add_argument(
+            "--symmetry-breaking",
+            action="store_true",
+            help="Order interchangeable sections and rooms (see scheduler/symmetry.py)"
+        )
+        parser.add_argument(
+            "--lexicographic",
+            action="store_true",
+            help="Optimize the objective in stages (coverage, load, preferences) instead of one weighted sum"
+        )
+        parser.add_argument(
+            "--draft",
+            action="store_true",
+            help="Save the construction heuristic's schedule without running CP-SAT (quick draft)"
+        )
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Start CP-SAT from the construction heuristic's schedule when there is no warm-start batch"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Solve even if the input and settings match the last saved run"
+        )
+        parser.add_argument(
+            "--export-model",
+            action="store_true",
+            help="Save the CP-SAT model to SCHEDULER_MODEL_DIR for the replay_model command"
+        )
+        parser.add_argument(
+            "--pool-size",
+            type=int,
+            default=POOL_SIZE,
+            help=f"Distinct candidate schedules to keep (default {POOL_SIZE}, 1 = only the best)"
+        )
 
     def handle(self, *args, **options):
         semester_id = options["semester_id"]
         time_limit = options["time"]
+        top_k = options["top_k"]
+        two_phase = options["two_phase"]
+        hint_from = options["hint_from"]
+        repair_hint = options["repair_hint"]
+        incremental = options["incremental"]
+        changed_sections = options["sections"]
+        batch_id = options["batch_id"]
+        stop_policy = StopPolicy(
+            no_improvement_seconds=options["stop_no_improvement"],
+            gap_percent=options["stop_gap"],
+            objective_target=options["stop_objective"],
+        )
         
         try:
             semester = Semester.objects.get(pk=semester_id)
@@ -30,7 +144,27 @@ class Command(BaseCommand):
         print(f"Running scheduler test for semester: {semester}")
         print(f"Time limit set to: {time_limit} seconds")
 
-        solve_schedule_for_semester(semester, time_limit_seconds=time_limit)
+        solve_schedule_for_semester(
+            semester,
+            time_limit_seconds=time_limit,
+            top_k=top_k,
+            two_phase=two_phase,
+            hint_batch=hint_from,
+            repair_hint=repair_hint,
+            incremental=incremental,
+            changed_sections=changed_sections,
+            on_solution=solution_event_sender(batch_id) if batch_id else None,
+            checkpoint=checkpoint_saver(batch_id) if batch_id else None,
+            stop_policy=stop_policy,
+            processes=options["processes"],
+            symmetry_breaking=options["symmetry_breaking"],
+            pool_size=options["pool_size"],
+            lexicographic=options["lexicographic"],
+            draft=options["draft"],
+            construction_seed=options["seed"],
+            force=options["force"],
+            export_model=options["export_model"],
+        )
 
         schedules = Schedule.objects.filter(semester=semester).order_by("dayOfWeek", "startTime")
         print(f"\n[Output] {schedules.count()} schedules found for {semester}:\n")
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time_limit_minutes', models.IntegerField(default=60)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Scheduler Settings',
+            },
+        ),
+        migrations.AddField(
+            model_name='schedulerprogress',
+            name='checkpoint',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0002_solver_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='stop_gap_percent',
+            field=models.FloatField(blank=True, help_text='Stop when the optimality gap falls below this percentage', null=True),
+        ),
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='stop_no_improvement_seconds',
+            field=models.PositiveIntegerField(blank=True, help_text='Stop when the schedule has not improved for this many seconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='stop_objective_target',
+            field=models.FloatField(blank=True, help_text='Stop once the objective reaches this value', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0003_scheduler_stop_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulerprogress',
+            name='cancel_requested',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='schedulerprogress',
+            name='details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0004_scheduler_progress_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='solver_processes',
+            field=models.PositiveIntegerField(default=1, help_text='CP-SAT processes per run: 1 = single solver, more = multi-seed portfolio, 0 = one per 4 CPU cores'),
+        ),
+    ]
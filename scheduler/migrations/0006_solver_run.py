@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0005_scheduler_solver_processes'),
+        ('scheduling', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolverRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.UUIDField(blank=True, null=True)),
+                ('input_hash', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('mode', models.CharField(blank=True, max_length=20)),
+                ('status', models.CharField(default='RUNNING', max_length=20)),
+                ('sections', models.PositiveIntegerField(default=0)),
+                ('tasks', models.PositiveIntegerField(default=0)),
+                ('instructors', models.PositiveIntegerField(default=0)),
+                ('rooms', models.PositiveIntegerField(default=0)),
+                ('variables', models.PositiveIntegerField(default=0)),
+                ('constraints', models.PositiveIntegerField(default=0)),
+                ('extract_seconds', models.FloatField(blank=True, null=True)),
+                ('build_seconds', models.FloatField(blank=True, null=True)),
+                ('solve_seconds', models.FloatField(blank=True, null=True)),
+                ('persist_seconds', models.FloatField(blank=True, null=True)),
+                ('first_feasible_seconds', models.FloatField(blank=True, null=True)),
+                ('objective', models.FloatField(blank=True, null=True)),
+                ('best_bound', models.FloatField(blank=True, null=True)),
+                ('gap_percent', models.FloatField(blank=True, null=True)),
+                ('solutions', models.PositiveIntegerField(default=0)),
+                ('stopped_by', models.CharField(blank=True, max_length=100)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='solver_runs', to='scheduling.semester')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0006_solver_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='symmetry_breaking',
+            field=models.BooleanField(default=False, help_text='Order interchangeable sections and rooms so the solver skips equivalent schedules'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0007_scheduler_symmetry_breaking'),
+        ('scheduling', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='solution_pool_size',
+            field=models.PositiveIntegerField(default=3, help_text='Distinct schedules kept per run as candidates (1 = only the best)'),
+        ),
+        migrations.CreateModel(
+            name='ScheduleCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('objective', models.FloatField()),
+                ('distance', models.PositiveIntegerField(blank=True, null=True)),
+                ('tba', models.PositiveIntegerField(default=0)),
+                ('breakdown', models.JSONField(blank=True, default=dict)),
+                ('entries', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_candidates', to='scheduling.semester')),
+                ('solver_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidates', to='scheduler.solverrun')),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0008_schedule_candidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='lexicographic_objective',
+            field=models.BooleanField(default=False, help_text='Optimize room coverage first, then teaching load, then preferences, instead of one weighted score'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0009_lexicographic_objective'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='construction_seed',
+            field=models.BooleanField(default=True, help_text="Start a semester's first solve from the quick construction heuristic instead of an empty schedule"),
+        ),
+    ]
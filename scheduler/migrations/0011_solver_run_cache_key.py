@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0010_construction_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solverrun',
+            name='cache_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
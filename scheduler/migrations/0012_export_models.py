@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0011_solver_run_cache_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulersettings',
+            name='export_models',
+            field=models.BooleanField(default=False, help_text="Save each run's CP-SAT model (compressed) for offline parameter tuning with the replay_model command"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0012_export_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solverrun',
+            name='schedule_batch',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# scheduler/model_export.py
+import gzip
+import os
+import time
+
+from google.protobuf import text_format
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+# CP-SAT models of solver runs on disk (SolveParams.export_model_path), for
+# offline replay with other parameters (model_replay.py).
+
+MODEL_FILE_SUFFIX = ".pb.gz"
+
+
+def model_file_name(run_id=None, input_hash=""):
+    """run-<id>-<input hash prefix>.pb.gz (a timestamp instead of the id for unrecorded runs)."""
+    stamp = f"run-{run_id}" if run_id is not None else time.strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}-{input_hash[:12]}{MODEL_FILE_SUFFIX}"
+
+
+def save_model(model, path):
+    """Writes the model's CpModelProto to `path`, gzip-compressed if it ends in .gz. Returns the size in bytes."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = model.Proto().SerializeToString()
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wb") as f:
+        f.write(payload)
+    return os.path.getsize(path)
+
+
+def load_model(path):
+    """A CpModel from a .pb / .pb.gz export or a text dump (.pbtxt, e.g. debug_model.pbtxt)."""
+    proto = cp_model_pb2.CpModelProto()
+    if path.endswith((".pbtxt", ".txt")):
+        with open(path) as f:
+            text_format.Parse(f.read(), proto)
+    else:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            proto.ParseFromString(f.read())
+    model = cp_model.CpModel()
+    model.Proto().CopyFrom(proto)
+    return model
@@ -0,0 +1,84 @@
+# scheduler/model_profile.py
+import time
+from collections import defaultdict
+
+# Tags every variable and constraint of a CP-SAT model with the family of the
+# code that built it. The engine calls enter(family) before each part of the
+# build; everything added to the model until the next enter() belongs to that
+# family. Families are kept as index spans of the proto, so tagging costs two
+# length lookups per switch, and build time is charged to the family it was
+# spent in.
+
+
+class ModelProfile:
+    def __init__(self, model):
+        self.model = model
+        self.spans = []      # [family, var_lo, var_hi, ct_lo, ct_hi]
+        self.seconds = defaultdict(float)   # insertion order = build order
+        self._current = None
+        self._started = None
+
+    def _sizes(self):
+        proto = self.model.Proto()
+        return len(proto.variables), len(proto.constraints)
+
+    def enter(self, family):
+        """Closes the running family and charges what follows to `family`."""
+        if family == self._current:
+            return
+        self.close()
+        self.seconds[family] += 0.0
+        n_vars, n_cons = self._sizes()
+        self.spans.append([family, n_vars, n_vars, n_cons, n_cons])
+        self._current = family
+        self._started = time.perf_counter()
+
+    def close(self):
+        if self._current is None:
+            return
+        span = self.spans[-1]
+        span[2], span[4] = self._sizes()
+        if span[2] == span[1] and span[4] == span[3]:
+            self.spans.pop()
+        self.seconds[self._current] += time.perf_counter() - self._started
+        self._current = None
+
+    def summary(self):
+        """
+        {family: {variables, constraints, constraints_by_type, seconds}} in build
+        order; variables or constraints added outside any family land in "untagged".
+        """
+        self.close()
+        proto = self.model.Proto()
+        rows = {}
+
+        def row(family):
+            return rows.setdefault(family, {
+                "variables": 0, "constraints": 0, "constraints_by_type": defaultdict(int), "seconds": 0.0,
+            })
+
+        for family in self.seconds:
+            row(family)
+        tagged_vars = tagged_cons = 0
+        for family, v_lo, v_hi, c_lo, c_hi in self.spans:
+            r = row(family)
+            r["variables"] += v_hi - v_lo
+            r["constraints"] += c_hi - c_lo
+            tagged_vars += v_hi - v_lo
+            tagged_cons += c_hi - c_lo
+            for i in range(c_lo, c_hi):
+                r["constraints_by_type"][proto.constraints[i].WhichOneof("constraint")] += 1
+
+        untagged_vars = len(proto.variables) - tagged_vars
+        untagged_cons = len(proto.constraints) - tagged_cons
+        if untagged_vars or untagged_cons:
+            r = row("untagged")
+            r["variables"] += untagged_vars
+            r["constraints"] += untagged_cons
+
+        for family, seconds in self.seconds.items():
+            row(family)["seconds"] = seconds
+        for r in rows.values():
+            r["seconds"] = round(r["seconds"], 4)
+            r["constraints_by_type"] = dict(sorted(r["constraints_by_type"].items()))
+        return rows
@@ -0,0 +1,117 @@
+# scheduler/model_replay.py
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from scheduler.benchmark import peak_rss_mb
+from scheduler.callbacks import relative_gap_percent
+from scheduler.engine import apply_solver_params
+from scheduler.instance import SolveParams
+from scheduler.model_export import load_model
+from scheduler.portfolio import PORTFOLIO_PRESETS
+
+# Saved CP-SAT models (SolveParams.export_model_path) solved again offline
+# under other CpSolver parameters, to tune them on real semesters without the
+# database. Each parameter set runs in its own process.
+
+# Named parameter sets for replay: the portfolio presets plus worker counts
+# and presolve variants. Every set starts from the engine's own defaults.
+REPLAY_PARAM_SETS = {
+    **{p["name"]: {k: v for k, v in p.items() if k != "name"} for p in PORTFOLIO_PRESETS},
+    "workers_1": {"num_search_workers": 1},
+    "workers_8": {"num_search_workers": 8},
+    "no_presolve": {"cp_model_presolve": False},
+    "long_presolve": {"max_presolve_iterations": 10, "cp_model_probing_level": 3},
+}
+DEFAULT_REPLAY_SETS = ("default", "no_lp", "max_lp", "quick_restart")
+
+
+# ----------------- Replay -----------------
+class _FirstSolution(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.started = time.monotonic()
+        self.first_seconds = None
+        self.solutions = 0
+
+    def on_solution_callback(self):
+        self.solutions += 1
+        if self.first_seconds is None:
+            self.first_seconds = round(time.monotonic() - self.started, 3)
+
+
+def parse_param_set(text):
+    """
+    Command-line parameter set "name=key:value,key:value" as (name, overrides).
+    Values become int, float or bool where they parse; enum names stay strings.
+    """
+    name, _, body = text.rpartition("=")
+    overrides = {}
+    for item in filter(None, body.split(",")):
+        key, _, raw = item.partition(":")
+        value = raw.strip()
+        if value.lower() in ("true", "false"):
+            value = value.lower() == "true"
+        else:
+            for cast in (int, float):
+                try:
+                    value = cast(value)
+                    break
+                except ValueError:
+                    pass
+        overrides[key.strip()] = value
+    return name or body, overrides
+
+
+def _replay_one(path, name, overrides, time_limit_seconds):
+    # Runs in a fresh process so peak RSS belongs to this parameter set alone
+    model = load_model(path)
+    defaults = SolveParams()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = defaults.num_workers
+    solver.parameters.random_seed = defaults.random_seed
+    solver.parameters.max_time_in_seconds = time_limit_seconds
+    try:
+        apply_solver_params(solver.parameters, overrides)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"name": name, "params": overrides, "status": "BAD_PARAMS", "error": str(e)}
+
+    recorder = _FirstSolution()
+    started = time.time()
+    status = solver.Solve(model, recorder)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    objective = solver.ObjectiveValue() if found else None
+    bound = solver.BestObjectiveBound() if found else None
+    return {
+        "name": name,
+        "params": overrides,
+        "status": solver.StatusName(status),
+        "objective": objective,
+        "best_bound": bound,
+        "gap_percent": round(relative_gap_percent({"objective": objective, "best_bound": bound}), 4) if found else None,
+        "first_feasible_seconds": recorder.first_seconds,
+        "solutions": recorder.solutions,
+        "wall_seconds": round(time.time() - started, 3),
+        "conflicts": solver.NumConflicts(),
+        "branches": solver.NumBranches(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def replay_model(path, param_sets, time_limit_seconds=60, processes=None):
+    """
+    Solves the saved model at `path` once per parameter set ({name: overrides})
+    and returns one result per set, in the given order: status, objective,
+    bound, gap, time to first solution, search counters and peak RSS.
+    processes: how many sets run at once (default: all of them).
+    """
+    load_model(path)  # fail here, not in every worker
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes or len(param_sets), mp_context=ctx) as pool:
+        futures = [
+            pool.submit(_replay_one, path, name, overrides, time_limit_seconds)
+            for name, overrides in param_sets.items()
+        ]
+        return [f.result() for f in futures]
@@ -9,6 +9,9 @@ class SchedulerProgress(models.Model):
     progress = models.IntegerField(default=0)
     process_pid = models.IntegerField(null=True, blank=True)
     logs = models.JSONField(default=list, blank=True)  
+    checkpoint = models.JSONField(null=True, blank=True)  # best-so-far assignment of a running solve
+    details = models.JSONField(default=dict, blank=True)  # phase, model stats, incumbent objective and bound
+    cancel_requested = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,6 +23,19 @@ class SchedulerProgress(models.Model):
 
 class SchedulerSettings(models.Model):
     time_limit_minutes = models.IntegerField(default=60)
+
+    # Early termination (empty = off), see scheduler/callbacks.StopPolicy
+    stop_no_improvement_seconds = models.PositiveIntegerField(null=True, blank=True, help_text="Stop when the schedule has not improved for this many seconds")
+    stop_gap_percent = models.FloatField(null=True, blank=True, help_text="Stop when the optimality gap falls below this percentage")
+    stop_objective_target = models.FloatField(null=True, blank=True, help_text="Stop once the objective reaches this value")
+
+    # Parallel solving, see scheduler/portfolio.py
+    solver_processes = models.PositiveIntegerField(default=1, help_text="CP-SAT processes per run: 1 = single solver, more = multi-seed portfolio, 0 = one per 4 CPU cores")
+    symmetry_breaking = models.BooleanField(default=False, help_text="Order interchangeable sections and rooms so the solver skips equivalent schedules")
+    solution_pool_size = models.PositiveIntegerField(default=3, help_text="Distinct schedules kept per run as candidates (1 = only the best)")
+    lexicographic_objective = models.BooleanField(default=False, help_text="Optimize room coverage first, then teaching load, then preferences, instead of one weighted score")
+    export_models = models.BooleanField(default=False, help_text="Save each run's CP-SAT model (compressed) for offline parameter tuning with the replay_model command")
+    construction_seed = models.BooleanField(default=True, help_text="Start a semester's first solve from the quick construction heuristic instead of an empty schedule")
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -27,3 +43,98 @@ class SchedulerSettings(models.Model):
 
     class Meta:
         verbose_name_plural = "Scheduler Settings"
+
+
+class SolverRun(models.Model):
+    """One solver execution: input size, model size, phase timings and outcome."""
+    semester = models.ForeignKey('scheduling.Semester', on_delete=models.SET_NULL, null=True, blank=True, related_name='solver_runs')
+    batch_id = models.UUIDField(null=True, blank=True)  # SchedulerProgress batch, if started from the dashboard
+    input_hash = models.CharField(max_length=64, blank=True, db_index=True)  # ProblemInstance.input_hash()
+    cache_key = models.CharField(max_length=64, blank=True, db_index=True)   # input plus settings, see result_cache.py
+    schedule_batch = models.DateTimeField(null=True, blank=True)  # newest createdAt of the rows it left, see result_cache.py
+    mode = models.CharField(max_length=20, blank=True)
+    status = models.CharField(max_length=20, default="RUNNING")
+
+    # Counts
+    sections = models.PositiveIntegerField(default=0)
+    tasks = models.PositiveIntegerField(default=0)
+    instructors = models.PositiveIntegerField(default=0)
+    rooms = models.PositiveIntegerField(default=0)
+    variables = models.PositiveIntegerField(default=0)
+    constraints = models.PositiveIntegerField(default=0)
+
+    # Phase timings (seconds)
+    extract_seconds = models.FloatField(null=True, blank=True)
+    build_seconds = models.FloatField(null=True, blank=True)
+    solve_seconds = models.FloatField(null=True, blank=True)
+    persist_seconds = models.FloatField(null=True, blank=True)
+    first_feasible_seconds = models.FloatField(null=True, blank=True)
+
+    # Outcome
+    objective = models.FloatField(null=True, blank=True)
+    best_bound = models.FloatField(null=True, blank=True)
+    gap_percent = models.FloatField(null=True, blank=True)
+    solutions = models.PositiveIntegerField(default=0)
+    stopped_by = models.CharField(max_length=100, blank=True)
+
+    params = models.JSONField(default=dict, blank=True)   # SolveParams and run options
+    details = models.JSONField(default=dict, blank=True)  # objective curve, model stats, portfolio workers, errors
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Solver run {self.pk} ({self.status}, {self.started_at:%Y-%m-%d %H:%M})"
+
+    @property
+    def total_seconds(self):
+        return sum(t or 0 for t in (self.extract_seconds, self.build_seconds, self.solve_seconds, self.persist_seconds))
+
+    @property
+    def family_rows(self):
+        """Model build profile (engine report["families"]) as rows with their share of the model."""
+        families = (self.details or {}).get("families") or {}
+        total = sum(f["constraints"] for f in families.values()) or 1
+        return [
+            {"family": name, **row, "share": round(100.0 * row["constraints"] / total, 1)}
+            for name, row in families.items()
+        ]
+
+    @property
+    def objective_rows(self):
+        """Objective contribution per term family, largest absolute value first."""
+        breakdown = (self.details or {}).get("objective_breakdown") or {}
+        terms = (self.details or {}).get("objective_terms") or {}
+        return [
+            {"family": name, "value": value, "terms": terms.get(name, 0)}
+            for name, value in sorted(breakdown.items(), key=lambda kv: -abs(kv[1]))
+        ]
+
+
+class ScheduleCandidate(models.Model):
+    """
+    One of the best distinct schedules a run found (see solution_pool.py).
+    Rank 1 is the schedule saved as the active draft; the others can be
+    previewed and applied from scheduleOutput without solving again.
+    """
+    solver_run = models.ForeignKey(SolverRun, on_delete=models.SET_NULL, null=True, blank=True, related_name='candidates')
+    semester = models.ForeignKey('scheduling.Semester', on_delete=models.CASCADE, related_name='schedule_candidates')
+    rank = models.PositiveIntegerField()
+    objective = models.FloatField()
+    distance = models.PositiveIntegerField(null=True, blank=True)  # tasks that differ from the closest better candidate
+    tba = models.PositiveIntegerField(default=0)
+    breakdown = models.JSONField(default=dict, blank=True)  # objective by term family (engine.OBJECTIVE_FAMILIES)
+    entries = models.JSONField(default=list, blank=True)    # solver entries, see build_schedule_objects
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return f"Candidate #{self.rank} ({self.objective:,.0f})"
+
+    @property
+    def batch_key(self):
+        return f"candidate-{self.pk}"
@@ -0,0 +1,173 @@
+# scheduler/pins.py
+from collections import defaultdict
+
+from scheduler.availability import instructor_windows, fits
+from scheduler.engine import build_tasks, start_properties
+
+# Pinned parts of hand-edited Schedule rows (Schedule.pinTime / pinRoom /
+# pinInstructor, see warm_start.build_schedule_pins). The engine and the
+# construction heuristic take them as constants; resolve_pins first drops the
+# parts that contradict a hard rule of the model, on their own or together
+# with the pins kept before them.
+
+
+def _clash(span, taken):
+    """The (start, end, label) in taken that overlaps span, or None."""
+    start, end = span
+    return next((t for t in taken if t[0] < end and start < t[1]), None)
+
+
+def _drop_overloads(instance, tasks, resolved, section_instr, dropped):
+    """
+    Drops a section's instructor pins when its minutes would take the pinned
+    instructor past their normal + overload limit (or the pinned times past
+    the normal or the overload limit alone). Sections go in instance order.
+    """
+    by_section = defaultdict(list)
+    for t in tasks:
+        by_section[t["section"]].append(t)
+
+    used = defaultdict(lambda: [0, 0, 0])   # instructor -> [normal, overtime, total] minutes
+    for sec_id in instance.sections:
+        i_idx = section_instr.get(sec_id)
+        if i_idx is None:
+            continue
+        normal = overtime = total = 0
+        for t in by_section[sec_id]:
+            dur = int(t["dur"])
+            total += dur
+            start = resolved.get(t["task_id"], {}).get("start")
+            if start is not None:
+                if start_properties(start, dur)[3]:
+                    overtime += dur
+                else:
+                    normal += dur
+        n_lim = instance.instructor_normal_min[i_idx]
+        o_lim = instance.instructor_overload_min[i_idx]
+        load = used[i_idx]
+        if load[0] + normal > n_lim or load[1] + overtime > o_lim or load[2] + total > n_lim + o_lim:
+            del section_instr[sec_id]
+            for t in by_section[sec_id]:
+                if "instr" in resolved.get(t["task_id"], {}):
+                    del resolved[t["task_id"]]["instr"]
+                    dropped.append({"task_id": t["task_id"], "part": "instructor",
+                                    "reason": "over the instructor's normal + overload limit"})
+        else:
+            load[0] += normal
+            load[1] += overtime
+            load[2] += total
+
+
+def _drop_clashes(instance, tasks, resolved, section_instr, dropped):
+    """
+    Drops pinned times that overlap a GenEd block of their block group, a
+    class kept earlier in the same block group or with the same instructor,
+    or the other half of their lecture (the halves are kept durA + 30 apart).
+    A pinned room taken at that time by a class kept earlier is dropped too.
+    Tasks go in build_tasks order.
+    """
+    tba = instance.tba_room_idx
+    section_group = dict(zip(instance.sections, instance.section_group))
+    taken = defaultdict(list)   # ("gened" | "group" | "instr" | "room", key) -> [(start, end, label)]
+    for g_day, g_start, g_end, g_group in instance.gened_blocks:
+        if g_end > g_start:
+            taken[("gened", g_group)].append((g_day * 1440 + g_start, g_day * 1440 + g_end, "a GenEd block"))
+    first_half = {}
+
+    for t in tasks:
+        pin = resolved.get(t["task_id"])
+        if not pin or "start" not in pin:
+            continue
+        dur = int(t["dur"])
+        span = (pin["start"], pin["start"] + dur)
+        group = section_group.get(t["section"])
+        i_idx = section_instr.get(t["section"])
+
+        reason = None
+        if group is not None:
+            hit = _clash(span, taken[("gened", group)]) or _clash(span, taken[("group", group)])
+            if hit:
+                reason = f"overlaps {hit[2]} in block group {group}"
+        if reason is None and i_idx is not None:
+            hit = _clash(span, taken[("instr", i_idx)])
+            if hit:
+                reason = f"overlaps {hit[2]}, same instructor"
+        if reason is None and t["task_id"].endswith("_LECT_B") and t["section"] in first_half:
+            a_start, a_dur, a_id = first_half[t["section"]]
+            if abs(pin["start"] - a_start) < a_dur + 30:
+                reason = f"less than {a_dur + 30} min from {a_id}"
+        if reason:
+            del pin["start"]
+            dropped.append({"task_id": t["task_id"], "part": "time", "reason": reason})
+            continue
+
+        room = pin.get("room", tba)
+        if room != tba:
+            hit = _clash(span, taken[("room", room)])
+            if hit:
+                del pin["room"]
+                dropped.append({"task_id": t["task_id"], "part": "room", "reason": f"room taken by {hit[2]}"})
+            else:
+                taken[("room", room)].append((*span, t["task_id"]))
+        if group is not None:
+            taken[("group", group)].append((*span, t["task_id"]))
+        if i_idx is not None:
+            taken[("instr", i_idx)].append((*span, t["task_id"]))
+        if t["task_id"].endswith("_LECT_A"):
+            first_half[t["section"]] = (pin["start"], dur, t["task_id"])
+
+
+def resolve_pins(instance, pins):
+    """
+    The pins ({task_id: {"start"?, "room"?, "instr"?}}) the model can honour,
+    without:
+      - pins of classes the instance no longer has (section gone or re-split),
+      - a real room pinned at a weekend time (weekend classes are always TBA),
+      - instructor pins that differ within a section (its classes share one),
+      - a time pinned outside the section's pinned instructor's availability,
+      - instructor pins past the instructor's normal + overload limit,
+      - a time overlapping a GenEd block of the block group, or a pinned
+        class of the same block group or instructor,
+      - a room pinned for a time another pinned class holds it.
+    Between two contradicting pins the one of the earlier section (instance
+    order) is kept.
+
+    Returns (pins, dropped) with dropped as [{"task_id", "part", "reason"}].
+    """
+    task_list = build_tasks(instance)
+    tasks = {t["task_id"]: t for t in task_list}
+    windows = instructor_windows(instance)
+    tba = instance.tba_room_idx
+    dropped = []
+
+    resolved = {}
+    for task_id, pin in pins.items():
+        if task_id in tasks:
+            resolved[task_id] = dict(pin)
+        else:
+            dropped.append({"task_id": task_id, "part": "all", "reason": "class no longer exists"})
+
+    pinned_instr = defaultdict(set)
+    for task_id, pin in resolved.items():
+        if "instr" in pin:
+            pinned_instr[tasks[task_id]["section"]].add(pin["instr"])
+    section_instr = {sec: instrs.pop() for sec, instrs in pinned_instr.items() if len(instrs) == 1}
+
+    for task_id, pin in resolved.items():
+        t = tasks[task_id]
+        if "start" in pin and pin.get("room", tba) != tba and pin["start"] // 1440 >= 5:
+            del pin["room"]
+            dropped.append({"task_id": task_id, "part": "room", "reason": "weekend classes have no room"})
+        if "instr" in pin and t["section"] not in section_instr:
+            del pin["instr"]
+            dropped.append({"task_id": task_id, "part": "instructor", "reason": "section pinned to several instructors"})
+        if "start" in pin and t["section"] in section_instr:
+            w = windows[section_instr[t["section"]]]
+            if w is not None and not fits(w, pin["start"], int(t["dur"])):
+                del pin["start"]
+                dropped.append({"task_id": task_id, "part": "time", "reason": "outside the instructor's availability"})
+
+    _drop_overloads(instance, task_list, resolved, section_instr, dropped)
+    _drop_clashes(instance, task_list, resolved, section_instr, dropped)
+
+    return {task_id: pin for task_id, pin in resolved.items() if pin}, dropped
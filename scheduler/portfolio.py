@@ -0,0 +1,266 @@
+# scheduler/portfolio.py
+import math
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import replace
+
+from scheduler.callbacks import CANCEL_POLL_SECONDS
+from scheduler.engine import solve
+from scheduler.instance import Solution
+from scheduler.solution_pool import SolutionPool, entries_assignment, min_distance_for
+
+# -------------------- Configuration --------------------
+PORTFOLIO_THREADS_PER_PROCESS = 4   # CP-SAT threads inside each process
+PORTFOLIO_SYNC_SECONDS = 120        # workers are re-hinted with the best schedule this often
+
+# Parameter presets, cycled over the processes (each also gets its own seed)
+PORTFOLIO_PRESETS = (
+    {"name": "default"},
+    {"name": "no_lp", "linearization_level": 0},
+    {"name": "max_lp", "linearization_level": 2},
+    {"name": "quick_restart", "search_branching": "PORTFOLIO_WITH_QUICK_RESTART_SEARCH"},
+    {"name": "pseudo_cost", "search_branching": "PSEUDO_COST_SEARCH"},
+    {"name": "core", "optimize_with_core": True},
+    {"name": "randomized", "randomize_search": True},
+    {"name": "fixed_search", "search_branching": "FIXED_SEARCH"},
+)
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_process_count(threads_per_process=PORTFOLIO_THREADS_PER_PROCESS):
+    return max(1, available_cores() // threads_per_process)
+
+
+def solution_hints(instance, entries):
+    """Solver entries back in the hint layout of warm_start.build_schedule_hints."""
+    instructor_index = {i_id: idx for idx, i_id in enumerate(instance.instructors)}
+    room_index = {room_id: idx for idx, room_id in enumerate(instance.rooms[:-1])}
+    return {
+        e["task_id"]: {
+            "start": e["start"],
+            "instr": instructor_index.get(e["instructor"]),
+            "room": instance.tba_room_idx if e["room"] is None else room_index.get(e["room"], instance.tba_room_idx),
+        }
+        for e in entries
+    }
+
+
+# ----------------- Worker process -----------------
+_events = None
+_stop = None
+
+
+def _init_worker(events, stop):
+    global _events, _stop
+    _events, _stop = events, stop
+
+
+def _run_worker(worker_id, instance, params):
+    def on_solution(event):
+        _events.put({"worker": worker_id, **event})
+
+    solution = solve(instance, params, on_solution=on_solution, should_stop=_stop.is_set)
+    if solution.status in ("OPTIMAL", "INFEASIBLE", "MODEL_INVALID"):
+        # Proven: nobody else needs to keep searching
+        _stop.set()
+    return worker_id, solution
+
+
+# ----------------- Portfolio -----------------
+def solve_portfolio(instance, params, processes=None, threads_per_process=PORTFOLIO_THREADS_PER_PROCESS,
+                    presets=PORTFOLIO_PRESETS, sync_seconds=PORTFOLIO_SYNC_SECONDS,
+                    on_solution=None, checkpoint=None, stop_policy=None, on_phase=None, should_stop=None):
+    """
+    Runs `processes` independent CP-SAT solves of the same instance, each with its
+    own seed and parameter preset, and returns the best Solution.
+
+    The time limit is split into rounds of sync_seconds. Improving solutions are
+    streamed from every process through a queue as they are found; at the end of
+    a round the best schedule so far is given to every process as a hint for the
+    next round. A proven optimum, the stop policy or should_stop() end all
+    processes at once.
+
+    processes=None uses one process per threads_per_process available cores.
+    The callbacks behave as in engine.solve; on_solution events carry the
+    worker number. report["portfolio"] holds each worker's contribution.
+    """
+    processes = processes or default_process_count(threads_per_process)
+    rounds = max(1, math.ceil(params.time_limit_seconds / sync_seconds))
+    round_seconds = params.time_limit_seconds / rounds
+
+    workers = []
+    for worker_id in range(processes):
+        preset = dict(presets[worker_id % len(presets)])
+        name = preset.pop("name")
+        workers.append({
+            "worker": worker_id,
+            "preset": name,
+            "seed": params.random_seed + worker_id,
+            "solver_params": {**params.solver_params, **preset},
+            "solutions": 0,
+            "improvements": 0,
+            "rounds_won": 0,
+            "best_objective": None,
+        })
+
+    print(f"[Solver] Portfolio: {processes} processes x {threads_per_process} threads, "
+          f"{rounds} round(s) of {round_seconds:.0f}s")
+
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    stop = ctx.Event()
+
+    started = time.monotonic()
+    history = []
+    best = None
+    best_objective = None
+    last_improvement = None
+    stopped_by = None
+    incumbent = dict(params.incumbent or {})
+    last_cancel_poll = 0.0
+    first_report = None
+    pool = None
+
+    def handle_event(event):
+        nonlocal best_objective, last_improvement, stopped_by
+        w = workers[event["worker"]]
+        w["solutions"] += 1
+        if w["best_objective"] is None or event["objective"] > w["best_objective"]:
+            w["best_objective"] = event["objective"]
+        if best_objective is not None and event["objective"] <= best_objective:
+            return
+        best_objective = event["objective"]
+        last_improvement = time.monotonic()
+        w["improvements"] += 1
+        event = {**event, "solution": len(history) + 1, "wall_time": round(last_improvement - started, 3)}
+        history.append(event)
+        if on_solution:
+            on_solution(event)
+        if stop_policy and stopped_by is None:
+            reason = stop_policy.check_solution(event)
+            if reason:
+                stopped_by = reason
+                stop.set()
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=ctx,
+                             initializer=_init_worker, initargs=(events, stop)) as executor:
+        for round_no in range(rounds):
+            remaining = params.time_limit_seconds - (time.monotonic() - started)
+            if remaining <= 1 or stop.is_set():
+                break
+            futures = [
+                executor.submit(_run_worker, w["worker"], instance, replace(
+                    params,
+                    time_limit_seconds=min(round_seconds, remaining),
+                    num_workers=threads_per_process,
+                    random_seed=w["seed"] + round_no * processes,
+                    solver_params=w["solver_params"],
+                    incumbent=incumbent,
+                    log_search_progress=params.log_search_progress and w["worker"] == 0,
+                    # every worker builds the same model; one copy on disk is enough
+                    export_model_path=params.export_model_path if w["worker"] == 0 and round_no == 0 else "",
+                ))
+                for w in workers
+            ]
+            if round_no == 0 and on_phase:
+                on_phase("solve", {"time_limit_seconds": params.time_limit_seconds, "processes": processes})
+
+            pending = set(futures)
+            while pending:
+                try:
+                    handle_event(events.get(timeout=0.5))
+                except queue.Empty:
+                    pass
+                now = time.monotonic()
+                if should_stop and stopped_by is None and now - last_cancel_poll >= CANCEL_POLL_SECONDS:
+                    last_cancel_poll = now
+                    if should_stop():
+                        stopped_by = "cancelled"
+                        stop.set()
+                limit = stop_policy.no_improvement_seconds if stop_policy else None
+                if limit and stopped_by is None and last_improvement and now - last_improvement >= limit:
+                    stopped_by = f"no_improvement ({limit}s)"
+                    stop.set()
+                _done, pending = wait(pending, timeout=0)
+
+            while True:
+                try:
+                    handle_event(events.get_nowait())
+                except queue.Empty:
+                    break
+
+            round_best = None
+            for future in futures:
+                worker_id, solution = future.result()
+                first_report = first_report or solution.report
+                if solution.candidates:
+                    # Every worker's distinct schedules compete for the run's pool
+                    pool = pool or SolutionPool(params.pool_size, min_distance_for(
+                        solution.report.get("tasks", 0), params.pool_min_distance))
+                    for c in solution.candidates:
+                        pool.offer(c["objective"], entries_assignment(c["entries"]), **{
+                            k: c[k] for k in ("breakdown", "tba", "entries")
+                        })
+                if solution.feasible and (round_best is None or solution.objective > round_best[1].objective):
+                    round_best = (worker_id, solution)
+                if solution.status in ("INFEASIBLE", "MODEL_INVALID") and best is None:
+                    best = solution
+            if round_best:
+                workers[round_best[0]]["rounds_won"] += 1
+                if best is None or not best.feasible or round_best[1].objective > best.objective:
+                    best = round_best[1]
+                    incumbent = {**incumbent, **solution_hints(instance, best.entries)}
+                    if checkpoint:
+                        checkpoint({
+                            "incremental": params.incremental,
+                            "resolved_sections": best.resolved_sections,
+                            "event": history[-1] if history else None,
+                            "entries": best.entries,
+                        })
+            print(f"[Solver] Portfolio round {round_no + 1}/{rounds}: best objective "
+                  f"{best.objective if best and best.feasible else '-'}")
+            if best is not None and best.status in ("OPTIMAL", "INFEASIBLE", "MODEL_INVALID"):
+                break
+            if stopped_by:
+                break
+
+    events.close()
+    if best is None:
+        best = Solution(status="UNKNOWN", report=dict(first_report or {}))
+
+    report = dict(best.report)
+    report.update({
+        "model_file": (first_report or {}).get("model_file"),
+        "solve_seconds": round(time.monotonic() - started, 3),
+        "first_feasible_seconds": history[0]["wall_time"] if history else None,
+        "solutions": len(history),
+        "history": history,
+        "stopped_by": stopped_by or ("time_limit" if best.status == "FEASIBLE" else None),
+        "portfolio": {
+            "processes": processes,
+            "threads_per_process": threads_per_process,
+            "rounds": rounds,
+            "workers": [{k: v for k, v in w.items() if k != "solver_params"} for w in workers],
+        },
+    })
+    if pool is not None and best.feasible:
+        best.candidates = [
+            {k: m[k] for k in ("rank", "objective", "distance", "breakdown", "tba", "entries")}
+            for m in pool.ranked()
+        ]
+        report["pool"] = {
+            "size": pool.size,
+            "min_distance": pool.min_distance,
+            "objectives": [c["objective"] for c in best.candidates],
+        }
+    best.report = report
+    return best
@@ -0,0 +1,335 @@
+# scheduler/precheck.py
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from scheduler.availability import available_domains
+from scheduler.candidates import CANDIDATE_TOP_K, build_instructor_candidates
+from scheduler.engine import SLOT_META, INTERVAL_MINUTES, DAYS, allowed_slots_for, build_tasks
+from scheduler.pins import resolve_pins
+
+# Necessary conditions the CP-SAT model can never get around, checked in a few
+# milliseconds on a ProblemInstance before any model is built. Every "error"
+# means the solve is hopeless (or silently drops classes); "warning" means it
+# will run but some classes are bound to end up in TBA rooms or overtime.
+
+PRECHECK_ERROR = "error"
+PRECHECK_WARNING = "warning"
+
+WEEKDAYS = range(5)
+NORMAL_TIME_END = 17 * 60   # weekday classes after 17:00 count as overload time
+
+
+@dataclass
+class Finding:
+    check: str
+    severity: str
+    message: str
+    details: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        return {"check": self.check, "severity": self.severity, "message": self.message, "details": self.details}
+
+
+@dataclass
+class PrecheckVerdict:
+    """
+    Outcome of analyze_instance. ok is False as soon as one finding is an
+    error; stats holds the supply/demand figures behind the checks.
+    """
+    findings: list = field(default_factory=list)
+    stats: dict = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def errors(self):
+        return [f for f in self.findings if f.severity == PRECHECK_ERROR]
+
+    @property
+    def warnings(self):
+        return [f for f in self.findings if f.severity == PRECHECK_WARNING]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        if self.ok and not self.warnings:
+            return "Pre-check passed."
+        if self.ok:
+            return f"Pre-check passed with {len(self.warnings)} warning(s)."
+        return f"Pre-check failed: {len(self.errors)} blocking problem(s), {len(self.warnings)} warning(s)."
+
+    def to_dict(self):
+        return {
+            "ok": self.ok,
+            "summary": self.summary(),
+            "seconds": self.seconds,
+            "findings": [f.to_dict() for f in self.findings],
+            "stats": self.stats,
+        }
+
+
+# ----------------- Helpers -----------------
+def _slot_windows(days):
+    """Teaching minutes per day as merged (start, end) windows of the slot grid."""
+    windows = defaultdict(list)
+    for _label, day, minute_of_day, _week_min in SLOT_META:
+        if day not in days:
+            continue
+        day_windows = windows[day]
+        if day_windows and day_windows[-1][1] == minute_of_day:
+            day_windows[-1] = (day_windows[-1][0], minute_of_day + INTERVAL_MINUTES)
+        else:
+            day_windows.append((minute_of_day, minute_of_day + INTERVAL_MINUTES))
+    return windows
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(intervals, windows):
+    return sum(max(0, min(e, we) - max(s, ws)) for s, e in intervals for ws, we in windows)
+
+
+def _hours(minutes):
+    return round(minutes / 60.0, 1)
+
+
+def _employment_types(instance):
+    if instance.instructor_employment:
+        return [e or "unknown" for e in instance.instructor_employment]
+    return ["permanent" if p else "non-permanent" for p in instance.instructor_permanent]
+
+
+# ----------------- Checks -----------------
+def _check_durations(instance, tasks, findings):
+    unfit = [t for t in tasks if not allowed_slots_for(int(t["dur"]))]
+    if unfit:
+        findings.append(Finding(
+            "durations", PRECHECK_ERROR,
+            f"{len(unfit)} class meeting(s) fit NO time slot (longest {max(t['dur'] for t in unfit)} min); "
+            f"the solver would skip them.",
+            {"tasks": [{"task_id": t["task_id"], "section": t["section"], "dur": t["dur"]} for t in unfit]},
+        ))
+
+
+def _check_groups(instance, tasks, findings, stats):
+    all_windows = _slot_windows(range(len(DAYS)))
+    day_windows = {
+        d: [(s, min(e, NORMAL_TIME_END)) for s, e in w if s < NORMAL_TIME_END]
+        for d, w in _slot_windows(WEEKDAYS).items()
+    }
+    week_minutes = sum(e - s for w in all_windows.values() for s, e in w)
+    daytime_minutes = sum(e - s for w in day_windows.values() for s, e in w)
+
+    section_group = dict(zip(instance.sections, instance.section_group))
+    demand = defaultdict(int)
+    for t in tasks:
+        group = section_group.get(t["section"])
+        if group:
+            demand[group] += int(t["dur"])
+
+    blocks = defaultdict(lambda: defaultdict(list))
+    for g_day, g_start, g_end, g_group in instance.gened_blocks:
+        blocks[g_group][g_day].append((g_start, g_end))
+
+    over, tight, rows = [], [], {}
+    for group, need in sorted(demand.items()):
+        by_day = {d: _merge(iv) for d, iv in blocks.get(group, {}).items()}
+        gened_week = sum(_overlap(iv, all_windows.get(d, ())) for d, iv in by_day.items())
+        gened_day = sum(_overlap(iv, day_windows.get(d, ())) for d, iv in by_day.items())
+        free = week_minutes - gened_week
+        free_day = daytime_minutes - gened_day
+        rows[group] = {"demand_min": need, "free_min": free, "free_daytime_min": free_day, "gened_min": gened_week}
+        if need > free:
+            over.append(group)
+        elif need > free_day:
+            tight.append(group)
+
+    stats["groups"] = rows
+    if over:
+        findings.append(Finding(
+            "group_time", PRECHECK_ERROR,
+            f"{len(over)} block group(s) need more weekly class time than the free slots left after GenEd: "
+            + ", ".join(f"{g} ({_hours(rows[g]['demand_min'])}h > {_hours(rows[g]['free_min'])}h)" for g in over),
+            {"groups": {g: rows[g] for g in over}},
+        ))
+    if tight:
+        findings.append(Finding(
+            "group_time", PRECHECK_WARNING,
+            f"{len(tight)} block group(s) cannot fit in weekday 8-5 and will need evening/weekend classes: "
+            + ", ".join(tight),
+            {"groups": {g: rows[g] for g in tight}},
+        ))
+
+    orphan = sorted(set(blocks) - set(demand), key=str)
+    if orphan:
+        findings.append(Finding(
+            "gened_groups", PRECHECK_WARNING,
+            f"GenEd blocks of {len(orphan)} group(s) match no section block group and are ignored: "
+            + ", ".join(str(g) for g in orphan[:10]) + ("..." if len(orphan) > 10 else ""),
+            {"groups": orphan},
+        ))
+
+
+def _check_rooms(instance, tasks, findings, stats):
+    tba = instance.tba_room_idx
+    pools = {
+        "lecture": [r for r in range(tba) if instance.room_types[r] in ("lecture", "universal")],
+        "lab": [r for r in range(tba) if instance.room_types[r] in ("laboratory", "universal")],
+    }
+    students = dict(zip(instance.sections, instance.section_students))
+    priority = dict(zip(instance.sections, instance.section_priority))
+
+    too_big = {}
+    for t in tasks:
+        need = students.get(t["section"], 0)
+        if not any(instance.room_capacities[r] >= need for r in pools[t["kind"]]):
+            too_big.setdefault(t["section"], {"students": need, "kinds": set()})["kinds"].add(t["kind"])
+    if too_big:
+        urgent = [s for s in too_big if priority.get(s)]
+        findings.append(Finding(
+            "room_capacity", PRECHECK_WARNING,
+            f"{len(too_big)} section(s) have more students than any suitable room and will be TBA"
+            + (f" ({len(urgent)} of them room-priority)" if urgent else "") + ".",
+            {"sections": [
+                {"section": s, "students": v["students"], "kinds": sorted(v["kinds"]), "priority": priority.get(s, False)}
+                for s, v in too_big.items()
+            ]},
+        ))
+
+    # Weekend classes are always TBA, so labs only get weekday slots
+    lab_room_minutes = sum(e - s for w in _slot_windows(WEEKDAYS).values() for s, e in w)
+    lab_demand = sum(int(t["dur"]) for t in tasks if t["kind"] == "lab")
+    lab_supply = len(pools["lab"]) * lab_room_minutes
+    stats["lab_rooms"] = {"rooms": len(pools["lab"]), "demand_min": lab_demand, "supply_min": lab_supply}
+    if lab_demand > lab_supply:
+        findings.append(Finding(
+            "lab_rooms", PRECHECK_WARNING,
+            f"Lab classes need {_hours(lab_demand)}h but {len(pools['lab'])} laboratory room(s) offer "
+            f"{_hours(lab_supply)}h of weekday time; at least {_hours(lab_demand - lab_supply)}h of labs will be TBA.",
+            stats["lab_rooms"],
+        ))
+
+
+def _check_instructors(instance, findings, stats, top_k):
+    emp_types = _employment_types(instance)
+    caps = [n + o for n, o in zip(instance.instructor_normal_min, instance.instructor_overload_min)]
+    need = {
+        s: lec + lab for s, lec, lab in zip(instance.sections, instance.section_lecture_min, instance.section_lab_min)
+    }
+    total_need = sum(need.values())
+
+    by_type = defaultdict(lambda: {"instructors": 0, "normal_min": 0, "overload_min": 0, "exclusive_demand_min": 0})
+    for emp, n, o in zip(emp_types, instance.instructor_normal_min, instance.instructor_overload_min):
+        by_type[emp]["instructors"] += 1
+        by_type[emp]["normal_min"] += n
+        by_type[emp]["overload_min"] += o
+
+    # A section's lecture and lab share one instructor
+    largest = max(caps, default=0)
+    unteachable = [s for s, m in need.items() if m > largest]
+    if unteachable:
+        findings.append(Finding(
+            "instructor_capacity", PRECHECK_ERROR,
+            f"{len(unteachable)} section(s) need more minutes than any instructor's normal + overload limit "
+            f"({_hours(largest)}h).",
+            {"sections": [{"section": s, "minutes": need[s]} for s in unteachable]},
+        ))
+
+    total_cap = sum(caps)
+    if total_need > total_cap:
+        findings.append(Finding(
+            "instructor_capacity", PRECHECK_ERROR,
+            f"Sections need {_hours(total_need)}h but all instructors together can teach {_hours(total_cap)}h "
+            f"(short {_hours(total_need - total_cap)}h).",
+            {"demand_min": total_need, "supply_min": total_cap},
+        ))
+
+    # Sections whose whole candidate domain is one employment type must fit in that type's limits
+    candidates, _cand_stats = build_instructor_candidates(instance.solver_data, top_k=top_k) if top_k else ({}, None)
+    for s, domain in candidates.items():
+        kinds = {emp_types[i] for i in domain}
+        if len(kinds) == 1:
+            by_type[kinds.pop()]["exclusive_demand_min"] += need.get(s, 0)
+    short = {
+        emp: row for emp, row in by_type.items()
+        if row["exclusive_demand_min"] > row["normal_min"] + row["overload_min"]
+    }
+    for emp, row in sorted(short.items()):
+        findings.append(Finding(
+            "employment_capacity", PRECHECK_ERROR,
+            f"Sections that only {emp} instructors can take need {_hours(row['exclusive_demand_min'])}h, "
+            f"but {emp} instructors offer {_hours(row['normal_min'])}h normal + {_hours(row['overload_min'])}h overload.",
+            {"employment": emp, **row},
+        ))
+
+    stats["instructors"] = {"demand_min": total_need, "supply_min": total_cap, "by_employment": dict(by_type)}
+
+
+def _check_availability(instance, tasks, findings, stats):
+    everyone = list(range(len(instance.instructors)))
+    _domains, avail = available_domains(
+        instance, {s: everyone for s in instance.sections}, tasks,
+        lambda dur: [SLOT_META[slot][3] for slot in allowed_slots_for(dur)],
+    )
+    unplaceable = avail["unplaceable_sections"]
+    if unplaceable:
+        findings.append(Finding(
+            "instructor_availability", PRECHECK_ERROR,
+            f"{len(unplaceable)} section(s) have a class meeting that fits no instructor's availability window; "
+            f"the model would be infeasible.",
+            {"sections": unplaceable},
+        ))
+    stats["availability"] = {"restricted_instructors": avail["restricted_instructors"]}
+
+
+def _check_pins(instance, pins, findings, stats):
+    kept, dropped = resolve_pins(instance, pins)
+    stats["pins"] = {"tasks": len(pins), "kept": len(kept), "dropped": len(dropped)}
+    if dropped:
+        findings.append(Finding(
+            "pins", PRECHECK_WARNING,
+            f"{len(dropped)} pinned part(s) contradict the model or another pin and will be ignored: "
+            + ", ".join(f"{d['task_id']} {d['part']} ({d['reason']})" for d in dropped[:5])
+            + ("..." if len(dropped) > 5 else ""),
+            {"dropped": dropped},
+        ))
+
+
+# ----------------- Entry point -----------------
+def analyze_instance(instance, top_k=CANDIDATE_TOP_K, pins=None):
+    """
+    Runs every pre-solve check on a ProblemInstance and returns a PrecheckVerdict:
+      durations            meetings whose length fits no start slot
+      group_time           block-group weekly minutes vs free slots after GenEd
+      gened_groups         GenEd blocks that no block group picks up
+      room_capacity        sections larger than every suitable room
+      lab_rooms            lab minutes vs weekday laboratory-room time
+      instructor_capacity  sections no instructor can carry, total hours
+      employment_capacity  per employment type normal/overload limits
+      instructor_availability  sections no instructor's windows can hold
+      pins                 pinned parts pins.resolve_pins drops (when pins are given)
+    top_k should match the solver's candidate pruning.
+    """
+    started = time.monotonic()
+    tasks = build_tasks(instance)
+    findings, stats = [], {"sections": len(instance.sections), "tasks": len(tasks)}
+
+    _check_durations(instance, tasks, findings)
+    _check_groups(instance, tasks, findings, stats)
+    _check_rooms(instance, tasks, findings, stats)
+    _check_instructors(instance, findings, stats, top_k)
+    _check_availability(instance, tasks, findings, stats)
+    if pins:
+        _check_pins(instance, pins, findings, stats)
+
+    return PrecheckVerdict(findings=findings, stats=stats, seconds=round(time.monotonic() - started, 3))
@@ -0,0 +1,136 @@
+# scheduler/progress.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from scheduling.models import Semester
+from scheduler.models import SchedulerProgress
+
+
+def send_progress(batch_id, data):
+    """Push one event to the dashboard listening on scheduler_<batch_id>."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(
+        f"scheduler_{batch_id}",
+        {"type": "progress.update", "data": data},
+    )
+
+
+class ProgressReporter:
+    """
+    Structured progress for a solve running inside the worker.
+
+    Every phase change and improving solution is pushed to scheduler_<batch_id>
+    and merged into SchedulerProgress.details:
+        {"phase": ..., "model": {...}, "incumbent": {objective, best_bound, wall_time, solution}}
+    is_cancelled() is the cooperative stop flag set by stopScheduler.
+    """
+
+    def __init__(self, batch_id, time_limit_seconds=None):
+        self.batch_id = batch_id
+        self.time_limit_seconds = time_limit_seconds
+        self.details = {}
+        progress = SchedulerProgress.objects.filter(batch_id=batch_id).first()
+        self.logs = list(progress.logs or []) if progress else []
+
+    def _update(self, event, message, **fields):
+        self.logs = (self.logs + [message])[-20:]
+        SchedulerProgress.objects.filter(batch_id=self.batch_id).update(
+            details=self.details, message=message, logs=self.logs, **fields
+        )
+        send_progress(self.batch_id, {
+            "status": "running",
+            "event": event,
+            "message": message,
+            "details": self.details,
+            **fields,
+        })
+
+    def phase(self, name, info):
+        self.details["phase"] = name
+        if name == "build":
+            self.details["model"] = info
+            message = (f"Model built: {info['tasks']} classes, {info['variables']:,} variables, "
+                       f"{info['constraints']:,} constraints ({info['seconds']:.1f}s)")
+        elif name == "extract":
+            message = f"Reading data for {info.get('semester')}..."
+        elif name == "solve":
+            message = "Searching for schedules..."
+        elif name == "stage":
+            message = (f"Objective stage {info['index']}/{info['stages']}: {info['stage']} "
+                       f"({info['time_limit_seconds']:.0f}s)")
+        elif name == "draft":
+            message = f"Building a quick draft for {info.get('sections', 0)} sections..."
+        elif name == "persist":
+            message = f"Saving {info.get('rows', 0)} classes..."
+        else:
+            message = f"Phase: {name}"
+        self._update("phase", message)
+
+    def solution(self, event):
+        self.details["incumbent"] = event
+        message = (
+            f"Solution #{event['solution']}: objective {event['objective']:,.0f} "
+            f"(bound {event['best_bound']:,.0f}) at {event['wall_time']:.1f}s"
+        )
+        fields = {}
+        if self.time_limit_seconds:
+            fields["progress"] = min(99, int(event["wall_time"] * 100 / self.time_limit_seconds))
+        self._update("solution", message, **fields)
+
+    def is_cancelled(self):
+        return SchedulerProgress.objects.filter(batch_id=self.batch_id, cancel_requested=True).exists()
+
+
+def solution_event_sender(batch_id):
+    """on_solution callback for the solver: streams each improving solution."""
+    def on_solution(event):
+        send_progress(batch_id, {
+            "status": "running",
+            "event": "solution",
+            **event,
+            "message": (
+                f"Solution #{event['solution']}: objective {event['objective']:,.0f} "
+                f"(bound {event['best_bound']:,.0f}) at {event['wall_time']:.1f}s"
+            ),
+        })
+    return on_solution
+
+
+def checkpoint_saver(batch_id):
+    """checkpoint callback for the solver: keeps the best-so-far assignment on SchedulerProgress."""
+    def checkpoint(payload):
+        SchedulerProgress.objects.filter(batch_id=batch_id).update(checkpoint=payload)
+    return checkpoint
+
+
+def materialize_checkpoint(progress):
+    """
+    Saves the best-so-far assignment of a stopped or killed run as Schedule rows
+    and drops the semester's candidate schedules. Returns the number of rows written (0 if there is no checkpoint).
+    """
+    from scheduler.solver import build_schedule_objects, save_schedule_rows, save_schedule_candidates
+
+    payload = progress.checkpoint or {}
+    entries = payload.get("entries")
+    if not entries:
+        return 0
+
+    semester = Semester.objects.filter(pk=payload.get("semester")).first()
+    if semester is None:
+        return 0
+
+    status = payload.get("status", "active")
+    schedules = build_schedule_objects(semester, entries, status=status, pins=payload.get("pins"))
+    save_schedule_rows(
+        semester, schedules,
+        status=status,
+        resolved_sections=payload.get("resolved_sections") if payload.get("incremental") else None,
+    )
+    # The stopped run kept no pool; earlier candidates would replace these rows
+    save_schedule_candidates(semester, [])
+
+    progress.checkpoint = None
+    progress.save(update_fields=["checkpoint"])
+    return len(schedules)
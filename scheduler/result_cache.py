@@ -0,0 +1,51 @@
+# scheduler/result_cache.py
+import hashlib
+import json
+
+from django.db.models import Max
+
+from scheduling.models import Schedule
+from scheduler.models import SolverRun
+
+# A run whose input (ProblemInstance.input_hash) and result-relevant settings
+# match the semester's latest saved run would only reproduce it: the solve is
+# skipped and the saved schedule is kept. Hints are left out of the key on
+# purpose, since every run warm-starts from the schedule the previous one saved.
+# The run also records which rows it left (schedule_batch_stamp): once the
+# batch is replaced, e.g. by revertSchedule or an applied candidate, the run
+# is no longer reused.
+
+_KEY_EXCLUDED_PARAMS = ("hints", "incumbent", "previous_rows", "log_search_progress", "export_model_path")
+REUSABLE_STATUSES = ("OPTIMAL", "FEASIBLE", "DRAFT")
+
+
+def run_cache_key(instance, params, **options):
+    """sha256 of the instance hash, the SolveParams settings and run options (processes, draft, ...)."""
+    settings = {k: v for k, v in params.to_dict().items() if k not in _KEY_EXCLUDED_PARAMS}
+    payload = {"input": instance.input_hash(), "params": settings, "options": options}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def schedule_batch_stamp(semester, status='active'):
+    """Newest createdAt of the semester's `status` rows (None without rows)."""
+    return Schedule.objects.filter(semester=semester, status=status).aggregate(stamp=Max("createdAt"))["stamp"]
+
+
+def find_cached_run(semester, cache_key, status='active'):
+    """
+    The semester's latest saved run if it had this cache key, finished with a
+    schedule and that schedule is still the `status` batch (same
+    schedule_batch_stamp); otherwise None.
+    """
+    latest = (SolverRun.objects
+              .filter(semester=semester, params__persist=True)
+              .exclude(status__in=("RUNNING", "ERROR"))
+              .first())
+    if latest is None or latest.cache_key != cache_key:
+        return None
+    if latest.status not in REUSABLE_STATUSES or latest.stopped_by == "cancelled":
+        return None
+    if latest.schedule_batch is None or latest.schedule_batch != schedule_batch_stamp(semester, status):
+        return None
+    return latest
@@ -0,0 +1,62 @@
+# scheduler/room_assignment.py
+from collections import defaultdict
+
+
+def room_levels(pool, room_capacities):
+    """
+    Distinct capacities of a room pool with the number of rooms at or above each.
+    Used for the aggregate (phase 1) capacity constraints: at any moment, tasks that
+    need at least `cap` seats cannot outnumber the rooms that have `cap` seats.
+    """
+    caps = sorted({room_capacities.get(r, 0) for r in pool})
+    return [(cap, sum(1 for r in pool if room_capacities.get(r, 0) >= cap)) for cap in caps]
+
+
+def assign_rooms(placed_tasks, room_capacities, tba_room_idx):
+    """
+    Phase 2 of the two-phase solve: rooms for tasks whose times are already fixed.
+
+    placed_tasks: list of dicts with
+        task_id, start, end (week minutes), rooms (valid room indices),
+        priority (bool), wants_room (phase 1 reserved capacity for it),
+        fixed (optional: room is kept from a previous run, placed first).
+
+    Greedy interval colouring: tasks are taken in start order, fixed rooms,
+    priority sections and phase-1 reservations first, and each gets the
+    smallest free room that fits (least-used on ties). Anything left over is TBA.
+
+    Returns ({task_id: room_idx}, stats).
+    """
+    busy = defaultdict(list)        # room_idx -> [(start, end)]
+    used_minutes = defaultdict(int)
+    result = {}
+
+    def is_free(r_idx, start, end):
+        return all(end <= s or start >= e for s, e in busy[r_idx])
+
+    order = sorted(
+        placed_tasks,
+        key=lambda t: (not t.get("fixed", False), not t["priority"], not t["wants_room"], t["start"], -t["end"])
+    )
+
+    for t in order:
+        real_rooms = [r for r in t["rooms"] if r != tba_room_idx]
+        free = [r for r in real_rooms if is_free(r, t["start"], t["end"])]
+        if not free:
+            result[t["task_id"]] = tba_room_idx
+            continue
+
+        best = min(free, key=lambda r: (room_capacities.get(r, 0), used_minutes[r], r))
+        busy[best].append((t["start"], t["end"]))
+        used_minutes[best] += t["end"] - t["start"]
+        result[t["task_id"]] = best
+
+    tba = sum(1 for r in result.values() if r == tba_room_idx)
+    stats = {
+        "tasks": len(result),
+        "tba": tba,
+        "tba_priority": sum(
+            1 for t in placed_tasks if t["priority"] and result[t["task_id"]] == tba_room_idx
+        ),
+    }
+    return result, stats
@@ -0,0 +1,55 @@
+# scheduler/solution_pool.py
+
+# -------------------- Configuration --------------------
+POOL_SIZE = 3               # candidate schedules kept per run (0 = only the best)
+POOL_MIN_DISTANCE = 0.05    # share of tasks whose time or instructor must differ
+
+
+def entries_assignment(entries):
+    """{task_id: (start, instructor)} of solver entries, the part compared by distance()."""
+    return {e["task_id"]: (e["start"], e["instructor"]) for e in entries}
+
+
+def distance(a, b):
+    """Hamming distance: tasks whose (start, instructor) differ between two assignments."""
+    return sum(1 for tid in a.keys() | b.keys() if a.get(tid) != b.get(tid))
+
+
+class SolutionPool:
+    """
+    The best `size` solutions of a search that are pairwise at least
+    `min_distance` tasks apart on time/instructor assignments.
+
+    offer() takes every solution the search reports. A new solution that is too
+    close to a better pool member is dropped; otherwise it replaces the worse
+    members it is too close to. Extra keyword arguments are kept with it
+    (e.g. the objective breakdown or the raw solver values).
+    """
+
+    def __init__(self, size=POOL_SIZE, min_distance=1):
+        self.size = size
+        self.min_distance = max(1, int(min_distance))
+        self.members = []
+
+    def offer(self, objective, assignment, **payload):
+        near = [m for m in self.members if distance(m["assignment"], assignment) < self.min_distance]
+        if any(m["objective"] >= objective for m in near):
+            return False
+        dropped = {id(m) for m in near}
+        self.members = [m for m in self.members if id(m) not in dropped]
+        self.members.append({"objective": objective, "assignment": assignment, **payload})
+        self.members.sort(key=lambda m: -m["objective"])
+        del self.members[self.size:]
+        return True
+
+    def ranked(self):
+        """Members best first, each with rank and its distance to the closest better one."""
+        result = []
+        for pos, m in enumerate(self.members):
+            closest = min((distance(m["assignment"], better["assignment"]) for better in self.members[:pos]), default=None)
+            result.append({**m, "rank": pos + 1, "distance": closest})
+        return result
+
+
+def min_distance_for(task_count, share=POOL_MIN_DISTANCE):
+    return max(1, round(task_count * share))
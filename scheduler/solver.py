@@ -1,99 +1,81 @@
 # scheduler/solver.py
-import math
-from collections import defaultdict
-from itertools import combinations
+import os
+import time
+from collections import Counter
 
-from ortools.sat.python import cp_model
+from django.conf import settings
 from django.db import transaction
 from datetime import datetime, timedelta
 
-from scheduling.models import Section, Semester, Schedule, Room, GenEdSchedule
+from scheduling.models import Section, Semester, Schedule, Room
 from core.models import Instructor
-from scheduler.data_extractors import get_solver_data
-
-# -------------------- Configuration --------------------
-DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-INTERVAL_MINUTES = 30
-WEEK_MINUTES = 7 * 24 * 60
-
-MATCH_WEIGHT_SCALE = 100
-REAL_ROOM_REWARD = 10000         
-
-TBA_PENALTY_NORMAL = 5000 #increase to discourage TBA rooms  
-TBA_PENALTY_PRIORITY = 200000 
-
-WEEKEND_TIME_PENALTY_PER_MINUTE = 5000 
-WEEKDAY_EVENING_PENALTY_PER_MINUTE = 10000
-
-NORMAL_LOAD_REWARD_PER_MIN = 5000            
-OVERLOAD_FAIRNESS_PENALTY = 50000 
-DAILY_SPREAD_PENALTY = 2000
-MAX_DESIRED_DAILY_MIN = 360 # 6 hours
-
-OVERLOAD_PENALTY = 2000
-GLOBAL_OVERLOAD_COST_PER_MIN = 10
-TOTAL_LOAD_FAIRNESS_PENALTY = 500         
-
-# -------------------- Timeslot metadata --------------------
-def generate_timeslot_meta():
-    slot_meta = []
-    MORNING_RANGE = (8, 12)
-    AFTERNOON_RANGE = (13, 17)
-    OVERLOAD_RANGE_WEEKDAYS = (17, 20) 
-    OVERLOAD_RANGE_WEEKENDS = [(8, 12), (13, 20)]
-
-    for day_idx, day in enumerate(DAYS):
-        if day_idx <= 4:  # Mon-Fri
-            for hour in range(MORNING_RANGE[0], MORNING_RANGE[1]):
-                for minute in (0, 30):
-                    minute_of_day = hour * 60 + minute
-                    label = f"{day} {hour:02d}:{minute:02d}"
-                    minute_of_week = day_idx * 1440 + minute_of_day
-                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
-            for hour in range(AFTERNOON_RANGE[0], AFTERNOON_RANGE[1]):
-                for minute in (0, 30):
-                    minute_of_day = hour * 60 + minute
-                    label = f"{day} {hour:02d}:{minute:02d}"
-                    minute_of_week = day_idx * 1440 + minute_of_day
-                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
-            
-            # Overload
-            start_h, end_h = OVERLOAD_RANGE_WEEKDAYS
-            hour = start_h
-            minute = 0
-            while hour * 60 + minute + INTERVAL_MINUTES <= end_h * 60 + 1e-9:
-                minute_of_day = hour * 60 + minute
-                label = f"{day} {hour:02d}:{minute:02d}"
-                minute_of_week = day_idx * 1440 + minute_of_day
-                slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
-                minute += INTERVAL_MINUTES
-                if minute == 60:
-                    minute = 0
-                    hour += 1
-        else:  # Sat-Sun
-            for start_h, end_h in OVERLOAD_RANGE_WEEKENDS:
-                hour = int(start_h)
-                minute = 0
-                while hour*60 + minute + INTERVAL_MINUTES <= end_h*60 + 1e-9:
-                    minute_of_day = hour*60 + minute
-                    label = f"{day} {hour:02d}:{minute:02d}"
-                    minute_of_week = day_idx*1440 + minute_of_day
-                    slot_meta.append((label, day_idx, minute_of_day, minute_of_week))
-                    minute += INTERVAL_MINUTES
-                    if minute == 60:
-                        minute = 0
-                        hour += 1
-
-    timeslots = [m[0] for m in slot_meta]
-    return timeslots, slot_meta
-
-TIMESLOTS, SLOT_META = generate_timeslot_meta()
-NUM_SLOTS = len(TIMESLOTS)
-SLOT_TO_DAY = {i: SLOT_META[i][1] for i in range(NUM_SLOTS)}
-SLOT_TO_GLOBAL_MIN = {i: SLOT_META[i][3] for i in range(NUM_SLOTS)}
+from scheduler.data_extractors import build_problem_instance
+from scheduler.candidates import CANDIDATE_TOP_K
+from scheduler.warm_start import (
+    HINT_FIELDS, load_schedule_batch, build_schedule_hints, load_pinned_rows, build_schedule_pins,
+)
+from scheduler.pins import resolve_pins
+from scheduler.instance import SolveParams
+from scheduler.engine import DAYS, solve
+from scheduler.portfolio import solve_portfolio
+from scheduler.construction import DRAFT_STATUS, construct_schedule, entries_to_hints
+from scheduler.telemetry import start_solver_run, finish_solver_run, fail_solver_run
+from scheduler.result_cache import run_cache_key, find_cached_run, schedule_batch_stamp
+from scheduler.model_export import model_file_name
+from scheduler.solution_pool import POOL_SIZE
+from scheduler.models import ScheduleCandidate
 
 # ----------------- Main solver -----------------
-def solve_schedule_for_semester(semester=None, time_limit_seconds=600):
+def solve_schedule_for_semester(semester=None, time_limit_seconds=600, top_k=CANDIDATE_TOP_K,
+                                two_phase=False, persist=True, report=None,
+                                hint_batch=None, repair_hint=False,
+                                incremental=False, changed_sections=None,
+                                on_solution=None, checkpoint=None, stop_policy=None,
+                                on_phase=None, should_stop=None, processes=1,
+                                record_run=True, batch_id=None, symmetry_breaking=False,
+                                pool_size=POOL_SIZE, lexicographic=False,
+                                draft=False, construction_seed=False, force=False,
+                                export_model=False):
+    """
+    Reads the semester into a ProblemInstance, solves it with engine.solve and
+    saves the result to Schedule.
+
+    persist:   write the result to Schedule (False for benchmarks).
+    report:    optional dict filled with timings and the outcome of the run.
+    hint_batch: warm-start from a previous run ('latest', 'active', 'finalized'
+               or an archived batch key, see warm_start.py). None starts cold.
+    incremental: keep the previous active/finalized schedule fixed except for the
+               neighborhood of changed sections, and write only that delta.
+    checkpoint: called (throttled) with the best-so-far assignment as plain entries,
+               so a stopped run can still be saved (see progress.materialize_checkpoint).
+    on_phase:  called as on_phase(name, info) at extract / build / solve / persist.
+    processes: 1 solves in this process; more runs a multi-seed portfolio of that
+               many CP-SAT processes (portfolio.py), 0 sizes it from the CPU count.
+    record_run: keep a SolverRun row with the counts, timings and outcome
+               (batch_id links it to the dashboard's SchedulerProgress).
+    pool_size: keep the best distinct schedules of the search as ScheduleCandidate
+               rows (full runs only), selectable in scheduleOutput.
+    draft:     skip CP-SAT and save the construction heuristic's schedule
+               (construction.py) as a quick draft; meant for very large semesters.
+    construction_seed: start the search from the construction heuristic's
+               schedule when there is no previous schedule to warm-start from.
+    force:     solve even when the semester's latest saved run had the same input
+               and settings (by default its schedule is kept, see result_cache.py).
+    export_model: save the CP-SAT model to settings.SCHEDULER_MODEL_DIR for
+               offline replay (replay_model command).
+
+    Pinned Schedule rows (pinTime / pinRoom / pinInstructor) of the active
+    draft or the finalized schedule keep their pinned parts in every mode, and
+    the rows written for them stay pinned.
+
+    The remaining options are passed on to engine.solve (see SolveParams).
+    """
+    report = report if report is not None else {}
+
+    def phase(name, **info):
+        if on_phase:
+            on_phase(name, info)
+
     if semester is None:
         semester = Semester.objects.filter(isActive=True).order_by('-createdAt').first()
         if not semester:
@@ -102,606 +84,267 @@ def solve_schedule_for_semester(semester=None, time_limit_seconds=600):
         semester = Semester.objects.get(pk=semester)
 
     print(f"[Solver] Semester: {semester}")
-    Schedule.objects.filter(semester=semester, status='active').update(status='archived')
-
-    data = get_solver_data(semester)
-    sections = list(data["sections"])
-    section_to_group = data.get("section_to_group", {})
-    rooms = list(data["rooms"])
-    instructors = list(data["instructors"])
-    instructor_caps = data["instructor_caps"]
-    
-    room_types = data.get("room_types", {i: 'lecture' for i in range(len(rooms))}) 
-    room_capacities = data.get("room_capacities", {i: 999 for i in range(len(rooms))}) 
-    section_priority_map = data.get("section_priority_map", {}) 
-    section_num_students = data.get("section_num_students", {})
-    
-    num_rooms = len(rooms)
-    num_instructors = len(instructors)
-    
-    if "TBA_ROOM_IDX" in data:
-        TBA_ROOM_IDX = data["TBA_ROOM_IDX"]
-    else:
-        TBA_ROOM_IDX = num_rooms - 1 
-
-    # --- Robust Room Domains ---
-    lecture_base_indices = {TBA_ROOM_IDX}
-    lab_base_indices = {TBA_ROOM_IDX}
-
-    for i in range(num_rooms):
-        rtype = room_types.get(i, 'lecture')
-        if rtype in ('lecture', 'universal'):
-            lecture_base_indices.add(i)
-        if rtype in ('laboratory', 'universal'):
-            lab_base_indices.add(i)
-
-    model = cp_model.CpModel()
-
-    # --- Task Generation ---
-    tasks = []
-    for s in sections:
-        sec_hours = data["section_hours"].get(s, {"lecture_min": 0, "lab_min": 0})
-        lecture_d = int(sec_hours.get("lecture_min", 0) or 0)
-        lab_d = int(sec_hours.get("lab_min", 0) or 0)
-
-        if lecture_d > 120:
-            half = lecture_d // 2
-            other_half = lecture_d - half
-            tasks.append({
-                "task_id": f"{s}_LECT_A", "section": s, "kind": "lecture", "dur": half
-            })
-            tasks.append({
-                "task_id": f"{s}_LECT_B", "section": s, "kind": "lecture", "dur": other_half
-            })
-        else:
-            tasks.append({
-                "task_id": f"{s}_LECT", "section": s, "kind": "lecture", "dur": lecture_d
-            })
-        if lab_d > 0:
-            tasks.append({
-                "task_id": f"{s}_LAB", "section": s, "kind": "lab", "dur": lab_d
-            })
-
-    # --- Variables ---
-    task_vars = {} 
-    assigned_instr = defaultdict(list)
-    assigned_room = defaultdict(list)
-    instr_intervals = defaultdict(list)
-    room_intervals = defaultdict(list) 
-    group_intervals = defaultdict(list)
-
-    allowed_slots_for_duration = {}
-    def get_allowed_slots(dur):
-        if dur not in allowed_slots_for_duration:
-            lst = []
-            for i in range(NUM_SLOTS):
-                day = SLOT_META[i][1]
-                minute_of_day = SLOT_META[i][2]
-                end = minute_of_day + dur
-                
-                if end > 20*60: continue
-                if not (end <= 12*60 or minute_of_day >= 13*60): continue 
-                if minute_of_day < 8*60 or (12*60 <= minute_of_day < 13*60): continue
-                
-                lst.append(i)
-            allowed_slots_for_duration[dur] = lst
-        return allowed_slots_for_duration[dur]
-
-    latest_end_by_day = {d: 20*60 for d in range(7)}
-
-    for t in tasks:
-        tid = t["task_id"]
-        dur = int(t["dur"])
-        allowed_slots = get_allowed_slots(dur)
-
-        if not allowed_slots:
-            print(f"[Solver] ERROR: Task {tid} fits NO time slots! Skipping.")
-            continue 
-
-        # Time
-        slot_var = model.NewIntVarFromDomain(cp_model.Domain.FromValues(allowed_slots), f"slot_{tid}")
-        start_var = model.NewIntVar(0, WEEK_MINUTES - 1, f"start_{tid}")
-        end_var = model.NewIntVar(0, WEEK_MINUTES, f"end_{tid}")
-        day_var = model.NewIntVar(0, 6, f"day_{tid}")
-
-        model.AddAllowedAssignments([slot_var, start_var], [(i, SLOT_TO_GLOBAL_MIN[i]) for i in allowed_slots])
-        model.AddAllowedAssignments([slot_var, day_var], [(i, SLOT_TO_DAY[i]) for i in allowed_slots])
-        model.Add(end_var == start_var + dur)
-
-        for d in range(7):
-            cond = model.NewBoolVar(f"{tid}_day{d}")
-            model.Add(day_var == d).OnlyEnforceIf(cond)
-            model.Add(day_var != d).OnlyEnforceIf(cond.Not())
-            allowed_end = d*1440 + latest_end_by_day[d]
-            model.Add(end_var <= allowed_end).OnlyEnforceIf(cond)
-
-        # No Straddle
-        is_weekday = model.NewBoolVar(f"{tid}_is_weekday")
-        model.Add(day_var <= 4).OnlyEnforceIf(is_weekday)
-        model.Add(day_var >= 5).OnlyEnforceIf(is_weekday.Not())
-
-        start_mod = model.NewIntVar(0, 1440, f"{tid}_start_mod")
-        model.AddModuloEquality(start_mod, start_var, 1440)
-        end_mod = model.NewIntVar(0, 1440, f"{tid}_end_mod")
-        model.AddModuloEquality(end_mod, end_var, 1440)
-
-        ends_early = model.NewBoolVar(f"{tid}_ends_early")
-        model.Add(end_mod <= 1020).OnlyEnforceIf(ends_early) 
-        model.Add(end_mod > 1020).OnlyEnforceIf(ends_early.Not())
-        starts_late = model.NewBoolVar(f"{tid}_starts_late")
-        model.Add(start_mod >= 1020).OnlyEnforceIf(starts_late)
-        model.Add(start_mod < 1020).OnlyEnforceIf(starts_late.Not())
-
-        model.AddBoolOr([ends_early, starts_late]).OnlyEnforceIf(is_weekday)
-
-        # Room (Capacity + Type)
-        base_indices = lab_base_indices if t["kind"] == "lab" else lecture_base_indices
-        required_students = section_num_students.get(t["section"], 0)
-        valid_indices = []
-        for r_idx in base_indices:
-            if r_idx == TBA_ROOM_IDX:
-                valid_indices.append(r_idx)
-                continue
-            cap = room_capacities.get(r_idx, 0)
-            if cap >= required_students:
-                valid_indices.append(r_idx)
-        if not valid_indices: valid_indices = [TBA_ROOM_IDX]
-
-        room_var = model.NewIntVarFromDomain(cp_model.Domain.FromValues(sorted(valid_indices)), f"room_{tid}")
-        
-        # Instructor
-        instr_var = model.NewIntVar(0, max(0, num_instructors - 1), f"instr_{tid}")
-
-        task_vars[tid] = {
-            "start": start_var, "end": end_var, "day": day_var, 
-            "room": room_var, "instr": instr_var, "dur": dur,
-            "kind": t["kind"], "section": t["section"]
-        }
-
-        master_iv = model.NewIntervalVar(start_var, dur, end_var, f"miv_{tid}")
-        gid = section_to_group.get(t["section"])
-        if gid:
-            group_intervals[gid].append(master_iv)
-
-        # Intervals
-        for i_idx in range(num_instructors):
-            b = model.NewBoolVar(f"assign_{tid}_instr{i_idx}")
-            assigned_instr[(tid, i_idx)] = b 
-            model.Add(instr_var == i_idx).OnlyEnforceIf(b)
-            model.Add(instr_var != i_idx).OnlyEnforceIf(b.Not())
-            iv = model.NewOptionalIntervalVar(start_var, dur, end_var, b, f"iv_i_{tid}")
-            instr_intervals[i_idx].append(iv)
-        model.Add(sum(assigned_instr[(tid, i)] for i in range(num_instructors)) == 1)
-
-        for r_idx in range(num_rooms):
-            b = model.NewBoolVar(f"assign_{tid}_room{r_idx}")
-            assigned_room[(tid, r_idx)] = b
-            model.Add(room_var == r_idx).OnlyEnforceIf(b)
-            model.Add(room_var != r_idx).OnlyEnforceIf(b.Not())
-            if r_idx != TBA_ROOM_IDX:
-                iv = model.NewOptionalIntervalVar(start_var, dur, end_var, b, f"iv_r_{tid}")
-                room_intervals[r_idx].append(iv)
-        model.Add(sum(assigned_room[(tid, r)] for r in range(num_rooms)) == 1)
-
-        # Weekend Lockout
-        is_weekend_check = model.NewBoolVar(f"{tid}_check_weekend")
-        model.Add(day_var >= 5).OnlyEnforceIf(is_weekend_check)
-        model.Add(day_var < 5).OnlyEnforceIf(is_weekend_check.Not())
-        model.Add(room_var == TBA_ROOM_IDX).OnlyEnforceIf(is_weekend_check)
-
-    # Overlaps
-    for i_idx, ivs in instr_intervals.items():
-        if ivs: model.AddNoOverlap(ivs)
-    for r_idx, ivs in room_intervals.items():
-        if ivs: model.AddNoOverlap(ivs)
-    for gid, ivs in group_intervals.items():
-        if len(ivs) > 1:
-            model.AddNoOverlap(ivs)
-
-    # Links
-    section_to_tasks = defaultdict(list)
-    for t in tasks:
-        if t["task_id"] in task_vars:
-            section_to_tasks[t["section"]].append(t)
-
-    for sec, tlist in section_to_tasks.items():
-        lects = [t for t in tlist if t["kind"] == "lecture"]
-        labs = [t for t in tlist if t["kind"] == "lab"]
-        for l_task in labs:
-            for lect_task in lects:
-                model.Add(task_vars[l_task["task_id"]]["instr"] == task_vars[lect_task["task_id"]]["instr"])
-        
-        split_lects = [t for t in lects if "_LECT_A" in t["task_id"] or "_LECT_B" in t["task_id"]]
-        if len(split_lects) == 2:
-            lA, lB = split_lects
-            vA = task_vars[lA["task_id"]]
-            vB = task_vars[lB["task_id"]]
-            model.Add(vA["instr"] == vB["instr"])
-            durA = lA["dur"]
-            min_gap = durA + 30
-            diff = model.NewIntVar(0, WEEK_MINUTES, f"gap_{sec}")
-            model.AddAbsEquality(diff, vA["start"] - vB["start"])
-            model.Add(diff >= min_gap)
-
-    # GenEd
-    for g_day, g_start, g_end, g_group in data.get("gened_blocks", []):
-        # Convert GenEd minutes to absolute week minutes
-        g_s_glob = g_day * 1440 + g_start
-        g_e_glob = g_day * 1440 + g_end
-
-        for tid, tv in task_vars.items():
-            # Identify which group this IT task belongs to
-            it_section_id = tv["section"]
-            it_group = data["section_to_group"][it_section_id]
-
-            # ONLY apply the constraint if they are the SAME group (e.g., both "1-A")
-            if it_group == g_group:
-                # Create a unique name for the boolean variables
-                prefix = f"gened_{tid}_{g_day}_{g_start}"
-
-                diff_day = model.NewBoolVar(f"{prefix}_diff")
-                model.Add(tv["day"] != g_day).OnlyEnforceIf(diff_day)
-
-                before = model.NewBoolVar(f"{prefix}_before")
-                model.Add(tv["end"] <= g_s_glob).OnlyEnforceIf(before)
-
-                after = model.NewBoolVar(f"{prefix}_after")
-                model.Add(tv["start"] >= g_e_glob).OnlyEnforceIf(after)
-
-                # Logic: Task is either on a different day, ends before, or starts after
-                model.AddBoolOr([diff_day, before, after])
-
-    # -------------------- Load Calculation & Objectives --------------------
-    objective_terms = []
-    
-    # Precompute Status
-    task_is_overtime = {} 
-    for tid, tv in task_vars.items():
-        is_weekend = model.NewBoolVar(f"{tid}_is_we")
-        model.Add(tv["day"] >= 5).OnlyEnforceIf(is_weekend)
-        model.Add(tv["day"] < 5).OnlyEnforceIf(is_weekend.Not())
-        
-        # --- Check End Time instead of Start Time ---
-        end_mod = model.NewIntVar(0, 1440, f"{tid}_end_mod_ot")
-        model.AddModuloEquality(end_mod, tv["end"], 1440)
-        
-        is_evening = model.NewBoolVar(f"{tid}_is_eve")
-        # If End Time > 17:00 (1020 mins), it counts as Evening/Overload
-        model.Add(end_mod > 1020).OnlyEnforceIf(is_evening) 
-        model.Add(end_mod <= 1020).OnlyEnforceIf(is_evening.Not())
-        
-        is_ot = model.NewBoolVar(f"{tid}_is_ot")
-        model.AddBoolOr([is_weekend, is_evening]).OnlyEnforceIf(is_ot)
-        model.AddBoolAnd([is_weekend.Not(), is_evening.Not()]).OnlyEnforceIf(is_ot.Not())
-        task_is_overtime[tid] = is_ot
-
-
-    # Instructor Totals
-    all_instructor_total_mins = []
-    
-    # Track permanent load just for reference if needed
-    permanent_load_vars = [] 
-    permanent_ids = set(data.get("permanent_instructors", []))
-
-    for i_idx, instr_id in enumerate(instructors):
-        caps = instructor_caps.get(instr_id, {})
-        n_lim = caps.get("normal_limit_min", 1080) # e.g., 18 hours
-        o_lim = caps.get("overload_limit_min", 720) # e.g., 12 hours
-        
-        # New variables to track accumulated time separately
-        normal_time_contribs = []   # Mon-Fri 8am-5pm
-        overload_time_contribs = [] # Mon-Fri 5pm+ OR Weekends
-        
-        # Calculate TOTAL minutes (for general stats)
-        total_instr_minutes_list = []
-
-        for t in tasks:
-            tid = t["task_id"]
-            if tid not in task_vars: continue 
-            
-            # Check if assigned to this instructor
-            if (tid, i_idx) in assigned_instr:
-                is_assigned = assigned_instr[(tid, i_idx)]
-                dur = t["dur"]
-                
-                # Get the Pre-calculated Time Status (Day vs Evening/Weekend)
-                is_ot_slot = task_is_overtime[tid]
-
-                # --- 1. Contribution to "Overload Time" (Weekend/Evening) ---
-                is_assigned_and_ot = model.NewBoolVar(f"assign_ot_{tid}_{i_idx}")
-                model.AddBoolAnd([is_assigned, is_ot_slot]).OnlyEnforceIf(is_assigned_and_ot)
-                model.AddBoolOr([is_assigned.Not(), is_ot_slot.Not()]).OnlyEnforceIf(is_assigned_and_ot.Not())
-                
-                ot_contrib = model.NewIntVar(0, dur, f"contrib_ot_{tid}_{i_idx}")
-                model.Add(ot_contrib == is_assigned_and_ot * dur)
-                overload_time_contribs.append(ot_contrib)
-
-                # --- 2. Contribution to "Normal Time" (Weekday Day) ---
-                is_assigned_and_norm = model.NewBoolVar(f"assign_norm_{tid}_{i_idx}")
-                model.AddBoolAnd([is_assigned, is_ot_slot.Not()]).OnlyEnforceIf(is_assigned_and_norm)
-                model.AddBoolOr([is_assigned.Not(), is_ot_slot]).OnlyEnforceIf(is_assigned_and_norm.Not())
-                
-                norm_contrib = model.NewIntVar(0, dur, f"contrib_norm_{tid}_{i_idx}")
-                model.Add(norm_contrib == is_assigned_and_norm * dur)
-                normal_time_contribs.append(norm_contrib)
-
-                # Track simple total
-                task_total = model.NewIntVar(0, dur, f"contrib_total_{tid}_{i_idx}")
-                model.Add(task_total == is_assigned * dur)
-                total_instr_minutes_list.append(task_total)
-
-        # -------------------- THE FIX IS HERE --------------------
-        
-        # 1. Sum up Normal Time (Mon-Fri 8-5)
-        sum_norm_time = model.NewIntVar(0, WEEK_MINUTES, f"sum_norm_time_{i_idx}")
-        model.Add(sum_norm_time == sum(normal_time_contribs))
-        
-        # STRICT CONSTRAINT: You cannot teach more Normal Hours than the Normal Limit.
-        # This forces extra classes to be moved to Overload Hours.
-        model.Add(sum_norm_time <= n_lim)
-
-        if n_lim > 0:
-             # Calculate how many minutes they are "short" of their limit
-             underload = model.NewIntVar(0, WEEK_MINUTES, f"underload_{i_idx}")
-             model.Add(underload == n_lim - sum_norm_time)
-             
-             # Weight: 
-             # 50 points per minute empty. 
-             # If you are empty for 2 hours (120 mins), penalty is 6,000.
-             # This is enough to beat "convenience" but won't break the solver.
-             FILL_PRIORITY_WEIGHT = 50  
-             objective_terms.append(underload * -FILL_PRIORITY_WEIGHT)
-
-        # 2. Sum up Overload Time (Weekends/Eve)
-        sum_ot_time = model.NewIntVar(0, WEEK_MINUTES, f"sum_ot_time_{i_idx}")
-        model.Add(sum_ot_time == sum(overload_time_contribs))
-        
-        # STRICT CONSTRAINT: You cannot teach more Overload Hours than the Overload Limit.
-        model.Add(sum_ot_time <= o_lim)
-
-        # ---------------------------------------------------------
-
-        # Total Calculation
-        total_minutes = model.NewIntVar(0, WEEK_MINUTES, f"total_mins_{i_idx}")
-        model.Add(total_minutes == sum(total_instr_minutes_list))
-        all_instructor_total_mins.append(total_minutes)
 
-        if instr_id in permanent_ids:
-            permanent_load_vars.append(total_minutes)
-
-        # Apply Objectives (Rewards/Penalties)
-        # Reward filling the Normal Load (Primary Goal)
-        objective_terms.append(sum_norm_time * NORMAL_LOAD_REWARD_PER_MIN)
-        
-        # Penalize Overload (Cost) - Lower priority than filling normal load
-        objective_terms.append(sum_ot_time * -GLOBAL_OVERLOAD_COST_PER_MIN)
-
-        # Fairness penalty (optional, keeps overload distributed)
-        sq_over = model.NewIntVar(0, o_lim * o_lim, f"sq_over_{i_idx}")
-        model.AddMultiplicationEquality(sq_over, [sum_ot_time, sum_ot_time])
-        objective_terms.append(sq_over * -OVERLOAD_FAIRNESS_PENALTY)
-
-        # 5. Daily Spread Protection (Same as before)
-        for d in range(7):
-            d_terms = []
-            for t in tasks:
-                tid = t["task_id"]
-                if tid not in task_vars: continue
-                dur = t["dur"]
-                assigned = assigned_instr[(tid, i_idx)]
-                
-                day_match = model.NewBoolVar(f"{tid}_on_{d}")
-                model.Add(task_vars[tid]["day"] == d).OnlyEnforceIf(day_match)
-                model.Add(task_vars[tid]["day"] != d).OnlyEnforceIf(day_match.Not())
-                
-                active = model.NewBoolVar(f"{tid}_act_{d}_{i_idx}")
-                model.AddBoolAnd([assigned, day_match]).OnlyEnforceIf(active)
-                model.AddBoolOr([assigned.Not(), day_match.Not()]).OnlyEnforceIf(active.Not())
-                d_terms.append(active * dur)
-            
-            daily_sum = model.NewIntVar(0, 1440, f"ds_{i_idx}_{d}")
-            model.Add(daily_sum == sum(d_terms))
-            
-            excess = model.NewIntVar(0, 1440, f"exc_{i_idx}_{d}")
-            model.Add(excess >= daily_sum - MAX_DESIRED_DAILY_MIN)
-            objective_terms.append(excess * -DAILY_SPREAD_PENALTY)
-
-    # -------------------- Global Fairness --------------------
-    if len(permanent_load_vars) > 1:
-        max_p_load = model.NewIntVar(0, WEEK_MINUTES, "max_perm_load")
-        min_p_load = model.NewIntVar(0, WEEK_MINUTES, "min_perm_load")
-        
-        model.AddMaxEquality(max_p_load, permanent_load_vars)
-        model.AddMinEquality(min_p_load, permanent_load_vars)
-        
-        load_gap = model.NewIntVar(0, WEEK_MINUTES, "perm_load_gap")
-        model.Add(load_gap == max_p_load - min_p_load)
-
-        objective_terms.append(load_gap * -TOTAL_LOAD_FAIRNESS_PENALTY)
-
-    # -------------------- Room Usage Balancing --------------------
-    for r_idx in range(len(rooms) - 1): 
-        usage_vars = []
-        for t in tasks:
-            tid = t["task_id"]
-            if tid not in task_vars: continue
-            
-            if (tid, r_idx) in assigned_room:
-                 usage_vars.append(assigned_room[(tid, r_idx)] * t["dur"])
-        
-        if usage_vars:
-            r_total = model.NewIntVar(0, WEEK_MINUTES, f"room_usage_{r_idx}")
-            model.Add(r_total == sum(usage_vars))
-            
-            r_hours = model.NewIntVar(0, 168, f"rh_{r_idx}")
-            model.AddDivisionEquality(r_hours, r_total, 60)
-
-            r_sq_hours = model.NewIntVar(0, 168*168, f"r_sq_{r_idx}")
-            model.AddMultiplicationEquality(r_sq_hours, [r_hours, r_hours])
-            
-            objective_terms.append(r_sq_hours * -20)
-
-    # --- Other Objectives ---
-    matches = data.get("matches", {})
-    i_map = data.get("instructor_index", {})
-    for sec_id, m_list in matches.items():
-        sec_tasks = section_to_tasks.get(sec_id, [])
-        for (i_id, score) in m_list:
-            if i_id not in i_map: continue
-            idx = i_map[i_id]
-            w = int(round(score * MATCH_WEIGHT_SCALE))
-            for t in sec_tasks:
-                if t["task_id"] not in task_vars: continue
-                b = assigned_instr[(t["task_id"], idx)]
-                if w != 0: objective_terms.append(b * w)
-
-    for t in tasks:
-        tid = t["task_id"]
-        if tid not in task_vars: continue
-        is_priority = section_priority_map.get(t["section"], False)
-        room_var = task_vars[tid]["room"]
-        
-        is_tba = model.NewBoolVar(f"{tid}_is_tba")
-        model.Add(room_var == TBA_ROOM_IDX).OnlyEnforceIf(is_tba)
-        model.Add(room_var != TBA_ROOM_IDX).OnlyEnforceIf(is_tba.Not())
-        
-        if is_priority:
-            objective_terms.append(is_tba * -TBA_PENALTY_PRIORITY)
+    # Read the previous run before it gets archived below
+    hint_rows = None
+    used_key = None
+    if draft and incremental:
+        print("[Solver] Quick drafts are always built for the whole semester.")
+        incremental = False
+    if incremental and not hint_batch:
+        hint_batch = "latest"
+    if hint_batch:
+        used_key, hint_qs = load_schedule_batch(semester, hint_batch)
+        hint_rows = list(hint_qs.values(*HINT_FIELDS))
+        report["hint_batch"] = used_key
+        print(f"[Solver] Warm start from batch: {used_key or 'none found'}")
+
+    if incremental and used_key not in ("active", "finalized"):
+        print("[Solver] Incremental mode needs an active or finalized schedule. Running a full solve.")
+        incremental = False
+    base_status = used_key if incremental else 'active'
+
+    phase("extract", semester=str(semester))
+    extract_started = time.time()
+    instance = build_problem_instance(semester)
+    report["extract_seconds"] = round(time.time() - extract_started, 3)
+
+    pins, dropped_pins = resolve_pins(instance, build_schedule_pins(load_pinned_rows(semester), instance.solver_data))
+    for d in dropped_pins:
+        print(f"[Solver] Pin ignored for {d['task_id']} ({d['part']}): {d['reason']}")
+    if dropped_pins:
+        report["dropped_pins"] = dropped_pins
+
+    params = SolveParams(
+        time_limit_seconds=time_limit_seconds,
+        top_k=top_k,
+        two_phase=two_phase,
+        repair_hint=repair_hint,
+        incremental=incremental,
+        changed_sections=tuple(changed_sections or ()),
+        hints=build_schedule_hints(hint_rows, instance.solver_data) if hint_rows is not None else {},
+        previous_rows=dict(Counter(row["section_id"] for row in hint_rows or ())),
+        pins=pins,
+        symmetry_breaking=symmetry_breaking,
+        pool_size=0 if incremental else pool_size,
+        lexicographic=lexicographic,
+    )
+
+    run_options = dict(
+        processes=processes, persist=persist, hint_batch=report.get("hint_batch"),
+        stop_policy=stop_policy.to_dict() if stop_policy else None,
+    )
+    cache_key = run_cache_key(
+        instance, params, draft=draft, construction_seed=construction_seed,
+        processes=processes, stop_policy=run_options["stop_policy"],
+    )
+    if persist and record_run and not force:
+        cached = find_cached_run(semester, cache_key, status=base_status)
+        if cached:
+            return reuse_cached_run(semester, instance, params, cached, base_status, report,
+                                    batch_id=batch_id, cache_key=cache_key, **run_options)
+
+    if persist and not incremental:
+        Schedule.objects.filter(semester=semester, status='active').update(status='archived')
+
+    if construction_seed and not draft and not hint_rows:
+        params.incumbent = entries_to_hints(instance, construct_schedule(instance, top_k=top_k, pins=pins).entries)
+
+    def write_checkpoint(payload):
+        checkpoint({"semester": semester.pk, "status": base_status, "pins": pins, **payload})
+
+    callbacks = dict(
+        on_solution=on_solution,
+        checkpoint=write_checkpoint if checkpoint else None,
+        stop_policy=stop_policy,
+        on_phase=on_phase,
+        should_stop=should_stop,
+    )
+    run = None
+    if record_run:
+        run = start_solver_run(semester, instance, params, batch_id=batch_id, cache_key=cache_key, **run_options)
+        report["solver_run"] = run.pk
+    if export_model and not draft:
+        params.export_model_path = os.path.join(
+            settings.SCHEDULER_MODEL_DIR, model_file_name(run.pk if run else None, instance.input_hash()))
+
+    try:
+        if draft:
+            phase("draft", sections=len(instance.sections))
+            solution = construct_schedule(instance, top_k=top_k, pins=pins)
+        elif processes == 1:
+            solution = solve(instance, params, **callbacks)
         else:
-            objective_terms.append(is_tba * -TBA_PENALTY_NORMAL)
-        objective_terms.append(is_tba.Not() * REAL_ROOM_REWARD)
-
-    for t in tasks:
-        tid = t["task_id"]
-        if tid not in task_vars: continue
-        is_we = model.NewBoolVar(f"pen_we_{tid}")
-        model.Add(task_vars[tid]["day"] >= 5).OnlyEnforceIf(is_we)
-        model.Add(task_vars[tid]["day"] < 5).OnlyEnforceIf(is_we.Not())
-        objective_terms.append(is_we * t["dur"] * -WEEKEND_TIME_PENALTY_PER_MINUTE)
+            solution = solve_portfolio(instance, params, processes=processes or None, **callbacks)
+        report.update(solution.report)
+        report["incremental"] = incremental
+
+        schedules_to_create = []
+        if solution.feasible or solution.status == DRAFT_STATUS:
+            schedules_to_create = build_schedule_objects(semester, solution.entries, status=base_status, pins=pins)
+            if persist:
+                phase("persist", rows=len(schedules_to_create))
+                persist_started = time.time()
+                save_schedule_rows(
+                    semester, schedules_to_create,
+                    status=base_status,
+                    resolved_sections=solution.resolved_sections if incremental else None,
+                    active_sections=instance.sections,
+                )
+                # Without a new pool the previous run's candidates are stale
+                save_schedule_candidates(semester, solution.candidates, run=run)
+                report["persist_seconds"] = round(time.time() - persist_started, 3)
+    except Exception as e:
+        if run:
+            fail_solver_run(run, e)
+        raise
+
+    if run:
+        finish_solver_run(run, report, schedule_batch=schedule_batch_stamp(semester, base_status) if persist else None)
+    return schedules_to_create
+
+
+def reuse_cached_run(semester, instance, params, cached, status, report, batch_id=None, cache_key="", **options):
+    """Keeps the schedule of `cached` (same input and settings) instead of solving again."""
+    print(f"[Solver] Input and settings unchanged since run {cached.pk}. Keeping its schedule (use force to re-solve).")
+    report.update(
+        status=cached.status,
+        objective=cached.objective,
+        best_bound=cached.best_bound,
+        gap_percent=cached.gap_percent,
+        tasks=cached.tasks,
+        variables=cached.variables,
+        constraints=cached.constraints,
+        tba=(cached.details or {}).get("tba"),
+        cached_from=cached.pk,
+        incremental=params.incremental,
+    )
+    run = start_solver_run(semester, instance, params, batch_id=batch_id, cache_key=cache_key, **options)
+    report["solver_run"] = run.pk
+    finish_solver_run(run, report, schedule_batch=cached.schedule_batch)
+    return list(Schedule.objects.filter(semester=semester, status=status))
+
+
+# ----------------- Persistence -----------------
+def build_schedule_objects(semester, entries, status='active', pins=None):
+    """
+    Unsaved Schedule rows for solver entries
+    ({task_id, section, kind, start (minute of week), dur, instructor, room}).
+    pins: SolveParams.pins of the run; those rows keep their pin flags.
+    """
+    pins = pins or {}
+    section_objs = {s.sectionId: s for s in Section.objects.filter(
+        sectionId__in={e["section"] for e in entries}
+    ).select_related("subject")}
+    instructor_objs = {i.instructorId: i for i in Instructor.objects.filter(
+        instructorId__in={e["instructor"] for e in entries}
+    )}
+    room_objs = {r.roomId: r for r in Room.objects.filter(
+        roomId__in={e["room"] for e in entries if e["room"] is not None}
+    )}
+    weekday_names = DAYS
+    schedules_to_create = []
+
+    for e in entries:
+        sec_obj = section_objs.get(e["section"])
+        if sec_obj is None: continue
+        start_val = e["start"]
         
-        # --- Check End Time for Penalty ---
-        end_mod = model.NewIntVar(0, 1440, f"pen_end_{tid}")
-        model.AddModuloEquality(end_mod, task_vars[tid]["end"], 1440)
+        day_idx = start_val // 1440
+        min_day = start_val % 1440
+        h = min_day // 60
+        m = min_day % 60
         
-        is_eve = model.NewBoolVar(f"pen_eve_{tid}")
-        # Penalty triggers if class ends after 17:00 (1020)
-        model.Add(end_mod > 1020).OnlyEnforceIf(is_eve)
+        start_time = datetime(2000, 1, 1, h, m).time()
+        end_dt = datetime(2000, 1, 1, h, m) + timedelta(minutes=e["dur"])
+        end_time = end_dt.time()
+
+        instructor = instructor_objs.get(e["instructor"])
+        room = None if e["room"] is None else room_objs.get(e["room"])
         
-        is_wd = model.NewBoolVar(f"pen_wd_{tid}")
-        model.Add(task_vars[tid]["day"] <= 4).OnlyEnforceIf(is_wd)
-        is_wd_eve = model.NewBoolVar(f"pen_wd_eve_{tid}")
-        model.AddBoolAnd([is_wd, is_eve]).OnlyEnforceIf(is_wd_eve)
-        objective_terms.append(is_wd_eve * t["dur"] * -WEEKDAY_EVENING_PENALTY_PER_MINUTE)
+        end_min_val = end_dt.hour * 60 + end_dt.minute
+        cutoff_min = 17 * 60 
 
-    for d_idx in range(len(DAYS)): # Iterate Mon(0) to Sun(6)
+        is_weekend_bool = (day_idx >= 5)
         
-        # 1. Collect all tasks scheduled on this specific day
-        tasks_on_this_day = []
+        is_evening_bool = (end_min_val > cutoff_min)
         
-        for t in tasks:
-            tid = t["task_id"]
-            if tid not in task_vars: continue
-            
-            # Use the existing task_vars dictionary to get the Day Variable
-            t_day_var = task_vars[tid]["day"]
-            
-            # Create a helper boolean: "Is Task T assigned to Day D?"
-            is_on_d = model.NewBoolVar(f"t{tid}_is_d{d_idx}")
-            
-            # Link the boolean to the solver's day variable
-            model.Add(t_day_var == d_idx).OnlyEnforceIf(is_on_d)
-            model.Add(t_day_var != d_idx).OnlyEnforceIf(is_on_d.Not())
-            
-            # If on this day, add its duration to the list
-            tasks_on_this_day.append(is_on_d * t["dur"])
-            
-        # 2. Sum the total minutes for this Day
-        if tasks_on_this_day:
-            d_total = model.NewIntVar(0, WEEK_MINUTES * 100, f"day_usage_{d_idx}")
-            model.Add(d_total == sum(tasks_on_this_day))
-            
-            # --- OPTIMIZATION: Convert to Hours first ---
-            d_hours = model.NewIntVar(0, WEEK_MINUTES, f"day_hours_{d_idx}")
-            model.AddDivisionEquality(d_hours, d_total, 60)
-            
-            # 3. Square the HOURS (Quadratic Penalty)
-            d_squared = model.NewIntVar(0, WEEK_MINUTES*WEEK_MINUTES, f"day_sq_{d_idx}")
-            model.AddMultiplicationEquality(d_squared, [d_hours, d_hours])
-            
-            # 4. Apply Penalty
-            objective_terms.append(d_squared * -50)
-
-    # --- Solve ---
-    model.Maximize(sum(objective_terms))
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = time_limit_seconds
-    solver.parameters.num_search_workers = 3
-    solver.parameters.random_seed = 42
-    solver.parameters.log_search_progress = True
-    
-    print(f"[Solver] Starting solve...")
-    status = solver.Solve(model)
-    print(f"[Solver] Status: {solver.StatusName(status)}")
-
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        section_objs = {s.sectionId: s for s in Section.objects.filter(sectionId__in=sections)}
-        instructor_objs = {i.instructorId: i for i in Instructor.objects.filter(instructorId__in=instructors)}
-        room_objs = {r.roomId: r for r in Room.objects.filter(roomId__in=[r for r in rooms if r != "TBA"])}
-        weekday_names = DAYS
-        schedules_to_create = []
+        final_is_overtime = is_weekend_bool or is_evening_bool
+        pin = pins.get(e.get("task_id"), {})
+
+        schedules_to_create.append(Schedule(
+            subject=sec_obj.subject,
+            instructor=instructor,
+            section=sec_obj,
+            room=room,
+            semester=semester,
+            dayOfWeek=weekday_names[day_idx],
+            startTime=start_time,
+            endTime=end_time,
+            scheduleType=e["kind"],
+            isOvertime=final_is_overtime,
+            status=status,
+            pinTime="start" in pin,
+            pinRoom="room" in pin,
+            pinInstructor="instr" in pin,
+        ))
+    return schedules_to_create
+
+
+def save_schedule_rows(semester, schedules_to_create, status='active', resolved_sections=None, active_sections=None):
+    """
+    Full run (resolved_sections=None): archive every row with `status` and save the new ones.
+    Incremental run: archive only the re-solved sections (and sections no longer in
+    active_sections) and save the delta.
+    """
+    with transaction.atomic():
+        base_rows = Schedule.objects.filter(semester=semester, status=status)
+        if resolved_sections is None:
+            base_rows.update(status='archived')
+        else:
+            base_rows.filter(section_id__in=resolved_sections).update(status='archived')
+            if active_sections is not None:
+                base_rows.exclude(section_id__in=active_sections).update(status='archived')
+        Schedule.objects.bulk_create(schedules_to_create, ignore_conflicts=True)
 
-        for t in tasks:
-            tid = t["task_id"]
-            if tid not in task_vars: continue
-            sec_obj = section_objs[t["section"]]
-            i_idx = solver.Value(task_vars[tid]["instr"])
-            r_idx = solver.Value(task_vars[tid]["room"])
-            start_val = solver.Value(task_vars[tid]["start"])
-            
-            day_idx = start_val // 1440
-            min_day = start_val % 1440
-            h = min_day // 60
-            m = min_day % 60
-            
-            start_time = datetime(2000, 1, 1, h, m).time()
-            end_dt = datetime(2000, 1, 1, h, m) + timedelta(minutes=t["dur"])
-            end_time = end_dt.time()
-
-            instructor = instructor_objs.get(instructors[i_idx])
-            room = None if r_idx == TBA_ROOM_IDX else room_objs.get(rooms[r_idx])
-            
-            end_min_val = end_dt.hour * 60 + end_dt.minute
-            cutoff_min = 17 * 60 
-
-            is_weekend_bool = (day_idx >= 5)
-            
-            is_evening_bool = (end_min_val > cutoff_min)
-            
-            final_is_overtime = is_weekend_bool or is_evening_bool
-
-            schedules_to_create.append(Schedule(
-                subject=sec_obj.subject,
-                instructor=instructor,
-                section=sec_obj,
-                room=room,
-                semester=semester,
-                dayOfWeek=weekday_names[day_idx],
-                startTime=start_time,
-                endTime=end_time,
-                scheduleType=t["kind"],
-                isOvertime=final_is_overtime,
-                status='active'
-            ))
-
-        with transaction.atomic():
-            Schedule.objects.filter(semester=semester, status='active').update(status='archived')
-            Schedule.objects.bulk_create(schedules_to_create, ignore_conflicts=True)
-            print(f"[Solver] Saved {len(schedules_to_create)} schedules.")
-
-        return schedules_to_create
+    if resolved_sections is None:
+        print(f"[Solver] Saved {len(schedules_to_create)} schedules.")
     else:
-        print("[Solver] No feasible solution found.")
-        return []
+        print(f"[Solver] Incremental: replaced {len(schedules_to_create)} schedules "
+              f"for {len(resolved_sections)} sections.")
+
+
+def save_schedule_candidates(semester, candidates, run=None):
+    """
+    Replaces the semester's candidate schedules with those of the latest run
+    (none when the run kept no pool).
+    """
+    with transaction.atomic():
+        ScheduleCandidate.objects.filter(semester=semester).delete()
+        ScheduleCandidate.objects.bulk_create([
+            ScheduleCandidate(
+                solver_run=run,
+                semester=semester,
+                rank=c["rank"],
+                objective=c["objective"],
+                distance=c["distance"],
+                tba=c["tba"],
+                breakdown=c["breakdown"],
+                entries=c["entries"],
+            )
+            for c in candidates
+        ])
+    if candidates:
+        print(f"[Solver] Saved {len(candidates)} candidate schedules.")
+
+
+def apply_schedule_candidate(candidate):
+    """Makes a candidate the active draft (the current draft is archived). Returns the row count."""
+    pins = (candidate.solver_run.params or {}).get("pins") if candidate.solver_run else None
+    schedules = build_schedule_objects(candidate.semester, candidate.entries, status='active', pins=pins)
+    save_schedule_rows(candidate.semester, schedules, status='active')
+    return len(schedules)
+
 
 def generateSchedule():
     return solve_schedule_for_semester(time_limit_seconds=600)
\ No newline at end of file
@@ -0,0 +1,41 @@
+# scheduler/symmetry.py
+from collections import defaultdict
+
+# Interchangeable sections and rooms. Any schedule can be permuted within a
+# class without changing feasibility or the objective, so the solver only
+# needs to search one ordering of each class (see SolveParams.symmetry_breaking).
+
+
+def section_classes(instance, domains, exclude=()):
+    """
+    Groups of sections the model cannot tell apart: same block group (so the
+    same group NoOverlap and GenEd blocks), lecture and lab minutes, students,
+    room priority, match scores and instructor domain.
+
+    domains: {section_id: [instructor_idx, ...]} as given to the model.
+    exclude: sections that must keep their own identity (e.g. fixed ones).
+    Returns lists of 2+ section ids, in section order.
+    """
+    classes = defaultdict(list)
+    for pos, sec_id in enumerate(instance.sections):
+        if sec_id in exclude:
+            continue
+        key = (
+            instance.section_group[pos],
+            instance.section_lecture_min[pos],
+            instance.section_lab_min[pos],
+            instance.section_students[pos],
+            instance.section_priority[pos],
+            tuple(sorted(instance.matches[pos])),
+            tuple(sorted(domains.get(sec_id, ()))),
+        )
+        classes[key].append(sec_id)
+    return [members for members in classes.values() if len(members) > 1]
+
+
+def room_classes(instance):
+    """Groups of real rooms with the same type and capacity, in room order."""
+    classes = defaultdict(list)
+    for r_idx in range(instance.tba_room_idx):
+        classes[(instance.room_types[r_idx], instance.room_capacities[r_idx])].append(r_idx)
+    return [members for members in classes.values() if len(members) > 1]
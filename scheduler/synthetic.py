@@ -0,0 +1,149 @@
+# scheduler/synthetic.py
+import random
+
+from scheduler.instance import ProblemInstance
+
+# Synthetic semesters for benchmarking, without touching the database.
+# Same seed and parameters -> same instance.
+
+GENERATOR_DEFAULTS = {
+    "sections": 120,
+    "instructors": 40,
+    "rooms": 20,
+    "lab_ratio": 0.4,        # share of sections with a lab part
+    "gened_density": 0.2,    # share of each block group's weekday 8-17 time taken by GenEd
+    "groups": 16,            # block groups (year level x letter, e.g. "2C")
+    "seed": 1,
+}
+
+EMPLOYMENT_MIX = (
+    # type, share, normal minutes, overload minutes
+    ("permanent", 0.5, 18 * 60, 12 * 60),
+    ("part-time", 0.3, 15 * 60, 0),
+    ("overload", 0.2, 0, 12 * 60),
+)
+
+GENED_BLOCK_MINUTES = (90, 120)
+
+
+def _group_names(count):
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    per_year = max(1, -(-count // 4))
+    return [f"{year}{letters[i]}" for year in range(1, 5) for i in range(per_year)][:count]
+
+
+def generate_solver_data(sections=GENERATOR_DEFAULTS["sections"],
+                         instructors=GENERATOR_DEFAULTS["instructors"],
+                         rooms=GENERATOR_DEFAULTS["rooms"],
+                         lab_ratio=GENERATOR_DEFAULTS["lab_ratio"],
+                         gened_density=GENERATOR_DEFAULTS["gened_density"],
+                         groups=GENERATOR_DEFAULTS["groups"],
+                         seed=GENERATOR_DEFAULTS["seed"]):
+    """
+    A random semester in the dict layout of data_extractors.get_solver_data.
+
+    Sections are spread round-robin over the block groups; lab sections get a
+    2h lecture and a 3h lab, the rest a 2h or 3h lecture. Each section is matched
+    to 3-5 instructors. Rooms are split into lab and lecture rooms by lab_ratio,
+    plus the TBA room.
+    """
+    rng = random.Random(seed)
+
+    # -------------------- Instructors --------------------
+    instructor_ids = [f"SYN{i:04d}" for i in range(1, instructors + 1)]
+    instructor_caps = {}
+    instructor_employment = {}
+    permanent = []
+    for i_id in instructor_ids:
+        roll = rng.random()
+        for emp_type, share, normal_min, overload_min in EMPLOYMENT_MIX:
+            if roll < share:
+                break
+            roll -= share
+        instructor_caps[i_id] = {"normal_limit_min": normal_min, "overload_limit_min": overload_min}
+        instructor_employment[i_id] = emp_type
+        if emp_type == "permanent":
+            permanent.append(i_id)
+
+    # -------------------- Sections --------------------
+    group_names = _group_names(max(1, groups))
+    section_ids = list(range(1, sections + 1))
+    section_to_group = {}
+    section_hours = {}
+    section_num_students = {}
+    section_priority_map = {}
+    matches = {}
+    for pos, sec_id in enumerate(section_ids):
+        section_to_group[sec_id] = group_names[pos % len(group_names)]
+        has_lab = rng.random() < lab_ratio
+        lecture_min = 120 if has_lab else rng.choice((120, 180))
+        section_hours[sec_id] = {
+            "lecture_min": lecture_min,
+            "lab_min": 180 if has_lab else 0,
+            "units": 3,
+        }
+        section_num_students[sec_id] = rng.randint(25, 45)
+        section_priority_map[sec_id] = rng.random() < 0.1
+        matches[sec_id] = tuple(
+            (i_id, round(rng.uniform(0.3, 1.0), 3))
+            for i_id in rng.sample(instructor_ids, min(len(instructor_ids), rng.randint(3, 5)))
+        )
+
+    # -------------------- Rooms --------------------
+    lab_rooms = max(1, round(rooms * lab_ratio)) if lab_ratio > 0 else 0
+    rooms_list = list(range(1, rooms + 1))
+    room_types = {}
+    room_capacities = {}
+    for idx in range(rooms):
+        room_types[idx] = "laboratory" if idx < lab_rooms else "lecture"
+        room_capacities[idx] = rng.choice((30, 35, 40, 45, 50))
+    rooms_list.append("TBA")
+    tba_idx = len(rooms_list) - 1
+    room_types[tba_idx] = "universal"
+    room_capacities[tba_idx] = 999999
+
+    # -------------------- GenEd blocks --------------------
+    gened_blocks = []
+    for group in group_names:
+        budget = gened_density * 5 * 9 * 60
+        taken = {d: [] for d in range(5)}
+        attempts = 0
+        while budget > 0 and attempts < 200:
+            attempts += 1
+            length = rng.choice(GENED_BLOCK_MINUTES)
+            day = rng.randrange(5)
+            start = rng.randrange(8 * 60, 17 * 60 - length + 1, 30)
+            end = start + length
+            if any(start < e and s < end for s, e in taken[day]):
+                continue
+            taken[day].append((start, end))
+            gened_blocks.append((day, start, end, group))
+            budget -= length
+
+    return {
+        "instructors": tuple(instructor_ids),
+        "sections": tuple(section_ids),
+        "gened_blocks": tuple(gened_blocks),
+        "section_to_group": section_to_group,
+        "rooms": tuple(rooms_list),
+        "room_types": room_types,
+        "room_capacities": room_capacities,
+        "instructor_index": {i_id: idx for idx, i_id in enumerate(instructor_ids)},
+        "section_priority_map": section_priority_map,
+        "section_num_students": section_num_students,
+        "instructor_caps": instructor_caps,
+        "section_hours": section_hours,
+        "matches": matches,
+        "lecture_lab_pairs": (),
+        "permanent_instructors": tuple(permanent),
+        "non_permanent_instructors": tuple(i for i in instructor_ids if i not in permanent),
+        "instructor_employment": instructor_employment,
+        "TBA_ROOM_IDX": tba_idx,
+    }
+
+
+def generate_instance(**params):
+    """generate_solver_data packed into a ProblemInstance named after its parameters."""
+    options = {**GENERATOR_DEFAULTS, **params}
+    name = "synthetic " + " ".join(f"{k}={v}" for k, v in options.items())
+    return ProblemInstance.from_solver_data(generate_solver_data(**options), semester_id=None, semester_name=name)
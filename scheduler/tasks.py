@@ -4,11 +4,14 @@ from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from scheduling.models import Semester
 from scheduler.models import SchedulerProgress, SchedulerSettings 
+from scheduler.progress import ProgressReporter, checkpoint_saver
+from scheduler.callbacks import StopPolicy
+from scheduler.solver import solve_schedule_for_semester
+from scheduler.solution_pool import POOL_SIZE
 from django.core.cache import cache
-import subprocess, sys
 
 @shared_task(bind=True)
-def run_scheduler_task(self, batch_id=None):
+def run_scheduler_task(self, batch_id=None, incremental=False, draft=False, force=False):
     channel_layer = get_channel_layer()
     
     try:
@@ -19,6 +22,8 @@ def run_scheduler_task(self, batch_id=None):
     progress.task_id = self.request.id
     progress.status = "running"
     progress.message = "Starting scheduler..."
+    progress.cancel_requested = False
+    progress.details = {}
     progress.save()
 
     async_to_sync(channel_layer.group_send)(
@@ -30,12 +35,10 @@ def run_scheduler_task(self, batch_id=None):
         settings_obj = SchedulerSettings.objects.first()
         mins = settings_obj.time_limit_minutes if settings_obj else 60
     except:
+        settings_obj = None
         mins = 60
 
     secs = mins * 60
-    
-    lock_id = f"scheduler_lock_{batch_id}"
-    cache.set(lock_id, "running", timeout=secs + 300)
 
     semester = Semester.objects.filter(isActive=True).first()
     if not semester:
@@ -50,67 +53,74 @@ def run_scheduler_task(self, batch_id=None):
         )
         return
 
+    # Held for the whole run so startScheduler refuses a second one
+    lock_id = f"scheduler_lock_{semester.semesterId}"
+    cache.set(lock_id, "running", timeout=secs + 300)
+
+    reporter = ProgressReporter(batch_id, time_limit_seconds=secs)
+    report = {}
+
     try:
-        process = subprocess.Popen(
-            [
-                sys.executable, "manage.py", "test_scheduler", 
-                str(semester.pk), 
-                "--time", str(secs)
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+        # Solved in this worker process: no manage.py subprocess, no stdout parsing
+        solve_schedule_for_semester(
+            semester,
+            time_limit_seconds=secs,
+            hint_batch="latest",
+            incremental=incremental,
+            draft=draft,
+            force=force,
+            export_model=settings_obj.export_models if settings_obj else False,
+            construction_seed=settings_obj.construction_seed if settings_obj else False,
+            report=report,
+            stop_policy=StopPolicy.from_settings(settings_obj),
+            on_phase=reporter.phase,
+            on_solution=reporter.solution,
+            checkpoint=checkpoint_saver(batch_id),
+            should_stop=reporter.is_cancelled,
+            processes=settings_obj.solver_processes if settings_obj else 1,
+            symmetry_breaking=settings_obj.symmetry_breaking if settings_obj else False,
+            pool_size=settings_obj.solution_pool_size if settings_obj else POOL_SIZE,
+            lexicographic=settings_obj.lexicographic_objective if settings_obj else False,
+            batch_id=batch_id,
         )
 
-        while True:
-            line = process.stdout.readline()
-            if not line and process.poll() is not None:
-                break
-            
-            if line:
-                line = line.strip()
-                # Check cancellation
-                if cache.get(lock_id) != "running":
-                    process.terminate()
-                    progress.status = "stopped"
-                    progress.message = "Scheduler stopped by user."
-                    progress.add_log("🛑 STOP signal received. Terminating process...")
-                    progress.save()
-                    async_to_sync(channel_layer.group_send)(
-                        f"scheduler_{batch_id}",
-                        {"type": "progress.update", "data": {"status": "stopped", "message": "Scheduler stopped by user."}},
-                    )
-                    return
-
-                try:
-                    refreshed = SchedulerProgress.objects.get(batch_id=batch_id)
-                except SchedulerProgress.DoesNotExist:
-                    break
-                    
-                refreshed.add_log(line)
-                async_to_sync(channel_layer.group_send)(
-                    f"scheduler_{batch_id}",
-                    {"type": "progress.update", "data": {"status": "running", "message": line}},
-                )
+        progress.refresh_from_db()
+        progress.checkpoint = None
+        progress.progress = 100
 
-        process.wait()
-        
-        if process.returncode != 0:
-            raise Exception("Scheduler script failed (check logs above).")
+        if report.get("stopped_by") == "cancelled":
+            progress.status = "stopped"
+            progress.message = "🛑 Scheduler stopped by user. Best schedule found so far was saved." if report.get("objective") is not None else "🛑 Scheduler stopped by user."
+        elif report.get("cached_from"):
+            progress.status = "done"
+            progress.message = (f"✅ Nothing changed since run #{report['cached_from']}. Kept its schedule "
+                                f"(tick \"Re-solve even if unchanged\" to solve again).")
+        elif draft:
+            progress.status = "done"
+            construction = report.get("construction") or {}
+            progress.message = (f"✅ Quick draft saved! {construction.get('forced', 0)} classes placed with a conflict, "
+                                f"{construction.get('tba', 0)} without a room. Run the full solver to polish it.")
+        elif report.get("objective") is None:
+            raise Exception(f"No feasible schedule found (solver status: {report.get('status', 'unknown')}).")
+        else:
+            progress.status = "done"
+            progress.message = "✅ Scheduling completed!"
+            if report.get("stopped_by") and report["stopped_by"] != "time_limit":
+                progress.message += f" (stopped early: {report['stopped_by']})"
 
-        progress.status = "done"
-        progress.message = "✅ Scheduling completed!"
+        progress.details = {**progress.details, "phase": "finished", "summary": {
+            k: report.get(k) for k in ("status", "objective", "stopped_by", "solutions", "build_seconds", "solve_seconds", "tba")
+        }}
         progress.add_log(progress.message)
         progress.save()
 
         async_to_sync(channel_layer.group_send)(
             f"scheduler_{batch_id}",
-            {"type": "progress.update", "data": {"status": "done", "message": progress.message}},
+            {"type": "progress.update", "data": {"status": progress.status, "message": progress.message, "details": progress.details}},
         )
 
     except Exception as e:
+        progress.refresh_from_db()
         progress.status = "error"
         progress.message = f"❌ Error: {str(e)}"
         progress.add_log(progress.message)
@@ -118,4 +128,6 @@ def run_scheduler_task(self, batch_id=None):
         async_to_sync(channel_layer.group_send)(
             f"scheduler_{batch_id}",
             {"type": "progress.update", "data": {"status": "error", "message": str(e)}},
-        )
\ No newline at end of file
+        )
+    finally:
+        cache.delete(lock_id)
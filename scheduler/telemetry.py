@@ -0,0 +1,79 @@
+# scheduler/telemetry.py
+from django.utils import timezone
+
+from scheduler.models import SolverRun
+
+# SolveParams fields that are per-run data rather than settings
+_PARAM_DATA_FIELDS = ("hints", "incumbent", "previous_rows")
+
+
+def start_solver_run(semester, instance, params, batch_id=None, cache_key="", **options):
+    """Creates the SolverRun row for a solve that is about to start."""
+    run_params = {k: v for k, v in params.to_dict().items() if k not in _PARAM_DATA_FIELDS}
+    run_params["hinted_tasks"] = len(params.hints)
+    run_params.update(options)
+    return SolverRun.objects.create(
+        semester=semester,
+        batch_id=batch_id,
+        input_hash=instance.input_hash(),
+        cache_key=cache_key,
+        mode="two_phase" if params.two_phase else "monolithic",
+        sections=len(instance.sections),
+        instructors=len(instance.instructors),
+        rooms=len(instance.rooms) - 1,
+        params=run_params,
+    )
+
+
+def finish_solver_run(run, report, schedule_batch=None):
+    """
+    Copies the solver report (see engine.solve / solve_schedule_for_semester)
+    onto the run; schedule_batch is result_cache.schedule_batch_stamp of the
+    rows it left.
+    """
+    run.status = report.get("status", "UNKNOWN")
+    run.tasks = report.get("tasks") or 0
+    run.variables = report.get("variables") or 0
+    run.constraints = report.get("constraints") or 0
+    run.extract_seconds = report.get("extract_seconds")
+    run.build_seconds = report.get("build_seconds")
+    run.solve_seconds = report.get("solve_seconds")
+    run.persist_seconds = report.get("persist_seconds")
+    run.first_feasible_seconds = report.get("first_feasible_seconds")
+    run.objective = report.get("objective")
+    run.best_bound = report.get("best_bound")
+    run.gap_percent = report.get("gap_percent")
+    run.solutions = report.get("solutions") or 0
+    run.stopped_by = report.get("stopped_by") or ""
+    run.schedule_batch = schedule_batch
+    if report.get("portfolio"):
+        run.mode = "portfolio"
+    elif report.get("cached_from"):
+        run.mode = "cached"
+    elif report.get("mode") == "draft":
+        run.mode = "draft"
+    run.details = {
+        "curve": [[e["wall_time"], e["objective"], e["best_bound"]] for e in report.get("history", [])],
+        "model_stats": report.get("model_stats"),
+        "neighborhood": report.get("neighborhood"),
+        "portfolio": report.get("portfolio"),
+        "pool": report.get("pool"),
+        "tba": report.get("tba"),
+        "families": report.get("families"),
+        "objective_breakdown": report.get("objective_breakdown"),
+        "objective_terms": report.get("objective_terms"),
+        "stages": report.get("stages"),
+        "construction": report.get("construction"),
+        "cached_from": report.get("cached_from"),
+        "model_file": report.get("model_file"),
+    }
+    run.finished_at = timezone.now()
+    run.save()
+    return run
+
+
+def fail_solver_run(run, error):
+    run.status = "ERROR"
+    run.details = {**(run.details or {}), "error": str(error)}
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "details", "finished_at"])
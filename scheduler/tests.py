@@ -1,3 +1,122 @@
-from django.test import TestCase
+from dataclasses import replace
+from datetime import time
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from scheduler.engine import build_tasks, solve
+from scheduler.incremental import find_changed_sections
+from scheduler.instance import SolveParams
+from scheduler.pins import resolve_pins
+from scheduler.portfolio import solve_portfolio
+from scheduler.precheck import analyze_instance
+from scheduler.synthetic import generate_instance
+from scheduler.warm_start import build_schedule_hints
+
+
+def small_instance(**params):
+    return generate_instance(**{"sections": 8, "instructors": 6, "rooms": 4, "groups": 2, **params})
+
+
+class PortfolioTests(SimpleTestCase):
+    def solve(self, pool_size):
+        params = SolveParams(time_limit_seconds=10, num_workers=1, log_search_progress=False, pool_size=pool_size)
+        return solve_portfolio(small_instance(), params, processes=2, threads_per_process=1)
+
+    def test_two_processes_fill_the_candidate_pool(self):
+        solution = self.solve(pool_size=3)
+        self.assertTrue(solution.feasible)
+        self.assertEqual(solution.report["portfolio"]["processes"], 2)
+        self.assertGreaterEqual(len(solution.candidates), 1)
+        self.assertEqual(solution.candidates[0]["objective"], solution.objective)
+        self.assertEqual(solution.report["pool"]["size"], 3)
+
+    def test_two_processes_without_pool(self):
+        solution = self.solve(pool_size=0)
+        self.assertTrue(solution.feasible)
+        self.assertEqual(solution.candidates, [])
+        self.assertNotIn("pool", solution.report)
+
+
+class SolutionPoolTests(SimpleTestCase):
+    def test_lexicographic_pool_keeps_the_returned_schedule(self):
+        params = SolveParams(time_limit_seconds=10, num_workers=1, log_search_progress=False,
+                             pool_size=3, lexicographic=True)
+        solution = solve(small_instance(), params)
+        self.assertTrue(solution.feasible)
+        saved = [c for c in solution.candidates if c["entries"] == solution.entries]
+        self.assertEqual(len(saved), 1)
+        self.assertEqual(saved[0]["objective"], solution.objective)
+        self.assertEqual(saved[0]["breakdown"], solution.report["objective_breakdown"])
+
+
+class PinTests(SimpleTestCase):
+    TUE, WED, FRI = 1440, 2880, 5760
+
+    def conflicting_pins(self):
+        # Sections 1, 3, 5, 7 are in block group 1A, the others in 2A
+        return {
+            "1_LECT": {"start": self.TUE + 480, "room": 2, "instr": 3},
+            "2_LECT": {"start": self.TUE + 480, "room": 2},          # room held by 1_LECT
+            "3_LECT_A": {"start": self.TUE + 540},                   # 1A is in 1_LECT then
+            "5_LECT_A": {"start": self.WED + 930, "instr": 3},
+            "5_LECT_B": {"start": self.WED + 1020},                  # too close to 5_LECT_A
+            "6_LECT": {"start": self.FRI + 540, "instr": 1},         # instructor 1 has no normal load
+            "6_LAB": {"instr": 1},
+            "7_LECT_A": {"start": 540},                              # Monday GenEd block of 1A
+            "8_LECT": {"start": self.WED + 900, "instr": 3},         # instructor 3 teaches 5_LECT_A
+        }
+
+    def test_conflicting_pins_are_dropped(self):
+        kept, dropped = resolve_pins(small_instance(), self.conflicting_pins())
+        self.assertEqual({(d["task_id"], d["part"]) for d in dropped}, {
+            ("2_LECT", "room"), ("3_LECT_A", "time"), ("5_LECT_B", "time"), ("6_LECT", "instructor"),
+            ("6_LAB", "instructor"), ("7_LECT_A", "time"), ("8_LECT", "time"),
+        })
+        self.assertEqual(kept["1_LECT"], {"start": self.TUE + 480, "room": 2, "instr": 3})
+        self.assertEqual(kept["8_LECT"], {"instr": 3})
+        self.assertNotIn("6_LAB", kept)
+
+    def test_resolved_pins_are_feasible(self):
+        instance = small_instance()
+        params = SolveParams(time_limit_seconds=10, num_workers=1, log_search_progress=False)
+        self.assertEqual(solve(instance, replace(params, pins=self.conflicting_pins())).status, "INFEASIBLE")
+
+        kept, _dropped = resolve_pins(instance, self.conflicting_pins())
+        solution = solve(instance, replace(params, pins=kept))
+        self.assertTrue(solution.feasible)
+        entries = {e["task_id"]: e for e in solution.entries}
+        for task_id, pin in kept.items():
+            if "start" in pin:
+                self.assertEqual(entries[task_id]["start"], pin["start"])
+
+    def test_precheck_warns_about_dropped_pins(self):
+        verdict = analyze_instance(small_instance(), pins=self.conflicting_pins())
+        self.assertTrue(verdict.ok)
+        self.assertEqual(verdict.stats["pins"]["dropped"], 7)
+        self.assertIn("pins", [f.check for f in verdict.warnings])
+
+
+class WarmStartTests(SimpleTestCase):
+    def rows(self, room_id):
+        return [
+            {"section_id": 1, "scheduleType": "lecture", "dayOfWeek": "Tuesday", "startTime": time(8, 0),
+             "instructor_id": "SYN0004", "room_id": room_id},
+            {"section_id": 2, "scheduleType": "lecture", "dayOfWeek": "Tuesday", "startTime": time(8, 0),
+             "instructor_id": "SYN0001", "room_id": 4},
+        ]
+
+    def test_deleted_room_is_not_a_tba_hint(self):
+        data = small_instance().solver_data
+        hints = build_schedule_hints(self.rows(room_id=99), data)
+        self.assertIsNone(hints["1_LECT"]["room"])
+        self.assertEqual(hints["2_LECT"]["room"], 3)
+        self.assertEqual(build_schedule_hints(self.rows(room_id=None), data)["1_LECT"]["room"], data["TBA_ROOM_IDX"])
+
+    def test_deleted_room_marks_the_section_changed(self):
+        instance = small_instance()
+        tasks = [t for t in build_tasks(instance) if t["section"] in (1, 2)]
+        changed = find_changed_sections(
+            tasks, build_schedule_hints(self.rows(room_id=99), instance.solver_data), {1: 1, 2: 1},
+            instance.solver_data, slot_ok=lambda t, start: True, room_ok=lambda t, r_idx: True,
+        )
+        self.assertEqual(changed, {1})
@@ -12,6 +12,7 @@ urlpatterns = [
     path("start/", views.startScheduler, name="startScheduler"),
     path("stop/", views.stopScheduler, name="stopScheduler"),
     path("status/", views.schedulerStatus, name="schedulerStatus"),
+    path("runs/", views.solverRuns, name="solverRuns"),
 
     # Instructor Workload Export(excel and preview)
     path('instructor/workload/preview/', views.previewWorkload, name='previewWorkload'),
@@ -21,6 +22,7 @@ urlpatterns = [
     path('sectionBlockManager/', views.sectionBlockScheduler, name='sectionBlockScheduler'),
     path('api/getInstructorConflicts/', views.getInstructorConflicts, name='getInstructorConflicts'),
     path('api/updateScheduleSlot/', views.updateScheduleSlot, name='updateScheduleSlot'),
+    path('api/setSchedulePin/', views.setSchedulePin, name='setSchedulePin'),
     path('roomManager/', views.roomScheduler, name='roomScheduler'),
     path('instructorLoadManager/', views.instructorLoad, name='instructorLoad'),
     path('api/getInstructorLoadStats/', views.getInstructorLoadStats, name='getInstructorLoadStats'),
@@ -9,10 +9,13 @@ from django.contrib.auth.decorators import login_required
 from collections import defaultdict
 from django.http import JsonResponse
 from scheduler.tasks import run_scheduler_task
-from scheduler.models import SchedulerProgress, SchedulerSettings
+from scheduler.models import SchedulerProgress, SchedulerSettings, SolverRun, ScheduleCandidate
+from scheduler.solver import build_schedule_objects, apply_schedule_candidate
+from scheduler.progress import materialize_checkpoint
+from scheduler.diagnostics import precheck_semester
 from celery import current_app
 import uuid
-import os, signal
+import os
 from django.contrib import messages
 from datetime import datetime, time, timedelta
 from django.utils import timezone
@@ -88,6 +91,16 @@ def revertFinalizedSchedule(request, semester_id):
     return redirect(reverse('scheduleOutput'))
 
 
+def get_schedule_candidate(semester_id, batch_key):
+    """The ScheduleCandidate behind a 'candidate-<id>' batch key, or None."""
+    candidate_id = batch_key[len('candidate-'):]
+    if not candidate_id.isdigit():
+        return None
+    return ScheduleCandidate.objects.filter(
+        pk=candidate_id, semester__semesterId=semester_id
+    ).select_related('semester').first()
+
+
 @login_required
 @has_role('deptHead')
 def revertSchedule(request):
@@ -107,6 +120,18 @@ def revertSchedule(request):
         if finalized_run_exists:
             messages.error(request, "A schedule is currently **FINALIZED**. Please unlock it first.")
             return redirect(reverse('scheduleOutput') + f'?semester={semester_id}&batch_key=finalized')
+
+        if batch_key.startswith('candidate-'):
+            candidate = get_schedule_candidate(semester_id, batch_key)
+            if candidate is None:
+                messages.error(request, "The selected candidate schedule was not found.")
+            else:
+                try:
+                    saved = apply_schedule_candidate(candidate)
+                    messages.success(request, f"Candidate #{candidate.rank} is now the active draft ({saved} classes).")
+                except Exception as e:
+                    messages.error(request, f"Error while applying the candidate: {e}")
+            return redirect(reverse('scheduleOutput') + f'?semester={semester_id}&batch_key=active')
         
         try:
             dt_obj = datetime.fromisoformat(batch_key)
@@ -183,10 +208,36 @@ def scheduleOutput(request):
         for batch_time in archived_batch_times
     ]
 
+    # Distinct schedules kept by the latest run (rank 1 is the active draft)
+    candidates = list(ScheduleCandidate.objects.filter(semester__semesterId=semester_id).defer('entries'))
+    candidate_batches = [
+        {'key': c.batch_key, 'label': f"Candidate #{c.rank}: {c.objective:,.0f}"
+                                      + (" (saved draft)" if c.rank == 1 else f", {c.distance} classes differ")}
+        for c in candidates
+    ]
+    selected_candidate = None
+    candidate_breakdown = []
+
     schedules = Schedule.objects.none() 
     current_status = 'N/A'
     
-    if batch_key == 'finalized' and finalized_exists:
+    if batch_key.startswith('candidate-'):
+        selected_candidate = get_schedule_candidate(semester_id, batch_key)
+        if selected_candidate is None:
+            messages.error(request, "That candidate schedule no longer exists. Showing the active draft.")
+            return redirect(reverse('scheduleOutput') + f'?semester={semester_id}&batch_key=active')
+
+        # Preview only: unsaved rows built from the stored solver entries
+        schedules = build_schedule_objects(selected_candidate.semester, selected_candidate.entries)
+        current_status = next(b['label'] for b in candidate_batches if b['key'] == batch_key)
+
+        best = candidates[0].breakdown if candidates else {}
+        candidate_breakdown = [
+            {'term': term.replace('_', ' ').title(), 'value': value, 'delta': value - best.get(term, 0)}
+            for term, value in selected_candidate.breakdown.items()
+        ]
+
+    elif batch_key == 'finalized' and finalized_exists:
         schedules = Schedule.objects.filter(semester__semesterId=semester_id, status='finalized')
         current_status = 'Finalized Schedule (Locked)'
     
@@ -235,11 +286,12 @@ def scheduleOutput(request):
             messages.error(request, "Invalid schedule batch key provided. Falling back to active draft.")
             return redirect(reverse('scheduleOutput') + f'?semester={semester_id}&batch_key=active')
     
-    schedules = schedules.select_related(
-        'instructor', 'room'
-    ).prefetch_related(
-        'instructor__userlogin_set__user'
-    ).order_by('dayOfWeek', 'startTime')
+    if selected_candidate is None:
+        schedules = schedules.select_related(
+            'instructor', 'room'
+        ).prefetch_related(
+            'instructor__userlogin_set__user'
+        ).order_by('dayOfWeek', 'startTime')
     
     DAYS_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     
@@ -316,14 +368,17 @@ def scheduleOutput(request):
         "schedules": schedules,
         "semesters": semesters,
         "archived_batches": archived_batches,
+        "candidate_batches": candidate_batches,
+        "selected_candidate": selected_candidate,
+        "candidate_breakdown": candidate_breakdown,
         "current_semester": current_semester,
         "room_usage_data": ordered_room_usage,
         "instructor_load_data": ordered_instructor_load,
         "days_order": DAYS_ORDER, 
         
-        "can_finalize": (batch_key == 'active' and schedules.exists() and not finalized_exists),
+        "can_finalize": (batch_key == 'active' and bool(schedules) and not finalized_exists),
         "is_finalized": current_status.startswith('Finalized'),
-        "can_revert": (batch_key not in ['active', 'finalized', 'none', 'N/A']) and schedules.exists(), 
+        "can_revert": (batch_key not in ['active', 'finalized', 'none', 'N/A']) and bool(schedules), 
     }
     return render(request, "scheduler/scheduleOutput.html", context)
 
@@ -509,6 +564,69 @@ def instructorScheduleView(request):
 def schedulerDashboard(request):
     settings, created = SchedulerSettings.objects.get_or_create(id=1)
     
+    if request.method == "POST" and request.POST.get('form_type') == 'stop_policy':
+        def parse_optional(name, cast):
+            raw = (request.POST.get(name) or "").strip()
+            return cast(raw) if raw else None
+
+        try:
+            settings.stop_no_improvement_seconds = parse_optional('stop_no_improvement_seconds', int)
+            settings.stop_gap_percent = parse_optional('stop_gap_percent', float)
+            settings.stop_objective_target = parse_optional('stop_objective_target', float)
+        except ValueError:
+            messages.error(request, "Invalid early-stop value. Please enter numbers only.")
+            return redirect('schedulerDashboard')
+
+        settings.save()
+        messages.success(request, "✅ Early-stop rules updated.")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'solver_processes':
+        try:
+            settings.solver_processes = int(request.POST.get('solver_processes') or 1)
+        except ValueError:
+            messages.error(request, "Invalid number of solver processes.")
+            return redirect('schedulerDashboard')
+
+        settings.save()
+        messages.success(request, f"✅ Solver processes set to {settings.solver_processes or 'auto'}.")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'solution_pool_size':
+        try:
+            settings.solution_pool_size = max(1, int(request.POST.get('solution_pool_size') or 1))
+        except ValueError:
+            messages.error(request, "Invalid number of candidate schedules.")
+            return redirect('schedulerDashboard')
+
+        settings.save()
+        messages.success(request, f"✅ Runs now keep {settings.solution_pool_size} candidate schedule(s).")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'lexicographic_objective':
+        settings.lexicographic_objective = request.POST.get('lexicographic_objective') == 'on'
+        settings.save()
+        messages.success(request, f"✅ Objective mode set to {'staged (lexicographic)' if settings.lexicographic_objective else 'weighted'}.")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'export_models':
+        settings.export_models = request.POST.get('export_models') == 'on'
+        settings.save()
+        messages.success(request, f"✅ Model export {'enabled' if settings.export_models else 'disabled'}.")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'construction_seed':
+        settings.construction_seed = request.POST.get('construction_seed') == 'on'
+        settings.save()
+        messages.success(request, f"✅ Construction seeding {'enabled' if settings.construction_seed else 'disabled'}.")
+        return redirect('schedulerDashboard')
+
+    if request.method == "POST" and request.POST.get('form_type') == 'symmetry_breaking':
+        settings.symmetry_breaking = request.POST.get('symmetry_breaking') == 'on'
+        settings.save()
+        messages.success(request, f"✅ Symmetry breaking {'enabled' if settings.symmetry_breaking else 'disabled'}.")
+        return redirect('schedulerDashboard')
+
     if request.method == "POST":
         minutes = request.POST.get('time_limit')
         if minutes:
@@ -525,15 +643,56 @@ def schedulerDashboard(request):
             return redirect('schedulerDashboard')
 
     batch_id = str(uuid.uuid4())
+    last_run = SolverRun.objects.exclude(status="RUNNING").first()
     return render(request, "scheduler/schedulerDashboard.html", {
         "batch_id": batch_id,
-        "settings": settings
+        "settings": settings,
+        "last_run": last_run,
+    })
+
+
+# Solver run history (SolverRun telemetry)
+@login_required
+@has_role('deptHead')
+def solverRuns(request):
+    settings, _ = SchedulerSettings.objects.get_or_create(id=1)
+    semesters = Semester.objects.filter(solver_runs__isnull=False).distinct().order_by('-createdAt')
+
+    runs = SolverRun.objects.select_related('semester')
+    semester_id = request.GET.get('semester')
+    if semester_id:
+        runs = runs.filter(semester_id=semester_id)
+    runs = list(runs[:50])
+
+    # Oldest first for the trend chart
+    trend = [{
+        "label": r.started_at.strftime("%b %d %H:%M"),
+        "extract": r.extract_seconds or 0,
+        "build": r.build_seconds or 0,
+        "solve": r.solve_seconds or 0,
+        "persist": r.persist_seconds or 0,
+        "tasks": r.tasks,
+        "variables": r.variables,
+        "constraints": r.constraints,
+        "gap": r.gap_percent,
+    } for r in reversed(runs)]
+
+    return render(request, "scheduler/solverRuns.html", {
+        "runs": runs,
+        "trend": trend,
+        "semesters": semesters,
+        "selected_semester_id": semester_id,
+        "time_window_seconds": settings.time_limit_minutes * 60,
     })
 
 @login_required
 @has_role('deptHead')
 def startScheduler(request):
     batch_id = request.GET.get("batch_id")
+    mode = request.GET.get("mode")
+    incremental = mode == "incremental"
+    draft = mode == "draft"
+    force = request.GET.get("force") == "1"
     
     semester = Semester.objects.filter(isActive=True).first()
     if not semester:
@@ -547,17 +706,29 @@ def startScheduler(request):
             "message": "⚠️ The Scheduler is already running in another tab or device! Please wait for it to finish."
         }, status=423) # 423 = Locked
 
+    # Refuse runs that cannot succeed (over-full block groups, missing hours, ...)
+    verdict = precheck_semester(semester)
+    if not verdict.ok:
+        return JsonResponse({
+            "status": "error",
+            "message": f"⛔ {verdict.summary()} Fix the data below and try again.",
+            "precheck": verdict.to_dict(),
+        }, status=422)
+
     # 3. Proceed as normal if no lock
     progress, _ = SchedulerProgress.objects.get_or_create(batch_id=batch_id)
     
     cache.set(lock_id, "starting", timeout=30) 
 
-    task = run_scheduler_task.delay(batch_id=batch_id)
+    task = run_scheduler_task.delay(batch_id=batch_id, incremental=incremental, draft=draft, force=force)
     progress.task_id = task.id
     progress.status = "running"
     progress.save()
     
-    return JsonResponse({"message": "Scheduling started.", "batch_id": batch_id, "task_id": task.id})
+    return JsonResponse({
+        "message": "Quick draft started." if draft else "Scheduling started.", "batch_id": batch_id, "task_id": task.id,
+        "precheck": verdict.to_dict(),
+    })
 
 
 @login_required
@@ -567,19 +738,34 @@ def stopScheduler(request):
     try:
         progress = SchedulerProgress.objects.get(batch_id=batch_id)
 
-        if progress.process_pid:
-            try:
-                os.kill(progress.process_pid, signal.SIGTERM)
-            except ProcessLookupError:
-                pass  
+        # The solver runs inside the worker and polls this flag; it stops at the
+        # next check and saves the best schedule it has found.
+        progress.cancel_requested = True
+        progress.save(update_fields=["cancel_requested"])
 
+        solving = progress.status == "running" and (progress.details or {}).get("phase")
+        if solving:
+            return JsonResponse({
+                "status": "stopping",
+                "message": "Stop requested. The scheduler will save the best schedule found so far and stop."
+            })
+
+        # Not picked up by a worker yet (or the worker is gone)
         if progress.task_id:
-            current_app.control.revoke(progress.task_id, terminate=True, signal="SIGTERM")
+            current_app.control.revoke(progress.task_id)
 
         progress.status = "stopped"
         progress.message = "Scheduler manually stopped."
         progress.save()
 
+        # Keep the best schedule found before the stop
+        saved = materialize_checkpoint(progress)
+        if saved:
+            return JsonResponse({
+                "status": "stopped",
+                "message": f"Scheduler has been stopped. Saved the best schedule found so far ({saved} classes)."
+            })
+
         return JsonResponse({"status": "stopped", "message": "Scheduler has been stopped."})
     except SchedulerProgress.DoesNotExist:
         return JsonResponse({"status": "error", "message": "No running scheduler found."})
@@ -602,6 +788,7 @@ def schedulerStatus(request):
         "message": progress.message,
         "progress": progress.progress,
         "logs": progress.logs[-20:],
+        "details": progress.details,
     })
 
 
@@ -1401,6 +1588,36 @@ def getInstructorConflicts(request):
     return JsonResponse({'busySlots': busySlots})
 
 
+# Schedule pin flags by the "pin" value of setSchedulePin
+PIN_PARTS = {
+    'time': ['pinTime'],
+    'room': ['pinRoom'],
+    'instructor': ['pinInstructor'],
+    'all': ['pinTime', 'pinRoom', 'pinInstructor'],
+}
+
+
+def pin_manual_changes(sched, data):
+    """
+    Pins what a manual edit changed so the next scheduler run keeps it
+    (unless the request sends "pin": false). A move without a room choice
+    sends the class to TBA, so its room is no longer pinned.
+    """
+    time_changed = data.get('day') is not None or data.get('startTime') is not None
+    if time_changed and not data.get('roomId'):
+        sched.pinRoom = False
+    if data.get('instructorId') == 'UNASSIGN':
+        sched.pinInstructor = False
+    if not data.get('pin', True):
+        return
+    if time_changed:
+        sched.pinTime = True
+    if data.get('roomId'):
+        sched.pinRoom = True
+    if data.get('instructorId') and data.get('instructorId') != 'UNASSIGN':
+        sched.pinInstructor = True
+
+
 @login_required
 @has_role('deptHead')
 def updateScheduleSlot(request):
@@ -1457,6 +1674,7 @@ def updateScheduleSlot(request):
                  else:
                      sched.isOvertime = False
 
+             pin_manual_changes(sched, data)
              sched.save()
              return JsonResponse({'success': True})
 
@@ -1520,6 +1738,7 @@ def updateScheduleSlot(request):
                     try: tba = Room.objects.get(roomCode="TBA")
                     except: tba = None
                     room_conflict.room = tba
+                    room_conflict.pinRoom = False
                     room_conflict.save()
                 else:
                     c_raw = str(room_conflict.section.sectionCode).strip()
@@ -1545,12 +1764,40 @@ def updateScheduleSlot(request):
         else:
             sched.isOvertime = False
 
+        pin_manual_changes(sched, data)
         sched.save()
         
         return JsonResponse({'success': True})
 
     except Exception as e:
         return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@has_role('deptHead')
+def setSchedulePin(request):
+    """Pins or unpins a class's time, room, instructor or all of them for the next scheduler runs."""
+    try:
+        data = json.loads(request.body)
+        sched = Schedule.objects.get(scheduleId=data.get('scheduleId'))
+        fields = PIN_PARTS.get(data.get('pin', 'all'))
+        if fields is None:
+            return JsonResponse({'success': False, 'message': "Pin must be 'time', 'room', 'instructor' or 'all'."})
+
+        pinned = bool(data.get('pinned', True))
+        for f in fields:
+            setattr(sched, f, pinned)
+        sched.save(update_fields=fields)
+
+        return JsonResponse({
+            'success': True,
+            'pinTime': sched.pinTime,
+            'pinRoom': sched.pinRoom,
+            'pinInstructor': sched.pinInstructor,
+        })
+
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
     
 
 @login_required
@@ -0,0 +1,147 @@
+# scheduler/warm_start.py
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from scheduling.models import Schedule
+
+HINT_FIELDS = ("section_id", "scheduleType", "dayOfWeek", "startTime", "instructor_id", "room_id")
+PIN_FIELDS = ("pinTime", "pinRoom", "pinInstructor")
+
+DAY_INDEX = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2,
+    "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6
+}
+
+
+def load_schedule_batch(semester, batch_key="latest"):
+    """
+    Schedule rows of one previous run, using the same batch keys as scheduleOutput:
+    'active', 'finalized', or the ISO timestamp of an archived run.
+    'latest' takes the active draft, then the finalized schedule, then the newest archived run.
+
+    Returns (batch_key_used, queryset) or (None, empty queryset).
+    """
+    base = Schedule.objects.filter(semester=semester)
+
+    if batch_key == "latest":
+        for key in ("active", "finalized"):
+            qs = base.filter(status=key)
+            if qs.exists():
+                return key, qs
+        newest = base.filter(status="archived").order_by("-createdAt").values_list("createdAt", flat=True).first()
+        if newest is None:
+            return None, base.none()
+        batch_key = newest.replace(microsecond=0).isoformat()
+
+    if batch_key in ("active", "finalized"):
+        return batch_key, base.filter(status=batch_key)
+
+    try:
+        batch_time = datetime.fromisoformat(batch_key)
+    except (TypeError, ValueError):
+        return None, base.none()
+    if batch_time.tzinfo is None:
+        batch_time = timezone.make_aware(batch_time)
+    batch_time = batch_time.replace(microsecond=0)
+
+    return batch_key, base.filter(
+        status="archived",
+        createdAt__gte=batch_time,
+        createdAt__lt=batch_time + timedelta(seconds=1)
+    )
+
+
+def load_pinned_rows(semester):
+    """
+    Rows (HINT_FIELDS + PIN_FIELDS) of every section with a pinned row, all of
+    the section's rows so split lectures still match their tasks. Sections
+    come from the active draft, otherwise from the finalized schedule (where
+    the block, room and instructor managers edit).
+    """
+    rows = []
+    taken = set()
+    any_pin = Q(pinTime=True) | Q(pinRoom=True) | Q(pinInstructor=True)
+    for status in ("active", "finalized"):
+        batch = Schedule.objects.filter(semester=semester, status=status)
+        pinned = set(batch.filter(any_pin).values_list("section_id", flat=True)) - taken
+        rows += list(batch.filter(section_id__in=pinned).values(*HINT_FIELDS, *PIN_FIELDS))
+        taken |= pinned
+    return rows
+
+
+def _task_rows(rows):
+    """
+    Previous rows by solver task id, matched by section and scheduleType:
+    {task_id: (start week_minute, row)}. Lecture rows of a split section are
+    matched to _LECT_A / _LECT_B in start order.
+    """
+    by_section_kind = defaultdict(list)
+    for row in rows:
+        day = DAY_INDEX.get(row["dayOfWeek"])
+        if day is None:
+            continue
+        start = day * 1440 + row["startTime"].hour * 60 + row["startTime"].minute
+        by_section_kind[(row["section_id"], row["scheduleType"])].append((start, row))
+
+    matched = {}
+    for (sec_id, kind), entries in by_section_kind.items():
+        entries.sort(key=lambda e: e[0])
+        if kind == "lab":
+            matched[f"{sec_id}_LAB"] = entries[0]
+        elif len(entries) >= 2:
+            matched[f"{sec_id}_LECT_A"] = entries[0]
+            matched[f"{sec_id}_LECT_B"] = entries[1]
+        else:
+            matched[f"{sec_id}_LECT"] = entries[0]
+    return matched
+
+
+def build_schedule_hints(rows, data):
+    """
+    Maps previous Schedule rows (dicts of HINT_FIELDS) onto solver tasks by
+    section and scheduleType.
+
+    Lecture rows of a split section are matched to _LECT_A / _LECT_B in start order.
+    Returns {task_id: {"start": week_minute, "instr": idx or None, "room": idx or None}};
+    None marks an instructor or room no longer in the data (a row without a
+    room is TBA).
+    """
+    instructor_index = data.get("instructor_index", {})
+    room_index = {room_id: idx for idx, room_id in enumerate(data["rooms"])}
+    tba_idx = data.get("TBA_ROOM_IDX", len(data["rooms"]) - 1)
+
+    return {
+        task_id: {
+            "start": start,
+            "instr": instructor_index.get(row["instructor_id"]),
+            "room": room_index.get(row["room_id"]) if row["room_id"] else tba_idx,
+        }
+        for task_id, (start, row) in _task_rows(rows).items()
+    }
+
+
+def build_schedule_pins(rows, data):
+    """
+    The pinned parts of previous rows (dicts of HINT_FIELDS + PIN_FIELDS) as
+    {task_id: {"start"?: week_minute, "room"?: idx, "instr"?: idx}}, only
+    the pinned keys. A room or instructor no longer in the data stays unpinned.
+    """
+    instructor_index = data.get("instructor_index", {})
+    room_index = {room_id: idx for idx, room_id in enumerate(data["rooms"])}
+    tba_idx = data.get("TBA_ROOM_IDX", len(data["rooms"]) - 1)
+
+    pins = {}
+    for task_id, (start, row) in _task_rows(rows).items():
+        pin = {}
+        if row["pinTime"]:
+            pin["start"] = start
+        if row["pinRoom"] and (not row["room_id"] or row["room_id"] in room_index):
+            pin["room"] = room_index[row["room_id"]] if row["room_id"] else tba_idx
+        if row["pinInstructor"] and row["instructor_id"] in instructor_index:
+            pin["instr"] = instructor_index[row["instructor_id"]]
+        if pin:
+            pins[task_id] = pin
+    return pins
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='pinInstructor',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='pinRoom',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='pinTime',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -186,6 +186,15 @@ class Schedule(models.Model):
     )
     createdAt = models.DateTimeField(auto_now_add=True)
 
+    # Pinned parts stay as they are when the scheduler runs again
+    pinTime = models.BooleanField(default=False)
+    pinRoom = models.BooleanField(default=False)
+    pinInstructor = models.BooleanField(default=False)
+
+    @property
+    def isPinned(self):
+        return self.pinTime or self.pinRoom or self.pinInstructor
+
     @property
     def isNormalTime(self):
         return self.startTime >= timezone.datetime.strptime("08:00", "%H:%M").time() \